@@ -0,0 +1,3 @@
+"""
+Benchmarks for the Voice Agent.
+"""
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""
+Benchmark for inbound audio preprocessing (high-pass, noise gate, AGC).
+
+Runs one AudioPreprocessor per simulated stream and feeds them 10 ms frames
+round-robin, the way a worker serving many rooms would, then reports how
+many real-time streams a single core sustains.
+
+Usage:
+    python -m benchmarks.bench_preprocessing [--streams 500] [--seconds 5]
+"""
+import argparse
+import time
+import numpy as np
+from src.utils.audio_preprocessing import AudioPreprocessor, PreprocessorConfig
+
+def main():
+    """Run the benchmark and print streams per core"""
+    parser = argparse.ArgumentParser(description="Benchmark inbound audio preprocessing")
+    parser.add_argument("--streams", type=int, default=500, help="Concurrent streams")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Audio seconds per stream")
+    args = parser.parse_args()
+    
+    config = PreprocessorConfig()
+    preprocessors = [AudioPreprocessor(config) for _ in range(args.streams)]
+    rng = np.random.default_rng(0)
+    frames = rng.normal(0, 2000, (50, config.frame_samples)).astype(np.int16)
+    frames_per_stream = int(args.seconds * 1000 / config.frame_ms)
+    
+    start = time.perf_counter()
+    for i in range(frames_per_stream):
+        frame = frames[i % len(frames)]
+        for preprocessor in preprocessors:
+            preprocessor.process(frame)
+    elapsed = time.perf_counter() - start
+    
+    total = frames_per_stream * args.streams
+    realtime_factor = (args.seconds * args.streams) / elapsed
+    print(f"{total:,} frames in {elapsed:.2f}s: {total / elapsed:,.0f} frames/sec, "
+          f"{elapsed / total * 1e6:.1f} us/frame")
+    print(f"~{realtime_factor:,.0f} real-time streams per core")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark for the API serving profiles.
+
+Launches the API server once per profile (``dev``: single process with
+reload, ``production``: uvloop/httptools workers) and drives it with
+concurrent keep-alive clients, then reports requests/second and latency
+percentiles. Also times JSON rendering of a response model with the
+stdlib encoder and with orjson.
+
+Usage:
+    python -m benchmarks.bench_serving [--requests 5000] [--concurrency 64] [--workers 4]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import httpx
+from fastapi.responses import JSONResponse
+from src.api.models import ConversationHistory
+from src.utils.serving import fast_json_response_class
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def _wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not become ready")
+
+async def _drive(url: str, total: int, concurrency: int):
+    latencies = []
+    remaining = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        async def worker():
+            for _ in remaining:
+                start = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return elapsed, latencies
+
+def bench_profile(profile: str, path: str, total: int, concurrency: int, workers: int) -> None:
+    port = _free_port()
+    command = [sys.executable, "-m", "src.main", "--port", str(port)]
+    if profile == "production":
+        command += ["--production", "--workers", str(workers)]
+    # No warm agents: this measures the HTTP tier only
+    env = dict(os.environ, AGENT_POOL_SIZE="0", LOG_LEVEL="WARNING")
+    server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base = f"http://127.0.0.1:{port}"
+        asyncio.run(_wait_ready(base + "/health"))
+        asyncio.run(_drive(base + path, min(total, 500), concurrency))  # warm up
+        elapsed, latencies = asyncio.run(_drive(base + path, total, concurrency))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(f"{profile:>10}: {total / elapsed:8,.0f} req/s   p50 {p50:6.1f} ms   p99 {p99:6.1f} ms")
+
+def bench_json(iterations: int = 20000) -> None:
+    history = ConversationHistory(
+        messages=[{"role": "user" if i % 2 else "assistant", "content": "word " * 40}
+                  for i in range(20)],
+        current_question_index=10
+    ).model_dump()
+    for response_class in (JSONResponse, fast_json_response_class()):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            response_class(history)
+        elapsed = time.perf_counter() - start
+        print(f"{response_class.__name__:>16}: {elapsed / iterations * 1e6:6.1f} us/response")
+
+def main():
+    """Run the benchmark and print throughput per profile"""
+    parser = argparse.ArgumentParser(description="Benchmark API serving profiles")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per profile")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent clients")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for the production profile")
+    parser.add_argument("--path", default="/api/v1/interview/questions", help="Endpoint to request")
+    args = parser.parse_args()
+
+    print(f"GET {args.path}, {args.requests:,} requests, {args.concurrency} clients")
+    for profile in ("dev", "production"):
+        bench_profile(profile, args.path, args.requests, args.concurrency, args.workers)
+    print("\nJSON rendering (20 message conversation history)")
+    bench_json()
+
+if __name__ == "__main__":
+    main()
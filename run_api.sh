@@ -1,5 +1,6 @@
 #!/bin/bash
 # Script to run the FastAPI server
+# Usage: ./run_api.sh [--production] [--workers N]
 
 # Activate virtual environment if it exists
 if [ -d "venv" ]; then
@@ -10,9 +11,9 @@ fi
 # Get port from environment or use default (8000)
 PORT=${PORT:-8000}
 
-# Run the FastAPI server
+# Run the FastAPI server (development reload by default)
 echo "Starting FastAPI server on port $PORT..."
-uvicorn src.main:app --host 0.0.0.0 --port $PORT --reload
+python -m src.main --port $PORT "$@"
 
 # Exit status
-exit $? 
\ No newline at end of file
+exit $?
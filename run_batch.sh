@@ -0,0 +1,20 @@
+#!/bin/bash
+# Script to re-transcribe / re-score recorded interviews in bulk
+
+# Activate virtual environment if it exists
+if [ -d "venv" ]; then
+    echo "Activating virtual environment..."
+    source venv/bin/activate
+fi
+
+if [ $# -eq 0 ]; then
+    echo "Usage: ./run_batch.sh <manifest.jsonl|recordings_dir> [--output results.jsonl] [--concurrency N]"
+    exit 1
+fi
+
+# Run the batch tool, passing all options through
+echo "Starting batch processing..."
+python -m src.run_batch "$@"
+
+# Exit status
+exit $? 
@@ -9,7 +9,11 @@ fi
 
 # Parse command line arguments
 ROOM_NAME=""
+MANIFEST=""
+PROCESSES=""
+STATS_INTERVAL=""
 DEBUG_MODE=""
+PROFILE_STARTUP=""
 
 while [[ $# -gt 0 ]]; do
     case $1 in
@@ -17,10 +21,26 @@ while [[ $# -gt 0 ]]; do
             ROOM_NAME="--room $2"
             shift 2
             ;;
+        -m|--manifest)
+            MANIFEST="--manifest $2"
+            shift 2
+            ;;
+        -p|--processes)
+            PROCESSES="--processes $2"
+            shift 2
+            ;;
+        --stats-interval)
+            STATS_INTERVAL="--stats-interval $2"
+            shift 2
+            ;;
         -d|--debug)
             DEBUG_MODE="--debug"
             shift
             ;;
+        --profile-startup)
+            PROFILE_STARTUP="--profile-startup"
+            shift
+            ;;
         *)
             echo "Unknown option: $1"
             exit 1
@@ -30,7 +50,7 @@ done
 
 # Run the CLI tool
 echo "Starting Voice Agent CLI..."
-python -m src.run_cli $ROOM_NAME $DEBUG_MODE
+python -m src.run_cli $ROOM_NAME $MANIFEST $PROCESSES $STATS_INTERVAL $DEBUG_MODE $PROFILE_STARTUP
 
 # Exit status
 exit $? 
\ No newline at end of file
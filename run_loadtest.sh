@@ -0,0 +1,15 @@
+#!/bin/bash
+# Script to load test the API against fake STT/LLM/TTS providers
+
+# Activate virtual environment if it exists
+if [ -d "venv" ]; then
+    echo "Activating virtual environment..."
+    source venv/bin/activate
+fi
+
+# Run the load test, passing all options through
+echo "Starting load test..."
+python -m src.loadtest "$@"
+
+# Exit status
+exit $?
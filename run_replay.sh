@@ -0,0 +1,20 @@
+#!/bin/bash
+# Script to replay a captured room session offline for latency debugging
+
+# Activate virtual environment if it exists
+if [ -d "venv" ]; then
+    echo "Activating virtual environment..."
+    source venv/bin/activate
+fi
+
+if [ $# -eq 0 ]; then
+    echo "Usage: ./run_replay.sh <captures/room> [--speed N] [--output replays/]"
+    exit 1
+fi
+
+# Run the replay harness, passing all options through
+echo "Starting replay..."
+python -m src.run_replay "$@"
+
+# Exit status
+exit $?
@@ -3,5 +3,8 @@ Agent package for the Voice Agent.
 """
 from src.agent.interview_manager import InterviewManager
 from src.agent.livekit_room import LiveKitRoomManager
+from src.agent.agent_pool import AgentPool, get_agent_pool
+from src.agent.room_scheduler import RoomScheduler, get_room_scheduler
 
-__all__ = ['InterviewManager', 'LiveKitRoomManager'] 
\ No newline at end of file
+__all__ = ['InterviewManager', 'LiveKitRoomManager', 'AgentPool', 'get_agent_pool',
+           'RoomScheduler', 'get_room_scheduler'] 
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+Templated acknowledgments for the interview fast path.
+
+When the language model is degraded or overloaded, the interviewer
+acknowledges the candidate's answer with a short phrase picked by keyword
+instead of a generated one. The phrase set is small and fixed, so every
+phrase can be synthesized ahead of time.
+"""
+import re
+from typing import Dict, List, Tuple
+
+# (keywords, phrases): the first rule with the most keyword hits wins
+RULES: List[Tuple[Tuple[str, ...], Tuple[str, ...]]] = [
+    (("api", "apis", "rest", "endpoint", "endpoints", "http", "graphql"),
+     ("Thanks, that's a solid overview of your API work.",
+      "Good, it sounds like you've built quite a few APIs.")),
+    (("sql", "nosql", "database", "databases", "postgres", "mysql", "mongodb", "schema", "query", "queries", "index", "indexes"),
+     ("Good, you clearly know your way around databases.",
+      "Thanks, that's a clear take on data storage.")),
+    (("scale", "scaling", "cache", "caching", "redis", "load", "throughput", "latency", "rate", "limiting"),
+     ("Nice, you're thinking about scale and performance.",
+      "Good, that's a practical approach to handling load.")),
+    (("debug", "debugging", "profile", "profiling", "logs", "logging", "monitoring", "metrics", "trace", "tracing"),
+     ("Good, that's a methodical way to track problems down.",
+      "Thanks, it's clear you've debugged real production issues.")),
+    (("consistency", "transaction", "transactions", "distributed", "saga", "event", "events", "acid", "replication"),
+     ("Thanks, that's a thoughtful view of consistency trade-offs.",
+      "Good, you've clearly worked with distributed systems.")),
+    (("team", "teams", "led", "lead", "mentor", "mentored", "collaborated", "stakeholders"),
+     ("Thanks, it's good to hear how you work with your team.",
+      "Great, that's useful context on how you collaborate.")),
+]
+
+# By answer length when no keyword matches
+SHORT_PHRASES = ("Okay, thanks.", "Got it.")
+LONG_PHRASES = ("Thanks for the detailed answer.", "That's a thorough answer, thank you.")
+DEFAULT_PHRASES = ("Thanks for sharing that.", "Interesting, thank you.")
+
+SHORT_ANSWER_WORDS = 6
+LONG_ANSWER_WORDS = 40
+
+_WORD = re.compile(r"[a-z]+")
+
+class AcknowledgmentGenerator:
+    """Picks a short, relevant acknowledgment for a candidate answer"""
+
+    def __init__(self):
+        self._keyword_rules: Dict[str, int] = {}
+        for index, (keywords, _) in enumerate(RULES):
+            for keyword in keywords:
+                self._keyword_rules.setdefault(keyword, index)
+        self._turn = 0
+
+    def acknowledge(self, answer: str) -> str:
+        """Acknowledgment phrase for an answer"""
+        words = _WORD.findall(answer.lower())
+        hits = [0] * len(RULES)
+        for word in words:
+            rule = self._keyword_rules.get(word)
+            if rule is not None:
+                hits[rule] += 1
+
+        if max(hits, default=0) > 0:
+            phrases = RULES[hits.index(max(hits))][1]
+        elif len(words) <= SHORT_ANSWER_WORDS:
+            phrases = SHORT_PHRASES
+        elif len(words) >= LONG_ANSWER_WORDS:
+            phrases = LONG_PHRASES
+        else:
+            phrases = DEFAULT_PHRASES
+
+        # Alternate variants so consecutive turns don't sound identical
+        self._turn += 1
+        return phrases[self._turn % len(phrases)]
+
+    @staticmethod
+    def phrases() -> List[str]:
+        """Every phrase the generator can produce (for pre-rendering)"""
+        all_phrases = [phrase for _, phrases in RULES for phrase in phrases]
+        return all_phrases + list(SHORT_PHRASES + LONG_PHRASES + DEFAULT_PHRASES)
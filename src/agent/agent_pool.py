@@ -0,0 +1,106 @@
+"""
+Warm agent pool for assigning pre-initialized agents to rooms.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+from src.config import AgentConfig, get_config
+from src.agent.livekit_room import LiveKitRoomManager
+
+logger = logging.getLogger(__name__)
+
+class AgentPool:
+    """Keeps a number of agents initialized, with welcome audio pre-rendered"""
+
+    def __init__(self, config: AgentConfig, size: int):
+        self.config = config
+        self.size = size
+        self._idle: Deque[LiveKitRoomManager] = deque()
+        self._warming = 0
+        self._refill_task: Optional[asyncio.Task] = None
+        self._running = False
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def idle_count(self) -> int:
+        """Number of warm agents ready for assignment"""
+        return len(self._idle)
+
+    async def start(self) -> None:
+        """Start warming agents in the background"""
+        self._running = True
+        self._schedule_refill()
+
+    async def stop(self) -> None:
+        """Stop refilling and release idle agents"""
+        self._running = False
+        if self._refill_task:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+            self._refill_task = None
+        while self._idle:
+            agent = self._idle.popleft()
+            agent.release_prerendered()
+            await agent.tasks.close()
+
+    def _schedule_refill(self) -> None:
+        if self._running and (self._refill_task is None or self._refill_task.done()):
+            self._refill_task = asyncio.create_task(self._refill())
+
+    async def _refill(self) -> None:
+        """Warm agents until the pool is full"""
+        while self._running and len(self._idle) + self._warming < self.size:
+            self._warming += 1
+            try:
+                start = time.monotonic()
+                agent = LiveKitRoomManager(self.config)
+                if not await agent.initialize():
+                    # Stop here; the next acquire will try again
+                    logger.warning("Agent warm-up failed, pool refill paused")
+                    return
+                self._idle.append(agent)
+                logger.info(f"🔥 Warm agent ready in {time.monotonic() - start:.2f}s "
+                            f"({len(self._idle)}/{self.size} idle)")
+            finally:
+                self._warming -= 1
+
+    async def acquire(self, room_name: str) -> LiveKitRoomManager:
+        """Take a warm agent (or build one on a miss) and assign it to a room"""
+        if self._idle:
+            agent = self._idle.popleft()
+            self.hits += 1
+        else:
+            agent = LiveKitRoomManager(self.config)
+            self.misses += 1
+            logger.info("Agent pool empty, initializing agent on demand")
+
+        agent.assign(room_name)
+        self._schedule_refill()
+        return agent
+
+    def stats(self) -> Dict[str, int]:
+        """Pool occupancy and hit counts"""
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "warming": self._warming,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+# Singleton instance for global access
+_pool: Optional[AgentPool] = None
+
+def get_agent_pool() -> AgentPool:
+    """Get the global agent pool"""
+    global _pool
+    if _pool is None:
+        config = get_config()
+        _pool = AgentPool(config, config.agent_pool_size)
+    return _pool
@@ -2,57 +2,136 @@
 Interview manager for handling conversation flow and interview questions.
 """
 import logging
-from typing import List
+from typing import List, Optional, Set, Tuple
 from src.services.language_model import LanguageModelService
+from src.agent.acknowledgments import AcknowledgmentGenerator
+from src.agent.prompts import evaluation_prompt, response_prompt
+from src.agent.question_bank import Question, QuestionBank, get_question_bank
+from src.agent.response_cache import ResponseCache, get_response_cache
+from src.utils.admission import AdmissionRejected
 
 logger = logging.getLogger(__name__)
 
+WELCOME = "Hello! Welcome to your backend development interview."
+CLOSING = "Thank you! That concludes our interview. You provided excellent insights!"
+
+# Questions asked between the welcome and the closing
+INTERVIEW_QUESTIONS = 5
+STARTING_DIFFICULTY = 2
+
 class InterviewManager:
     """Manages interview content and conversation flow"""
     
-    def __init__(self, language_model: LanguageModelService):
+    def __init__(self, language_model: LanguageModelService,
+                 question_bank: Optional[QuestionBank] = None,
+                 response_cache: Optional[ResponseCache] = None):
         self.language_model = language_model
         self.question_count = 0
         self.conversation_history: List[str] = []
         self.is_speaking = False
         
-        # Interview questions
-        self.questions = [
-            "Hello! Welcome to your backend development interview. Can you tell me about your experience with REST APIs?",
-            "That's great! What's the difference between SQL and NoSQL databases?", 
-            "Interesting! How would you design a rate limiting system?",
-            "Excellent! How do you debug slow database queries?",
-            "Perfect! How do you ensure data consistency in distributed systems?",
-            "Thank you! That concludes our interview. You provided excellent insights!"
-        ]
+        # Fast path: templated acknowledgment when the LLM is degraded or overloaded
+        self.acknowledgments = AcknowledgmentGenerator()
+        self.fast_path_turns = 0
+        # Separately synthesizable pieces of the last response (acknowledgment, question)
+        self.last_response_parts: List[str] = []
+        
+        # Responses to short answers, shared between interviews
+        self.response_cache = response_cache or get_response_cache(language_model.config)
+        self.cached_turns = 0
+        
+        # Interview questions: a default plan from the bank, adapted as answers come in
+        self.question_bank = question_bank or get_question_bank(language_model.config)
+        self.difficulty = STARTING_DIFFICULTY
+        self._plan: List[Question] = self.question_bank.plan(INTERVIEW_QUESTIONS, self.difficulty)
+        self._asked: List[Question] = list(self._plan)
+        self.questions = self._planned_questions()
+    
+    def _planned_questions(self) -> List[str]:
+        """Spoken question list for the default plan, welcome and closing included"""
+        return [f"{WELCOME} {self._plan[0].text}"] + [q.text for q in self._plan[1:]] + [CLOSING]
+    
+    def _adaptation_state(self) -> Tuple[Question, Set[str], Optional[str]]:
+        """(current question, ids asked so far, planned topic of the next one)"""
+        index = self.question_count
+        upcoming_topic = self._plan[index].topic if index < len(self._plan) else None
+        return self._asked[index - 1], {q.id for q in self._asked[:index]}, upcoming_topic
+    
+    def _adapt_next_question(self, answer: str) -> None:
+        """Replace the upcoming question based on the candidate's last answer"""
+        index = self.question_count
+        current, asked, upcoming_topic = self._adaptation_state()
+        question, self.difficulty = self.question_bank.next_question(
+            current, answer, asked, self.difficulty, upcoming_topic
+        )
+        if question and question.id != self._asked[index].id:
+            logger.debug("🧭 Next question %s (difficulty %d)", question.id, self.difficulty)
+            self._asked[index] = question
+            self.questions[index] = question.text
+    
+    def next_question_candidates(self) -> List[str]:
+        """Questions that can follow the answer the candidate is giving now
+        
+        Known before the answer arrives, so they can be synthesized while the
+        candidate is still speaking.
+        """
+        index = self.question_count
+        if index == 0 or index >= len(self.questions) - 1:
+            return []
+        current, asked, upcoming_topic = self._adaptation_state()
+        candidates = self.question_bank.next_question_candidates(current, asked, self.difficulty, upcoming_topic)
+        # The planned question stays when the bank has nothing better
+        return list(dict.fromkeys([q.text for q in candidates] + [self.questions[index]]))
     
     async def generate_response(self, user_input: str = "") -> str:
         """Generate response based on conversation state"""
+        # Nothing from the previous turn may be spoken again
+        self.last_response_parts = []
         try:
             if self.question_count == 0:
                 # First question
                 response = self.questions[0]
+                self.last_response_parts = [response]
                 self.question_count += 1
             elif self.question_count < len(self.questions) - 1:
-                # Use language model to generate personalized response
+                answered = self.questions[self.question_count - 1]
+                if user_input.strip():
+                    self._adapt_next_question(user_input)
+                question = self.questions[self.question_count]
+                # Only the acknowledgment is generated; the question is spoken verbatim
+                # from audio rendered while the candidate was answering
+                template = self.acknowledgments.acknowledge(user_input)
+                cached = self.response_cache.get(answered, user_input) if self.response_cache else None
                 try:
-                    prompt = f"""You are a backend development interviewer. 
-                    The candidate just said: "{user_input}"
-                    
-                    Give a brief (1-2 sentences) acknowledgment of their answer, then ask this question:
-                    {self.questions[self.question_count]}
-                    
-                    Keep the total response under 80 words and conversational."""
-                    
-                    response = await self.language_model.generate_response(prompt)
-                    self.question_count += 1
+                    if cached:
+                        acknowledgment = cached
+                    elif self.language_model.is_overloaded():
+                        acknowledgment = template
+                    else:
+                        # Use language model to acknowledge the answer personally
+                        prompt = response_prompt(user_input, question)
+                        acknowledgment = await self.language_model.generate_response(prompt, fallback=template)
+                        if self.response_cache and acknowledgment != template:
+                            self.response_cache.put(answered, user_input, acknowledgment)
+                except AdmissionRejected:
+                    raise
                 except Exception as e:
                     logger.warning(f"Language model error, using fallback: {e}")
-                    response = f"That's interesting. {self.questions[self.question_count]}"
-                    self.question_count += 1
+                    acknowledgment = template
+                
+                if cached:
+                    self.cached_turns += 1
+                    logger.info("📦 Cached acknowledgment for a similar answer")
+                elif acknowledgment == template:
+                    self.fast_path_turns += 1
+                    logger.info("⚡ Fast path response (LLM degraded or overloaded)")
+                response = f"{acknowledgment} {question}"
+                self.last_response_parts = [acknowledgment, question]
+                self.question_count += 1
             else:
                 # Final question
                 response = self.questions[-1]
+                self.last_response_parts = [response]
             
             # Record conversation
             if user_input and user_input.strip():
@@ -65,9 +144,23 @@ class InterviewManager:
             
             return response
                 
+        except AdmissionRejected:
+            raise
         except Exception as e:
             logger.error(f"Response generation error: {e}")
-            return "Let me ask you another question about your backend experience."
+            response = "Let me ask you another question about your backend experience."
+            self.last_response_parts = [response]
+            return response
+    
+    async def evaluate(self, transcript: str, strict: bool = False,
+                       questions: Optional[List[str]] = None) -> str:
+        """Evaluate a complete interview transcript (``strict`` raises model errors)
+        
+        ``questions`` are those actually asked, when known; otherwise the plan.
+        """
+        prompt = evaluation_prompt(questions or self.questions[:-1], transcript)
+        
+        return await self.language_model.generate_response(prompt, strict=strict)
     
     def get_conversation_history(self) -> List[str]:
         """Get the conversation history"""
@@ -76,4 +169,8 @@ class InterviewManager:
     def reset_interview(self) -> None:
         """Reset the interview to start again"""
         self.question_count = 0
-        self.conversation_history = [] 
\ No newline at end of file
+        self.conversation_history = []
+        self.last_response_parts = []
+        self.difficulty = STARTING_DIFFICULTY
+        self._asked = list(self._plan)
+        self.questions = self._planned_questions()
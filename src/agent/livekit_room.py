@@ -2,32 +2,119 @@
 LiveKit room management module for handling audio connections.
 """
 import asyncio
+import dataclasses
 import os
 import logging
-from livekit import rtc, api
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+import numpy as np
 from src.config import AgentConfig
 from src.services import SpeechToTextService, TextToSpeechService, LanguageModelService
+from src.services.speech_to_text import TranscriptionSession
+from src.services.text_to_speech import PLAYBACK_SAMPLE_RATE
 from src.agent.interview_manager import InterviewManager
+from src.agent.acknowledgments import AcknowledgmentGenerator
+from src.agent.question_bank import QuestionBank
+from src.utils.admission import AdmissionRejected, Priority
+from src.utils.audio import AudioRingBuffer
+from src.utils.audio_preprocessing import AudioPreprocessor, PreprocessorConfig
+from src.utils.recording import SessionRecorder
+from src.utils.capture import SessionCapture, set_capture
+from src.utils.lazy import lazy_import
+from src.utils.logging import LogSampler, set_log_context
+from src.utils.tasks import TaskSupervisor
 
 logger = logging.getLogger(__name__)
 
+# LiveKit SDKs are loaded when the first room is created
+rtc = lazy_import("livekit.rtc")
+api = lazy_import("livekit.api")
+
+# Inbound audio is resampled to 16 kHz mono and the last few seconds are kept
+INBOUND_SAMPLE_RATE = 16000
+INBOUND_BUFFER_SECONDS = 10
+
+# Longest wait between reconnect attempts
+RECONNECT_MAX_DELAY = 5.0
+
+# Question renders outlive the room that started them (other rooms may share
+# them through the TTS cache); held here so they are not garbage-collected
+_detached_renders: Set[asyncio.Task] = set()
+
+# Candidate answers used when streaming STT is off
+SIMULATED_ANSWERS = [
+    "I have 3 years of experience building REST APIs with Node.js and Python Flask",
+    "SQL databases are good for structured data with ACID properties, while NoSQL databases like MongoDB are better for flexible schemas and horizontal scaling",
+    "I would implement rate limiting using Redis with a token bucket algorithm, storing counters per user and resetting them periodically",
+    "To debug slow queries, I would first check the execution plan, then add appropriate indexes, and optimize the query structure",
+    "For data consistency, I use database transactions for ACID operations and implement event sourcing with saga patterns for distributed systems"
+]
+
 class LiveKitRoomManager:
     """Manages LiveKit room connection and audio processing"""
     
-    def __init__(self, config: AgentConfig):
+    def __init__(self, config: AgentConfig,
+                 stt_service: Optional[SpeechToTextService] = None,
+                 tts_service: Optional[TextToSpeechService] = None,
+                 lm_service: Optional[LanguageModelService] = None,
+                 question_bank: Optional[QuestionBank] = None):
         self.config = config
         self.room = rtc.Room()
         self.audio_source = None
         self.is_connected = False
+        self.is_initialized = False
+        
+        # Connection state across network blips; see reconnect()
+        self.connected_event = asyncio.Event()
+        self.reconnects = 0
+        self.last_reconnect_ms: Optional[float] = None
+        self._joined = False
+        self._closing = False
+        self._drops = 0
+        self._lost_at: Optional[float] = None
+        
+        # Every background task of this room; cancelled together on disconnect
+        self.tasks = TaskSupervisor(f"room:{config.room_name}")
+        self._register_handlers(self.room)
+        
+        # Readiness: set once the candidate's audio track is subscribed
+        self.participant_ready = asyncio.Event()
+        self._interview_started = False
+        self._assigned_at: Optional[float] = None
+        
+        # Pre-rendered speech keyed by text (temp WAV paths)
+        self._prerendered: Dict[str, str] = {}
+        
+        # Next question candidates rendered to PCM during the candidate's turn
+        self._question_pcm: Dict[str, asyncio.Task] = {}
+        
+        # Preprocessed candidate audio, held for VAD and STT
+        self.inbound_audio = AudioRingBuffer(INBOUND_SAMPLE_RATE * INBOUND_BUFFER_SECONDS)
+        
+        # Session recording, created on connect when enabled
+        self.recorder: Optional[SessionRecorder] = None
+        
+        # Replay capture, created on connect when enabled
+        self.capture: Optional[SessionCapture] = None
         
-        # Services
-        self.stt_service = SpeechToTextService(config)
-        self.tts_service = TextToSpeechService(config)
-        self.lm_service = LanguageModelService(config)
-        self.interview_manager = InterviewManager(self.lm_service)
+        # Playback speed; replays run faster than real time
+        self.playback_rate = 1.0
+        
+        # Streaming STT, opened on connect when enabled and reused for every turn
+        self.stt_session: Optional[TranscriptionSession] = None
+        
+        # Services (live rooms are admitted ahead of REST and batch traffic). They
+        # may be shared between rooms, so the voice is passed per call from config
+        self.stt_service = stt_service or SpeechToTextService(config, priority=Priority.REALTIME)
+        self.tts_service = tts_service or TextToSpeechService(config, priority=Priority.REALTIME)
+        self.lm_service = lm_service or LanguageModelService(config, priority=Priority.REALTIME)
+        self.interview_manager = InterviewManager(self.lm_service, question_bank)
     
     async def initialize(self) -> bool:
-        """Initialize all services"""
+        """Initialize all services and pre-render the welcome message"""
+        if self.is_initialized:
+            return True
+        
         logger.info("Initializing services...")
         
         # Initialize language model
@@ -38,61 +125,242 @@ class LiveKitRoomManager:
         if not await self.stt_service.initialize():
             return False
         
-        # Test TTS
-        if not await self.tts_service.test_connection():
+        # Pre-rendering the welcome doubles as the TTS connection test
+        if not await self.prerender(self.interview_manager.questions[0]):
             return False
         
+        # Fast path phrases are cached in the background
+        self.tasks.spawn(self.prerender_fast_path(), key="fast_path")
+        
+        self.is_initialized = True
+        return True
+    
+    async def prerender(self, text: str) -> bool:
+        """Synthesize text ahead of time so speaking it skips TTS"""
+        if text in self._prerendered:
+            return True
+        wav_file = await self.tts_service.synthesize(text, voice=self.config.tts_voice)
+        if not wav_file:
+            return False
+        self._prerendered[text] = wav_file
         return True
     
+    async def prerender_fast_path(self, tts_service: Optional[TextToSpeechService] = None) -> None:
+        """Warm the shared TTS cache with every fast path acknowledgment and question"""
+        phrases = AcknowledgmentGenerator.phrases() + self.interview_manager.questions[1:]
+        # Background work: yield to live rooms and REST traffic
+        tts_service = tts_service or TextToSpeechService(self.config, priority=Priority.BATCH)
+        semaphore = asyncio.Semaphore(4)
+        
+        async def render(text: str):
+            async with semaphore:
+                try:
+                    await tts_service.synthesize_bytes(text, self.config.tts_voice)
+                except AdmissionRejected:
+                    pass
+        
+        await asyncio.gather(*(render(text) for text in phrases))
+        logger.debug("⚡ Fast path phrases cached: %d", len(phrases))
+    
+    def assign(self, room_name: str) -> None:
+        """Assign this (possibly pre-warmed) agent to a room"""
+        self.config = dataclasses.replace(self.config, room_name=room_name)
+        self.tasks.name = f"room:{room_name}"
+        self._assigned_at = time.monotonic()
+    
+    def _register_handlers(self, room: "rtc.Room") -> None:
+        """Subscribe to a room's events (once per rtc.Room)"""
+        
+        @room.on("participant_connected")
+        def on_participant_connected(participant):
+            logger.info(f"👤 {participant.identity} joined!")
+            self.tasks.spawn(self.start_interview(), key="interview")
+        
+        @room.on("track_subscribed")
+        def on_track_subscribed(track, publication, participant):
+            logger.info(f"🎵 Got {track.kind} track from {participant.identity}")
+            if track.kind == rtc.TrackKind.KIND_AUDIO:
+                logger.info("🎤 Starting audio processing...")
+                self.participant_ready.set()
+                # After a reconnect the track is new but the turn loop carries on
+                self.tasks.spawn(self.ingest_audio(track), key="ingest", replace=True)
+                if self.tasks.get("turns") is None:
+                    self.tasks.spawn(self.handle_user_audio(), key="turns")
+        
+        @room.on("reconnecting")
+        def on_reconnecting():
+            if room is self.room:
+                self._connection_lost("resuming")
+        
+        @room.on("reconnected")
+        def on_reconnected():
+            if room is self.room:
+                self._connection_restored()
+        
+        @room.on("disconnected")
+        def on_disconnected(reason=None):
+            if room is self.room and not self._closing:
+                self.is_connected = False
+                self._connection_lost(f"disconnected: {reason}")
+                # Rejoin straight away rather than at the caller's next keepalive check
+                self.tasks.spawn(self._rejoin(), key="rejoin")
+    
+    def _connection_lost(self, how: str) -> None:
+        if self._lost_at is None:
+            self._lost_at = time.monotonic()
+            self._drops += 1
+            self.connected_event.clear()
+            logger.warning(f"📶 Connection lost ({how})")
+            if self.capture:
+                self.capture.record_event("connection_lost", how=how)
+    
+    def _connection_restored(self) -> None:
+        self.connected_event.set()
+        if self._lost_at is None:
+            return
+        self.last_reconnect_ms = (time.monotonic() - self._lost_at) * 1000
+        self._lost_at = None
+        self.reconnects += 1
+        logger.info("🔌 Reconnected in %.0f ms", self.last_reconnect_ms)
+        if self.capture:
+            self.capture.record_event("reconnected", ms=round(self.last_reconnect_ms, 1))
+    
+    async def wait_connected(self) -> bool:
+        """Wait for a lost connection to come back; False if it does not in time"""
+        if self._closing:
+            return False
+        try:
+            await asyncio.wait_for(self.connected_event.wait(), timeout=self.config.reconnect_timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    async def _join(self) -> None:
+        """Join the room and publish the agent's audio track"""
+        if self._joined:
+            # A dropped rtc.Room is not reused; the new one gets its own handlers
+            old_room, self.room = self.room, rtc.Room()
+            self._register_handlers(self.room)
+            try:
+                await old_room.disconnect()
+            except Exception:
+                pass
+        
+        # Create token
+        token = api.AccessToken(
+            self.config.livekit_api_key,
+            self.config.livekit_api_secret
+        )
+        token.with_identity(self.config.agent_identity)
+        token.with_name(self.config.agent_name)
+        token.with_grants(api.VideoGrants(
+            room_join=True,
+            room=self.config.room_name
+        ))
+        
+        # Connect
+        await self.room.connect(
+            url=self.config.livekit_url,
+            token=token.to_jwt()
+        )
+        self._joined = True
+        
+        # Set up audio track
+        await self.setup_audio()
+        
+        self.is_connected = True
+        self._connection_restored()
+    
     async def connect(self) -> bool:
         """Connect to LiveKit room"""
+        if self._joined:
+            return self.is_connected or await self.reconnect()
         try:
-            # Initialize services
+            # Capture from the start so the welcome render is included
+            if self.config.capture_enabled and self.capture is None:
+                self.capture = SessionCapture(self.config.room_name, self.config.capture_dir,
+                                              sample_rate=INBOUND_SAMPLE_RATE)
+                self.capture.start()
+            set_capture(self.capture)
+            
+            # Initialize services (no-op for agents warmed by the pool)
             if not await self.initialize():
                 return False
             
-            # Create token
-            token = api.AccessToken(
-                self.config.livekit_api_key,
-                self.config.livekit_api_secret
-            )
-            token.with_identity(self.config.agent_identity)
-            token.with_name(self.config.agent_name)
-            token.with_grants(api.VideoGrants(
-                room_join=True,
-                room=self.config.room_name
-            ))
-            
-            # Set up event handlers
-            @self.room.on("participant_connected")
-            def on_participant_connected(participant):
-                logger.info(f"👤 {participant.identity} joined!")
-                asyncio.create_task(self.start_interview())
-            
-            @self.room.on("track_subscribed")
-            def on_track_subscribed(track, publication, participant):
-                logger.info(f"🎵 Got {track.kind} track from {participant.identity}")
-                if track.kind == rtc.TrackKind.KIND_AUDIO:
-                    logger.info("🎤 Starting audio processing...")
-                    asyncio.create_task(self.handle_user_audio())
-            
-            # Connect
-            await self.room.connect(
-                url=self.config.livekit_url,
-                token=token.to_jwt()
-            )
+            await self._join()
+            logger.info("✅ Connected to LiveKit room!")
             
-            # Set up audio track
-            await self.setup_audio()
+            if self.config.recording_enabled and self.recorder is None:
+                self.recorder = SessionRecorder(
+                    self.config.room_name,
+                    self.config.recording_dir,
+                    max_queue=self.config.recording_queue_size,
+                    sample_rate=INBOUND_SAMPLE_RATE
+                )
+                self.recorder.start()
+            
+            if self.config.stt_streaming and self.stt_session is None:
+                await self.open_stt_session()
+            
+            # The candidate may have joined before the agent did
+            if self.room.remote_participants:
+                self.tasks.spawn(self.start_interview(), key="interview")
             
-            self.is_connected = True
-            logger.info("✅ Connected to LiveKit room!")
             return True
             
         except Exception as e:
             logger.error(f"Connection failed: {e}")
             return False
     
+    async def reconnect(self) -> bool:
+        """Rejoin the room after the connection was lost
+        
+        Services stay initialized, and the interview, STT session and turn
+        loop carry on where they were; only the room connection and the
+        agent's audio track are rebuilt. Retries with exponential backoff for
+        up to ``reconnect_timeout`` seconds. Concurrent callers share one
+        attempt.
+        """
+        if self._closing:
+            return False
+        task = self.tasks.spawn(self._rejoin(), key="rejoin")
+        if task is None:
+            return False
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # The attempt was cancelled by disconnect(), not the caller
+            if task.cancelled() and self._closing:
+                return False
+            raise
+    
+    async def _rejoin(self) -> bool:
+        self._connection_lost("reconnecting")
+        deadline = time.monotonic() + self.config.reconnect_timeout
+        delay = self.config.reconnect_backoff
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                await self._join()
+                return True
+            except Exception as e:
+                logger.warning(f"Reconnect attempt {attempt} failed: {e}")
+            if self._closing or time.monotonic() + delay > deadline:
+                logger.error(f"❌ Could not reconnect after {attempt} attempts")
+                return False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+    
+    async def open_stt_session(self) -> None:
+        """Open the room's streaming STT session, falling back to simulated answers on failure"""
+        session = self.stt_service.open_session(self.config.room_name, sample_rate=INBOUND_SAMPLE_RATE)
+        try:
+            await session.start()
+            self.stt_session = session
+        except Exception as e:
+            logger.error(f"Streaming STT unavailable, using simulated answers: {e}")
+    
     async def setup_audio(self):
         """Set up audio track"""
         try:
@@ -117,12 +385,32 @@ class LiveKitRoomManager:
     
     async def start_interview(self):
         """Start the interview"""
+        if self._interview_started:
+            return
+        self._interview_started = True
+        set_log_context(room=self.config.room_name, turn=0)
+        set_capture(self.capture)
+        if self.capture:
+            self.capture.record_event("interview_start")
+        
         try:
-            await asyncio.sleep(2)  # Wait for connection to stabilize
+            # Start as soon as the candidate's audio track is subscribed
+            try:
+                await asyncio.wait_for(self.participant_ready.wait(),
+                                       timeout=self.config.agent_ready_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("No candidate audio track yet, starting anyway")
             
             # Generate welcome message
             welcome = await self.interview_manager.generate_response()
-            logger.info(f"🎙️ Starting interview: {welcome}")
+            logger.info("🎙️ Starting interview: %s", welcome)
+            if self.recorder:
+                self.recorder.record_turn("agent", welcome,
+                                          question=self.interview_manager.last_response_parts[-1])
+            if self.capture:
+                self.capture.record_event("response", turn=0, text=welcome)
+            if self._assigned_at is not None:
+                logger.info("⏱️ Assign-to-welcome: %.2fs", time.monotonic() - self._assigned_at)
             
             # Play welcome message
             if self.audio_source:
@@ -136,62 +424,250 @@ class LiveKitRoomManager:
         try:
             self.interview_manager.is_speaking = True
             
-            # Synthesize speech
-            wav_file = await self.tts_service.synthesize(text)
+            # Use pre-rendered audio when available, otherwise synthesize
+            wav_file = self._prerendered.pop(text, None)
+            if not wav_file:
+                wav_file = await self.tts_service.synthesize(text, voice=self.config.tts_voice)
             
             if wav_file and self.audio_source:
-                # Play WAV file
-                duration = await self.tts_service.play_wav_file(wav_file, self.audio_source)
+                if self.capture:
+                    self.capture.record_event("speak_start", text=text)
                 
-                # Wait for audio to finish playing
-                await asyncio.sleep(duration)
+                # Play WAV file and wait for it to finish
+                duration = await self._play_through(
+                    lambda: self.tts_service.play_wav_file(wav_file, self.audio_source))
+                if self.capture:
+                    self.capture.record_event("speak_end", duration=round(duration, 3))
                 
-                # Clean up temporary file
-                os.unlink(wav_file)
+                # Hand the file to the recorder, or clean it up
+                if not (self.recorder and self.recorder.record_file(wav_file)):
+                    os.unlink(wav_file)
                 
-            logger.info("✅ Speech completed")
+            logger.debug("✅ Speech completed")
                 
         except Exception as e:
             logger.error(f"Speech error: {e}")
-            logger.info(f"💬 [TEXT ONLY] Agent says: {text}")
+            logger.info("💬 [TEXT ONLY] Agent says: %s", text)
         finally:
             self.interview_manager.is_speaking = False
     
+    async def _play_through(self, play: Callable[[], Awaitable[float]]) -> float:
+        """Play speech and wait for it to finish
+        
+        If the connection drops meanwhile, the candidate missed part of it:
+        once reconnected (on a new audio source) it is played again.
+        """
+        drops = self._drops
+        try:
+            duration = await play()
+            await asyncio.sleep(duration / self.playback_rate)
+        except Exception:
+            # The old audio source may fail once the room is gone
+            if self._drops == drops:
+                raise
+        if self._drops != drops and await self.wait_connected():
+            logger.info("🔁 Repeating speech cut off by the connection drop")
+            duration = await play()
+            await asyncio.sleep(duration / self.playback_rate)
+        elif self._drops != drops:
+            raise ConnectionError("Connection not restored")
+        return duration
+    
+    def inbound_processor(self) -> Callable:
+        """Function that preprocesses one inbound frame into the inbound ring buffer"""
+        level_log = LogSampler(logger, interval=5.0)
+        preprocess_config = PreprocessorConfig.from_agent_config(self.config)
+        preprocessor = AudioPreprocessor(preprocess_config)
+        frame_samples = preprocessor.frame_samples
+        # Frames may not be exactly 10 ms, so stage them and process in 10 ms chunks
+        staging = AudioRingBuffer(INBOUND_SAMPLE_RATE)
+        
+        def process(data) -> None:
+            staging.write(data)
+            while staging.available >= frame_samples:
+                processed = preprocessor.process(staging.read(frame_samples))
+                self.inbound_audio.write(processed)
+                if self.recorder:
+                    self.recorder.record_audio(processed)
+                if self.stt_session:
+                    self.stt_session.push_audio(processed)
+                level_log.debug("🎚️ Inbound gain %.1fx, gate %s", preprocessor.gain,
+                                "open" if preprocessor.gate_open else "closed")
+        
+        return process
+    
+    def prerender_next_questions(self) -> None:
+        """Start rendering every question that may follow the current answer"""
+        for text in self.interview_manager.next_question_candidates():
+            if text not in self._question_pcm and not self._closing:
+                # Not a room task: closing the room must not cancel a render
+                # that other rooms are waiting on
+                task = asyncio.create_task(self.tts_service.synthesize_pcm(text, voice=self.config.tts_voice))
+                _detached_renders.add(task)
+                task.add_done_callback(_detached_renders.discard)
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+                self._question_pcm[text] = task
+    
+    def release_question_pcm(self) -> None:
+        """Drop question audio that was not used this turn
+        
+        Renders still running are left to finish: other rooms may be waiting
+        on the same TTS cache entry, and the audio stays cached either way.
+        """
+        self._question_pcm.clear()
+    
+    async def speak_response(self, parts: List[str]) -> None:
+        """Speak a response, splicing a pre-rendered question onto the acknowledgment
+        
+        Only the acknowledgment is synthesized after the LLM answers; the
+        question was rendered while the candidate spoke and plays without a gap.
+        """
+        question_pcm = self._question_pcm.pop(parts[-1], None) if len(parts) > 1 else None
+        if question_pcm is None:
+            for part in parts:
+                await self.speak(part)
+            return
+        lead = " ".join(parts[:-1])
+        try:
+            lead_samples, question_samples = await asyncio.gather(
+                self.tts_service.synthesize_pcm(lead, voice=self.config.tts_voice), asyncio.shield(question_pcm))
+        except asyncio.CancelledError:
+            if not question_pcm.cancelled():
+                raise
+            # The render was cancelled, not this turn: speak the parts instead
+            lead_samples = question_samples = None
+        except Exception as e:
+            logger.warning(f"Spliced speech unavailable: {e}")
+            lead_samples = question_samples = None
+        if lead_samples is None or question_samples is None:
+            for part in parts:
+                await self.speak(part)
+            return
+        await self.play_pcm(np.concatenate([lead_samples, question_samples]), " ".join(parts))
+    
+    async def play_pcm(self, samples: np.ndarray, text: str) -> None:
+        """Play rendered speech and wait for it to finish"""
+        try:
+            self.interview_manager.is_speaking = True
+            if self.capture:
+                self.capture.record_event("speak_start", text=text)
+            duration = await self._play_through(
+                lambda: self.tts_service.play_pcm(samples, PLAYBACK_SAMPLE_RATE, self.audio_source))
+            if self.capture:
+                self.capture.record_event("speak_end", duration=round(duration, 3))
+            if self.recorder:
+                # Encoded and written by the recorder's thread
+                self.recorder.record_speech(samples, PLAYBACK_SAMPLE_RATE)
+        except Exception as e:
+            logger.error(f"Speech error: {e}")
+            logger.info("💬 [TEXT ONLY] Agent says: %s", text)
+        finally:
+            self.interview_manager.is_speaking = False
+    
+    async def ingest_audio(self, track: "rtc.Track"):
+        """Preprocess inbound audio frames into the inbound ring buffer"""
+        set_log_context(room=self.config.room_name)
+        process = self.inbound_processor()
+        
+        try:
+            stream = rtc.AudioStream(track, sample_rate=INBOUND_SAMPLE_RATE, num_channels=1)
+        except Exception as e:
+            logger.error(f"Inbound audio error: {e}")
+            return
+        try:
+            async for event in stream:
+                if self.capture:
+                    self.capture.record_frame(event.frame.data)
+                process(event.frame.data)
+        except Exception as e:
+            logger.error(f"Inbound audio error: {e}")
+        finally:
+            # Also when a resubscribed track replaces this task or the room closes
+            await stream.aclose()
+    
+    async def next_answer(self, turn: int) -> Optional[str]:
+        """The candidate's next answer, or None when there are no more"""
+        if self.stt_session:
+            return await self.stt_session.next_utterance()
+        # Simulate the candidate thinking and speaking
+        if turn >= len(SIMULATED_ANSWERS):
+            return None
+        await asyncio.sleep(8)
+        return SIMULATED_ANSWERS[turn]
+    
     async def handle_user_audio(self):
-        """Handle user audio (simplified version)"""
-        # Simulate audio processing - in a real application this would handle real audio
-        test_responses = [
-            "I have 3 years of experience building REST APIs with Node.js and Python Flask",
-            "SQL databases are good for structured data with ACID properties, while NoSQL databases like MongoDB are better for flexible schemas and horizontal scaling",
-            "I would implement rate limiting using Redis with a token bucket algorithm, storing counters per user and resetting them periodically",
-            "To debug slow queries, I would first check the execution plan, then add appropriate indexes, and optimize the query structure",
-            "For data consistency, I use database transactions for ACID operations and implement event sourcing with saga patterns for distributed systems"
-        ]
-        
-        for i, response in enumerate(test_responses):
-            # Wait some time to simulate user thinking and speaking
-            await asyncio.sleep(8)
-            
-            if not self.is_connected:
+        """Answer each candidate turn until the interview ends"""
+        set_log_context(room=self.config.room_name)
+        set_capture(self.capture)
+        turn = 0
+        while True:
+            # The next question is known before the answer; render it meanwhile
+            self.prerender_next_questions()
+            response = await self.next_answer(turn)
+            
+            if response is None:
+                break
+            # Answers heard while the room was reconnecting still count
+            if not self.is_connected and not await self.wait_connected():
                 break
-                
-            logger.info(f"👤 User: {response}")
+            
+            turn += 1
+            set_log_context(turn=turn)
+            logger.info("👤 User: %s", response)
+            if self.recorder:
+                self.recorder.record_turn("candidate", response)
+            if self.capture:
+                self.capture.record_event("answer", turn=turn, text=response)
             
             # Generate AI response
             ai_response = await self.interview_manager.generate_response(response)
-            logger.info(f"🤖 Agent: {ai_response}")
+            logger.info("🤖 Agent: %s", ai_response)
+            if self.recorder:
+                # The question on its own, for re-scoring against what was actually asked
+                self.recorder.record_turn("agent", ai_response,
+                                          question=self.interview_manager.last_response_parts[-1])
+            if self.capture:
+                self.capture.record_event("response", turn=turn, text=ai_response,
+                                          parts=len(self.interview_manager.last_response_parts))
             
-            # Play AI response
+            # Play AI response (acknowledgment, then the pre-rendered question)
             if self.audio_source and not self.interview_manager.is_speaking:
-                await self.speak(ai_response)
+                await self.speak_response(self.interview_manager.last_response_parts)
+            self.release_question_pcm()
             
             # If last question, end
             if self.interview_manager.question_count >= len(self.interview_manager.questions):
                 break
     
+    def release_prerendered(self) -> None:
+        """Delete any pre-rendered audio that was never played"""
+        self.tasks.cancel("fast_path")
+        for wav_file in self._prerendered.values():
+            try:
+                os.unlink(wav_file)
+            except OSError:
+                pass
+        self._prerendered.clear()
+        self.release_question_pcm()
+    
     async def disconnect(self):
         """Disconnect from LiveKit room"""
+        self._closing = True
+        self.connected_event.clear()
+        # Turn loop, audio ingest, fast-path renders and reconnects end with the room
+        await self.tasks.close()
+        self.release_prerendered()
+        if self.stt_session:
+            await self.stt_session.close()
+            self.stt_session = None
         if self.is_connected:
             await self.room.disconnect()
             self.is_connected = False
-            logger.info("✅ Disconnected from LiveKit room") 
\ No newline at end of file
+            logger.info("✅ Disconnected from LiveKit room")
+        if self.recorder:
+            # Flushing the last segment touches disk, keep it off the loop
+            await asyncio.to_thread(self.recorder.close)
+            self.recorder = None
+        if self.capture:
+            await asyncio.to_thread(self.capture.close)
+            self.capture = None 
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+Prompt templates for the interviewer.
+
+Templates are compiled once at import; each turn only substitutes values.
+"""
+from string import Template
+
+RESPONSE_TEMPLATE = Template("""You are a backend development interviewer.
+The candidate just said: "$answer"
+
+Give a brief, conversational acknowledgment of their answer: one sentence,
+under 20 words. Do not ask anything; this question is asked right after it:
+$question""")
+
+EVALUATION_TEMPLATE = Template("""You are a backend development interviewer reviewing a recorded interview.
+The interview covered these questions:
+$questions
+
+Candidate transcript:
+"$transcript"
+
+Rate the candidate from 1 to 10 on the first line as "Score: N", then give a
+brief (under 80 words) summary of their strengths and gaps.""")
+
+def response_prompt(answer: str, question: str) -> str:
+    """Prompt for acknowledging an answer, leading into the next question"""
+    return RESPONSE_TEMPLATE.substitute(answer=answer, question=question)
+
+def evaluation_prompt(questions, transcript: str) -> str:
+    """Prompt for scoring a complete interview transcript"""
+    return EVALUATION_TEMPLATE.substitute(
+        questions="\n".join(f"- {q}" for q in questions),
+        transcript=transcript
+    )
@@ -0,0 +1,201 @@
+"""
+Indexed interview question bank.
+
+Questions live in a JSONL file, one object per line:
+    {"id": "db-indexes", "topic": "databases", "difficulty": 1,
+     "text": "What is a database index...?", "follow_ups": ["db-explain"]}
+
+The bank is read lazily on first use through a memory map, so a bank of
+thousands of questions costs nothing at import or boot. Once loaded, a
+topic -> difficulty -> questions index gives constant-time selection for
+the adaptive interview flow.
+"""
+import json
+import logging
+import mmap
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "questions.jsonl")
+
+MIN_DIFFICULTY = 1
+MAX_DIFFICULTY = 5
+
+# Answer length bands used to adapt the interview
+SHORT_ANSWER_WORDS = 12
+LONG_ANSWER_WORDS = 40
+
+_WORD = re.compile(r"\w+")
+
+@dataclass
+class Question:
+    """One question in the bank"""
+    id: str
+    text: str
+    topic: str
+    difficulty: int = 2
+    follow_ups: List[str] = field(default_factory=list)
+
+class QuestionBank:
+    """Question bank loaded on first use, indexed by topic and difficulty"""
+
+    def __init__(self, path: str = DEFAULT_BANK_PATH):
+        self.path = path
+        self._questions: Optional[List[Question]] = None
+        self._by_id: Dict[str, Question] = {}
+        self._index: Dict[str, Dict[int, List[Question]]] = {}
+        self._topics: List[str] = []
+
+    @classmethod
+    def from_questions(cls, questions: Iterable[Question]) -> 'QuestionBank':
+        """Build an in-memory bank (for tests and generated banks)"""
+        bank = cls(path="")
+        bank._build(list(questions))
+        return bank
+
+    def _load(self) -> List[Question]:
+        if self._questions is None:
+            questions = []
+            with open(self.path, "rb") as f:
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        for line in iter(mapped.readline, b""):
+                            if line.strip():
+                                entry = json.loads(line)
+                                questions.append(Question(
+                                    id=entry["id"],
+                                    text=entry["text"],
+                                    topic=entry.get("topic", "general"),
+                                    difficulty=int(entry.get("difficulty", 2)),
+                                    follow_ups=entry.get("follow_ups", [])
+                                ))
+            self._build(questions)
+            logger.info(f"📚 Loaded {len(questions)} questions in {len(self._topics)} topics from {self.path}")
+        return self._questions
+
+    def _build(self, questions: List[Question]) -> None:
+        self._questions = questions
+        self._by_id = {q.id: q for q in questions}
+        self._index = {}
+        for question in questions:
+            by_difficulty = self._index.setdefault(question.topic, {})
+            by_difficulty.setdefault(question.difficulty, []).append(question)
+        # Topics in file order, the default interview sequence
+        self._topics = list(self._index)
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    @property
+    def topics(self) -> List[str]:
+        self._load()
+        return list(self._topics)
+
+    @property
+    def questions(self) -> List[Question]:
+        return list(self._load())
+
+    def get(self, question_id: str) -> Optional[Question]:
+        """Question by id"""
+        self._load()
+        return self._by_id.get(question_id)
+
+    def select(self, topic: str, difficulty: int, exclude: Set[str] = frozenset()) -> Optional[Question]:
+        """First unasked question in a topic, at or nearest to a difficulty"""
+        self._load()
+        by_difficulty = self._index.get(topic)
+        if not by_difficulty:
+            return None
+        for distance in range(MAX_DIFFICULTY - MIN_DIFFICULTY + 1):
+            # Prefer easier over harder at equal distance
+            for level in (difficulty - distance, difficulty + distance):
+                for question in by_difficulty.get(level, ()):
+                    if question.id not in exclude:
+                        return question
+        return None
+
+    def follow_up(self, question: Question, exclude: Set[str] = frozenset()) -> Optional[Question]:
+        """First unasked follow-up of a question"""
+        self._load()
+        for question_id in question.follow_ups:
+            candidate = self._by_id.get(question_id)
+            if candidate and candidate.id not in exclude:
+                return candidate
+        return None
+
+    def plan(self, count: int, difficulty: int = 2) -> List[Question]:
+        """Default sequence: one question per topic in order, at a difficulty"""
+        planned: List[Question] = []
+        asked: Set[str] = set()
+        topics = self.topics
+        while topics and len(planned) < count:
+            added = False
+            for topic in topics:
+                if len(planned) >= count:
+                    break
+                question = self.select(topic, difficulty, asked)
+                if question:
+                    planned.append(question)
+                    asked.add(question.id)
+                    added = True
+            if not added:
+                break
+        return planned
+
+    def next_question(self, current: Optional[Question], answer: str, asked: Set[str],
+                      difficulty: int, upcoming_topic: Optional[str]) -> Tuple[Optional[Question], int]:
+        """Adaptive choice of the next question, returning (question, difficulty)
+
+        A short answer gets a follow-up on the same question when one exists,
+        otherwise the difficulty steps down; a long answer steps it up.
+        """
+        return self._next_for_length(current, len(_WORD.findall(answer)), asked, difficulty, upcoming_topic)
+
+    def next_question_candidates(self, current: Optional[Question], asked: Set[str],
+                                 difficulty: int, upcoming_topic: Optional[str]) -> List[Question]:
+        """Every question ``next_question`` can pick, whatever the answer
+
+        The choice depends only on the answer's length band, so there are
+        at most three.
+        """
+        candidates: Dict[str, Question] = {}
+        for words in (0, SHORT_ANSWER_WORDS, LONG_ANSWER_WORDS):
+            question, _ = self._next_for_length(current, words, asked, difficulty, upcoming_topic)
+            if question:
+                candidates.setdefault(question.id, question)
+        return list(candidates.values())
+
+    def _next_for_length(self, current: Optional[Question], words: int, asked: Set[str],
+                         difficulty: int, upcoming_topic: Optional[str]) -> Tuple[Optional[Question], int]:
+        if current is not None and words < SHORT_ANSWER_WORDS:
+            follow_up = self.follow_up(current, asked)
+            if follow_up:
+                return follow_up, difficulty
+            difficulty = max(MIN_DIFFICULTY, difficulty - 1)
+        elif words >= LONG_ANSWER_WORDS:
+            difficulty = min(MAX_DIFFICULTY, difficulty + 1)
+
+        topics = self.topics
+        if upcoming_topic in topics:
+            # Stay on the planned topic, then fall back to any other
+            topics = [upcoming_topic] + [t for t in topics if t != upcoming_topic]
+        for topic in topics:
+            question = self.select(topic, difficulty, asked)
+            if question:
+                return question, difficulty
+        return None, difficulty
+
+# Shared bank for the process
+_bank: Optional[QuestionBank] = None
+
+def get_question_bank(config=None) -> QuestionBank:
+    """Get the process-wide question bank (not read until first used)"""
+    global _bank
+    if _bank is None:
+        path = getattr(config, "question_bank_path", "") if config else ""
+        _bank = QuestionBank(path or DEFAULT_BANK_PATH)
+    return _bank
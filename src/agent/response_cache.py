@@ -0,0 +1,212 @@
+"""
+Cache of interviewer responses to short, common answers.
+
+Many answers are near-identical ("yes", "I'm not sure", "I've used
+PostgreSQL"), and so is the LLM's acknowledgment of them. Acknowledgments
+are keyed by the question that was answered and the normalized answer:
+
+- exact: the normalized answer matches a cached one
+- fuzzy: the MinHash estimate of the Jaccard similarity of character
+  trigrams is at least ``similarity``; candidates are found through
+  locality-sensitive hashing bands, so lookups don't scan the cache.
+  A near match must also agree on negation ("never", "haven't", ...)
+
+Entries expire after ``ttl`` seconds and the least recently used entries
+are evicted beyond ``max_entries``. A cached response repeats its text
+exactly, so its audio is usually still in the TTS cache as well.
+"""
+import re
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from src.config import AgentConfig
+
+# Longer answers are specific enough that a reply to another one would not fit
+MAX_ANSWER_WORDS = 12
+
+# MinHash signature: BANDS x ROWS permutations; a pair at the similarity
+# threshold shares at least one band with high probability
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE = 3
+
+# One seed per permutation, mixed into each shingle hash with splitmix64
+_SEEDS = np.random.RandomState(7).randint(0, 1 << 62, NUM_PERM, dtype=np.int64).astype(np.uint64)
+
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+_SPACES = re.compile(r"\s+")
+
+# Trigram similarity can't see that "I've never used Redis" is the opposite
+# of "I've used Redis", so near matches must agree on these
+NEGATIONS = frozenset({
+    "no", "not", "never", "nope", "none", "nothing", "neither", "nor", "cannot",
+    "dont", "didnt", "doesnt", "havent", "hasnt", "hadnt", "cant", "couldnt",
+    "wont", "wouldnt", "isnt", "arent", "wasnt", "werent", "shouldnt",
+})
+
+CacheKey = Tuple[str, str]
+
+def normalize_answer(answer: str) -> str:
+    """Lowercase, apostrophes dropped, other punctuation stripped, whitespace collapsed"""
+    text = _NON_WORD.sub(" ", answer.lower().replace("'", "").replace("’", ""))
+    return _SPACES.sub(" ", text).strip()
+
+def _negated(normalized: str) -> bool:
+    return any(word in NEGATIONS for word in normalized.split())
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer (uint64 arithmetic wraps)"""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def minhash(text: str) -> np.ndarray:
+    """MinHash signature of a text's character trigrams"""
+    padded = f" {text} "
+    shingles = {padded[i:i + SHINGLE] for i in range(max(len(padded) - SHINGLE + 1, 1))}
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64)
+    # One hash function per permutation, minimum over the shingles
+    return _mix(_SEEDS[:, None] ^ hashes[None, :]).min(axis=1)
+
+@dataclass
+class _Entry:
+    response: str
+    signature: np.ndarray
+    created_at: float
+    bands: List[Tuple[str, int, bytes]] = field(default_factory=list)
+
+class ResponseCache:
+    """LRU cache of LLM responses keyed by (question, normalized answer)"""
+
+    def __init__(self, max_entries: int = 5000, ttl: float = 3600.0, similarity: float = 0.85):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._bands: Dict[Tuple[str, int, bytes], Set[CacheKey]] = {}
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def cacheable(answer: str) -> bool:
+        """Whether an answer is short enough to share a response"""
+        words = normalize_answer(answer).split()
+        return 0 < len(words) <= MAX_ANSWER_WORDS
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key)
+        for band in entry.bands:
+            keys = self._bands.get(band)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._bands[band]
+
+    def _fresh(self, key: CacheKey, now: float) -> Optional[_Entry]:
+        """Entry for a key unless it has expired (expired entries are dropped)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if now - entry.created_at > self.ttl:
+            self._remove(key)
+            self.expirations += 1
+            return None
+        return entry
+
+    def get(self, question: str, answer: str) -> Optional[str]:
+        """Cached response for an answer to a question, exact or near match"""
+        if not self.cacheable(answer):
+            self.skipped += 1
+            return None
+        now = time.monotonic()
+        normalized = normalize_answer(answer)
+        key = (question, normalized)
+        entry = self._fresh(key, now)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.exact_hits += 1
+            return entry.response
+
+        signature = minhash(normalized)
+        candidates: Set[CacheKey] = set()
+        for band in self._band_keys(question, signature):
+            candidates.update(self._bands.get(band, ()))
+        negated = _negated(normalized)
+        best_key, best_score = None, self.similarity
+        for candidate in candidates:
+            entry = self._fresh(candidate, now)
+            if entry is None or _negated(candidate[1]) != negated:
+                continue
+            score = float(np.mean(entry.signature == signature))
+            if score >= best_score:
+                best_key, best_score = candidate, score
+        if best_key is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(best_key)
+        self.fuzzy_hits += 1
+        return self._entries[best_key].response
+
+    @staticmethod
+    def _band_keys(question: str, signature: np.ndarray) -> List[Tuple[str, int, bytes]]:
+        return [(question, band, signature[band * ROWS:(band + 1) * ROWS].tobytes())
+                for band in range(BANDS)]
+
+    def put(self, question: str, answer: str, response: str) -> None:
+        """Cache the response to an answer, evicting least recently used entries"""
+        if not self.cacheable(answer):
+            return
+        key = (question, normalize_answer(answer))
+        if key in self._entries:
+            self._remove(key)
+        signature = minhash(key[1])
+        entry = _Entry(response, signature, time.monotonic(), self._band_keys(question, signature))
+        self._entries[key] = entry
+        for band in entry.bands:
+            self._bands.setdefault(band, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self._entries.clear()
+        self._bands.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Occupancy and hit counts"""
+        hits = self.exact_hits + self.fuzzy_hits
+        lookups = hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "exact_hits": self.exact_hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "misses": self.misses,
+            "skipped": self.skipped,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+# Shared by every interview in the process
+_cache: Optional[ResponseCache] = None
+
+def get_response_cache(config: AgentConfig) -> Optional[ResponseCache]:
+    """Get the process-wide response cache, or None when disabled"""
+    global _cache
+    if not config.llm_cache_enabled:
+        return None
+    if _cache is None:
+        _cache = ResponseCache(config.llm_cache_max_entries, config.llm_cache_ttl,
+                               config.llm_cache_similarity)
+    return _cache
@@ -0,0 +1,360 @@
+"""
+Cluster-wide registry of interview rooms.
+
+Each worker runs the agents of the rooms it allocated (``RoomScheduler``),
+but a room operation such as ``DELETE /room/{name}`` or a create retry with
+the same idempotency key may reach any uvicorn worker on any node. Workers
+record every room they own in a shared registry with its owner, state and
+the candidate identity, and heartbeat while alive:
+
+- ``InProcessRoomRegistry``: a single worker (the default)
+- ``RedisRoomRegistry``: shared by every worker through Redis
+  (``ROOM_REGISTRY_URL=redis://...``); any client with the redis.asyncio
+  interface works
+
+A worker that has not heartbeated for ``ttl`` seconds is dead: its rooms
+are expired on lookup and by ``sweep()``. Operations on a room owned by a
+live worker are forwarded to it through its registry inbox rather than over
+HTTP, since workers behind one port cannot be addressed individually.
+"""
+import abc
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from src.config import AgentConfig, get_config
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for the owning worker to answer a forwarded operation
+FORWARD_TIMEOUT = 5.0
+
+# Seconds an inbox read blocks before checking again
+INBOX_POLL = 1
+
+Handler = Callable[[str, str], Awaitable[Dict[str, Any]]]
+
+@dataclass
+class RoomRecord:
+    """A room as seen by every worker"""
+    room_name: str
+    owner: str
+    state: str = "starting"
+    user_identity: str = ""
+    idempotency_key: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    heartbeat: Optional[float] = None  # owner's last heartbeat (wall time), filled on lookup
+
+    def to_fields(self) -> Dict[str, str]:
+        """Flat string fields for storage (heartbeat is kept per worker)"""
+        return {
+            "room_name": self.room_name,
+            "owner": self.owner,
+            "state": self.state,
+            "user_identity": self.user_identity,
+            "idempotency_key": self.idempotency_key or "",
+            "created_at": repr(self.created_at),
+        }
+
+    @classmethod
+    def from_fields(cls, fields: Dict[str, str]) -> "RoomRecord":
+        return cls(
+            room_name=fields["room_name"],
+            owner=fields["owner"],
+            state=fields.get("state", "starting"),
+            user_identity=fields.get("user_identity", ""),
+            idempotency_key=fields.get("idempotency_key") or None,
+            created_at=float(fields.get("created_at") or 0.0),
+        )
+
+class RoomRegistry(abc.ABC):
+    """Rooms by owner worker; backends implement storage and forwarding"""
+
+    backend = ""
+
+    def __init__(self, worker_id: str, ttl: float = 30.0):
+        self.worker_id = worker_id
+        self.ttl = ttl
+        self.expired = 0
+        self.forwarded = 0
+        self.served = 0
+
+    @abc.abstractmethod
+    async def register(self, record: RoomRecord) -> None:
+        """Record a room owned by this worker"""
+
+    @abc.abstractmethod
+    async def claim_key(self, idempotency_key: str, room_name: str) -> Optional[str]:
+        """Atomically point an idempotency key at a room
+
+        Returns None once the key is the room's, or the name of the room
+        that already holds it.
+        """
+
+    @abc.abstractmethod
+    async def set_state(self, room_name: str, state: str) -> None:
+        """Update the state of a room owned by this worker"""
+
+    @abc.abstractmethod
+    async def heartbeat(self) -> None:
+        """Mark this worker alive for another ``ttl`` seconds"""
+
+    @abc.abstractmethod
+    async def retire(self) -> None:
+        """Mark this worker dead straight away (on shutdown)"""
+
+    @abc.abstractmethod
+    async def rooms(self) -> List[RoomRecord]:
+        """Every registered room, including those of dead workers"""
+
+    @abc.abstractmethod
+    async def _load(self, room_name: str) -> Optional[RoomRecord]:
+        """Stored record of a room, if any"""
+
+    @abc.abstractmethod
+    async def _room_for_key(self, idempotency_key: str) -> Optional[str]:
+        """Name of the room holding an idempotency key"""
+
+    @abc.abstractmethod
+    async def _owner_heartbeat(self, owner: str) -> Optional[float]:
+        """Last heartbeat of a worker, or None once it has expired"""
+
+    @abc.abstractmethod
+    async def _drop(self, record: RoomRecord) -> None:
+        """Delete a room's record, and its idempotency key if it points there"""
+
+    async def forward(self, record: RoomRecord, action: str) -> Optional[Dict[str, Any]]:
+        """Have the room's owner perform an action; None if it did not answer"""
+        return None
+
+    async def serve(self, handler: Handler) -> None:
+        """Perform actions forwarded to this worker until cancelled"""
+
+    async def _live(self, record: Optional[RoomRecord]) -> Optional[RoomRecord]:
+        """The record if its owner is alive; rooms of dead owners are expired"""
+        if record is None:
+            return None
+        record.heartbeat = await self._owner_heartbeat(record.owner)
+        if record.heartbeat is None and record.owner != self.worker_id:
+            await self._drop(record)
+            self.expired += 1
+            logger.info(f"🧹 Expired room {record.room_name} of dead worker {record.owner}")
+            return None
+        return record
+
+    async def lookup(self, room_name: str) -> Optional[RoomRecord]:
+        """A room and its live owner"""
+        return await self._live(await self._load(room_name))
+
+    async def lookup_key(self, idempotency_key: str) -> Optional[RoomRecord]:
+        """The room allocated for an idempotency key, on any live worker"""
+        room_name = await self._room_for_key(idempotency_key)
+        return await self.lookup(room_name) if room_name else None
+
+    async def remove(self, room_name: str) -> None:
+        """Forget a room this worker owns"""
+        record = await self._load(room_name)
+        if record is not None and record.owner == self.worker_id:
+            await self._drop(record)
+
+    async def sweep(self) -> int:
+        """Expire every room whose owner is dead; returns how many"""
+        before = self.expired
+        for record in await self.rooms():
+            await self._live(record)
+        return self.expired - before
+
+    def stats(self) -> Dict[str, Any]:
+        """Backend, identity and forwarding counters"""
+        return {
+            "backend": self.backend,
+            "worker_id": self.worker_id,
+            "ttl": self.ttl,
+            "expired": self.expired,
+            "forwarded": self.forwarded,
+            "served": self.served,
+        }
+
+class InProcessRoomRegistry(RoomRegistry):
+    """Registry for a single worker; nothing is ever owned elsewhere"""
+
+    backend = "memory"
+
+    def __init__(self, worker_id: str, ttl: float = 30.0):
+        super().__init__(worker_id, ttl)
+        self._rooms: Dict[str, RoomRecord] = {}
+        self._keys: Dict[str, str] = {}
+        self._workers: Dict[str, float] = {}
+
+    async def register(self, record: RoomRecord) -> None:
+        self._rooms[record.room_name] = record
+
+    async def claim_key(self, idempotency_key: str, room_name: str) -> Optional[str]:
+        holder = self._keys.setdefault(idempotency_key, room_name)
+        return None if holder == room_name else holder
+
+    async def set_state(self, room_name: str, state: str) -> None:
+        record = self._rooms.get(room_name)
+        if record is not None:
+            record.state = state
+
+    async def heartbeat(self) -> None:
+        self._workers[self.worker_id] = time.time()
+
+    async def retire(self) -> None:
+        self._workers.pop(self.worker_id, None)
+
+    async def rooms(self) -> List[RoomRecord]:
+        return list(self._rooms.values())
+
+    async def _load(self, room_name: str) -> Optional[RoomRecord]:
+        return self._rooms.get(room_name)
+
+    async def _room_for_key(self, idempotency_key: str) -> Optional[str]:
+        return self._keys.get(idempotency_key)
+
+    async def _owner_heartbeat(self, owner: str) -> Optional[float]:
+        last = self._workers.get(owner)
+        if last is None or time.time() - last > self.ttl:
+            return None
+        return last
+
+    async def _drop(self, record: RoomRecord) -> None:
+        if self._rooms.get(record.room_name) is record:
+            del self._rooms[record.room_name]
+        if record.idempotency_key and self._keys.get(record.idempotency_key) == record.room_name:
+            del self._keys[record.idempotency_key]
+
+class RedisRoomRegistry(RoomRegistry):
+    """Registry shared by workers through Redis
+
+    Keys (under ``prefix``):
+
+        room:<name>     hash of the room's record
+        rooms           set of every room name
+        key:<key>       room name allocated for an idempotency key (SET NX)
+        worker:<id>     last heartbeat, expiring after ``ttl``
+        inbox:<id>      list of operations forwarded to a worker
+        reply:<id>      a forwarded operation's result
+
+    The client must decode responses to str (``decode_responses=True``).
+    """
+
+    backend = "redis"
+
+    def __init__(self, client, worker_id: str, ttl: float = 30.0, prefix: str = "voice-agent"):
+        super().__init__(worker_id, ttl)
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix,) + parts)
+
+    async def register(self, record: RoomRecord) -> None:
+        await self.client.hset(self._key("room", record.room_name), mapping=record.to_fields())
+        await self.client.sadd(self._key("rooms"), record.room_name)
+
+    async def claim_key(self, idempotency_key: str, room_name: str) -> Optional[str]:
+        name = self._key("key", idempotency_key)
+        # The holder may release the key between SET NX and GET; try once more then
+        for _ in range(2):
+            if await self.client.set(name, room_name, nx=True):
+                return None
+            holder = await self.client.get(name)
+            if holder is not None:
+                return None if holder == room_name else holder
+        raise RuntimeError(f"Idempotency key {idempotency_key} keeps changing hands")
+
+    async def set_state(self, room_name: str, state: str) -> None:
+        await self.client.hset(self._key("room", room_name), "state", state)
+
+    async def heartbeat(self) -> None:
+        await self.client.set(self._key("worker", self.worker_id), repr(time.time()),
+                              px=int(self.ttl * 1000))
+
+    async def retire(self) -> None:
+        await self.client.delete(self._key("worker", self.worker_id))
+
+    async def rooms(self) -> List[RoomRecord]:
+        records = []
+        for room_name in sorted(await self.client.smembers(self._key("rooms"))):
+            record = await self._load(room_name)
+            if record is not None:
+                records.append(record)
+        return records
+
+    async def _load(self, room_name: str) -> Optional[RoomRecord]:
+        fields = await self.client.hgetall(self._key("room", room_name))
+        return RoomRecord.from_fields(fields) if fields else None
+
+    async def _room_for_key(self, idempotency_key: str) -> Optional[str]:
+        return await self.client.get(self._key("key", idempotency_key))
+
+    async def _owner_heartbeat(self, owner: str) -> Optional[float]:
+        last = await self.client.get(self._key("worker", owner))
+        return float(last) if last else None
+
+    async def _drop(self, record: RoomRecord) -> None:
+        names = [self._key("room", record.room_name)]
+        if record.idempotency_key and await self._room_for_key(record.idempotency_key) == record.room_name:
+            names.append(self._key("key", record.idempotency_key))
+        await self.client.delete(*names)
+        await self.client.srem(self._key("rooms"), record.room_name)
+
+    async def forward(self, record: RoomRecord, action: str) -> Optional[Dict[str, Any]]:
+        request_id = uuid.uuid4().hex
+        request = {"id": request_id, "action": action, "room": record.room_name, "from": self.worker_id}
+        await self.client.rpush(self._key("inbox", record.owner), json.dumps(request))
+        self.forwarded += 1
+        reply = await self.client.blpop([self._key("reply", request_id)], timeout=FORWARD_TIMEOUT)
+        if reply is None:
+            logger.warning(f"Worker {record.owner} did not answer {action} for room {record.room_name}")
+            return None
+        return json.loads(reply[1])
+
+    async def serve(self, handler: Handler) -> None:
+        inbox = self._key("inbox", self.worker_id)
+        while True:
+            item = await self.client.blpop([inbox], timeout=INBOX_POLL)
+            if item is None:
+                continue
+            request = json.loads(item[1])
+            try:
+                result = await handler(request["action"], request["room"])
+            except Exception as e:
+                logger.error(f"Forwarded {request['action']} for room {request['room']} failed: {e}")
+                result = {"error": str(e)}
+            self.served += 1
+            reply = self._key("reply", request["id"])
+            await self.client.rpush(reply, json.dumps(result))
+            # Nobody reads the reply if the sender gave up waiting
+            await self.client.expire(reply, int(FORWARD_TIMEOUT * 2))
+
+def default_worker_id() -> str:
+    """Unique per process: uvicorn workers on one host differ by pid"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+def create_room_registry(config: AgentConfig) -> RoomRegistry:
+    """Registry backend selected by ``room_registry_url``"""
+    worker_id = config.worker_id or default_worker_id()
+    if not config.room_registry_url:
+        return InProcessRoomRegistry(worker_id, config.room_registry_ttl)
+    # Optional dependency, only needed when workers share a registry
+    from redis import asyncio as redis_asyncio
+    client = redis_asyncio.from_url(config.room_registry_url, decode_responses=True)
+    logger.info(f"🗂️ Room registry on Redis as worker {worker_id}")
+    return RedisRoomRegistry(client, worker_id, config.room_registry_ttl)
+
+# Singleton instance for global access
+_registry: Optional[RoomRegistry] = None
+
+def get_room_registry() -> RoomRegistry:
+    """Get this process's room registry"""
+    global _registry
+    if _registry is None:
+        _registry = create_room_registry(get_config())
+    return _registry
@@ -0,0 +1,409 @@
+"""
+Room allocation and agent scheduling.
+
+Every interview gets its own LiveKit room with exactly one agent. Rooms are
+allocated under unique names, capped at the capacity of this process, and
+a client retrying with the same idempotency key gets its existing room back
+instead of a second room and a second agent.
+
+While draining (before a scale-down or deploy) no new rooms are allocated,
+but running interviews continue until they end.
+
+Rooms are published to a ``RoomRegistry`` so that other workers can find
+them: room operations arriving at the wrong worker are forwarded to the
+owner, and create retries are answered with the room already allocated.
+``allocate_anywhere`` claims the idempotency key in the registry before
+starting an agent, so concurrent creates on different workers agree on one
+room.
+"""
+import asyncio
+import logging
+import math
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from src.config import AgentConfig, get_config
+from src.agent.room_registry import RoomRecord, RoomRegistry, get_room_registry
+
+logger = logging.getLogger(__name__)
+
+class RoomUnavailable(Exception):
+    """Raised when no room can be allocated right now"""
+
+    def __init__(self, message: str, retry_after: float = 5.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """Retry-After header value (whole seconds, at least 1)"""
+        return str(max(1, math.ceil(self.retry_after)))
+
+class RoomCapacityExceeded(RoomUnavailable):
+    """Raised when every agent slot in this process is taken"""
+
+    def __init__(self, capacity: int, retry_after: float = 5.0):
+        super().__init__(f"All {capacity} interview rooms are in use", retry_after)
+        self.capacity = capacity
+
+class RoomsDraining(RoomUnavailable):
+    """Raised when this process is draining and takes no new rooms"""
+
+    def __init__(self, retry_after: float = 5.0):
+        super().__init__("Draining, not accepting new interviews", retry_after)
+
+@dataclass
+class RoomAllocation:
+    """One interview room and the agent scheduled into it"""
+    room_name: str
+    user_identity: str
+    idempotency_key: Optional[str] = None
+    created_at: float = field(default_factory=time.monotonic)
+    agent: Optional[object] = None
+    task: Optional[asyncio.Task] = None
+    registered: bool = False
+
+    @property
+    def state(self) -> str:
+        if self.agent is not None:
+            return "active"
+        return "starting"
+
+class RoomScheduler:
+    """Allocates unique rooms and runs one agent per room"""
+
+    def __init__(self, config: AgentConfig, capacity: int, registry: Optional[RoomRegistry] = None):
+        self.config = config
+        self.capacity = capacity
+        self.registry = registry
+        self._registry_tasks: List[asyncio.Task] = []
+        self._rooms: Dict[str, RoomAllocation] = {}
+        self._by_key: Dict[str, str] = {}
+        self.draining = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.allocated = 0
+        self.reused = 0
+        self.rejected = 0
+
+    def __len__(self) -> int:
+        return len(self._rooms)
+
+    def __contains__(self, room_name: str) -> bool:
+        return room_name in self._rooms
+
+    def get(self, room_name: str) -> Optional[RoomAllocation]:
+        """Allocation for a room, if it is still running"""
+        return self._rooms.get(room_name)
+
+    def _new_room_name(self) -> str:
+        # The configured room name becomes the prefix of per-candidate rooms
+        while True:
+            name = f"{self.config.room_name}-{uuid.uuid4().hex[:10]}"
+            if name not in self._rooms:
+                return name
+
+    def _admit(self) -> None:
+        """Raise RoomUnavailable unless a new room fits"""
+        if self.draining:
+            self.rejected += 1
+            raise RoomsDraining()
+        if len(self._rooms) >= self.capacity:
+            self.rejected += 1
+            raise RoomCapacityExceeded(self.capacity)
+
+    def allocate(self, start_agent: Callable[[str], Awaitable[None]],
+                 idempotency_key: Optional[str] = None, room_name: Optional[str] = None,
+                 user_identity: Optional[str] = None) -> Tuple[RoomAllocation, bool]:
+        """Allocate a room and schedule its agent, returning (allocation, created)
+
+        A repeated idempotency key returns the room already allocated for it
+        without starting another agent.
+        """
+        if idempotency_key:
+            existing = self._rooms.get(self._by_key.get(idempotency_key, ""))
+            if existing:
+                self.reused += 1
+                return existing, False
+
+        self._admit()
+        allocation = RoomAllocation(
+            room_name=room_name or self._new_room_name(),
+            user_identity=user_identity or f"user-{uuid.uuid4().hex[:8]}",
+            idempotency_key=idempotency_key
+        )
+        self._rooms[allocation.room_name] = allocation
+        self._idle.clear()
+        if idempotency_key:
+            self._by_key[idempotency_key] = allocation.room_name
+        allocation.task = asyncio.create_task(self._run(allocation, start_agent))
+        self.allocated += 1
+        logger.info(f"🏠 Allocated room {allocation.room_name} ({len(self._rooms)}/{self.capacity})")
+        return allocation, True
+
+    async def allocate_anywhere(self, start_agent: Callable[[str], Awaitable[None]],
+                                idempotency_key: Optional[str] = None
+                                ) -> Tuple[Union[RoomAllocation, RoomRecord], bool]:
+        """Allocate a room unless a live worker already has one for the idempotency key
+
+        Returns (allocation, created); a room run by another worker is
+        returned as its registry record. Without a registry or a key this is
+        ``allocate``.
+        """
+        if not idempotency_key or self.registry is None or idempotency_key in self._by_key:
+            return self.allocate(start_agent, idempotency_key)
+        remote = await self.find_remote(idempotency_key)
+        if remote is not None:
+            return remote, False
+
+        self._admit()
+        record = RoomRecord(
+            room_name=self._new_room_name(),
+            owner=self.registry.worker_id,
+            user_identity=f"user-{uuid.uuid4().hex[:8]}",
+            idempotency_key=idempotency_key
+        )
+        try:
+            # Recorded before claiming, so whoever loses the claim finds the winner's room
+            await self.registry.register(record)
+            holder = await self.registry.claim_key(idempotency_key, record.room_name)
+        except Exception as e:
+            logger.warning(f"Room registry unavailable, allocating locally: {e}")
+            holder = None
+        if holder is not None or idempotency_key in self._by_key:
+            # Lost to another worker, or to a request on this one while claiming
+            await self._discard(record)
+            if holder is None:
+                return self.allocate(start_agent, idempotency_key)
+            existing = await self.registry.lookup(holder)
+            if existing is None:
+                raise RoomUnavailable("The room for this idempotency key is being released", retry_after=1.0)
+            self.reused += 1
+            return existing, False
+
+        try:
+            return self.allocate(start_agent, idempotency_key, record.room_name, record.user_identity)
+        except RoomUnavailable:
+            await self._discard(record)
+            raise
+
+    async def _discard(self, record: RoomRecord) -> None:
+        """Forget a record that never got an agent (releasing its key)"""
+        try:
+            await self.registry.remove(record.room_name)
+        except Exception as e:
+            logger.warning(f"Could not unregister room {record.room_name}: {e}")
+
+    async def _run(self, allocation: RoomAllocation, start_agent: Callable[[str], Awaitable[None]]) -> None:
+        """Run the room's agent and free the slot when it finishes"""
+        try:
+            await self._register(allocation)
+            await start_agent(allocation.room_name)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Agent for room {allocation.room_name} failed: {e}")
+        finally:
+            self._forget(allocation)
+            await self._unregister(allocation)
+    
+    async def _register(self, allocation: RoomAllocation) -> None:
+        """Publish a room to the registry; the interview runs even if that fails"""
+        if self.registry is None:
+            return
+        try:
+            await self.registry.register(RoomRecord(
+                room_name=allocation.room_name,
+                owner=self.registry.worker_id,
+                state=allocation.state,
+                user_identity=allocation.user_identity,
+                idempotency_key=allocation.idempotency_key
+            ))
+            allocation.registered = True
+            if allocation.idempotency_key:
+                holder = await self.registry.claim_key(allocation.idempotency_key, allocation.room_name)
+                if holder is not None:
+                    logger.warning(f"Idempotency key of {allocation.room_name} is held by room {holder}")
+        except Exception as e:
+            logger.warning(f"Room registry unavailable, {allocation.room_name} is only known locally: {e}")
+    
+    async def _unregister(self, allocation: RoomAllocation) -> None:
+        if not allocation.registered:
+            return
+        allocation.registered = False
+        try:
+            await self.registry.remove(allocation.room_name)
+        except Exception as e:
+            logger.warning(f"Could not unregister room {allocation.room_name}: {e}")
+
+    def attach(self, room_name: str, agent) -> bool:
+        """Record the agent running a room; False if the room was released meanwhile"""
+        allocation = self._rooms.get(room_name)
+        if allocation is None:
+            return False
+        allocation.agent = agent
+        return True
+
+    def _forget(self, allocation: RoomAllocation) -> None:
+        if self._rooms.get(allocation.room_name) is allocation:
+            del self._rooms[allocation.room_name]
+            if not self._rooms:
+                self._idle.set()
+        if allocation.idempotency_key and self._by_key.get(allocation.idempotency_key) == allocation.room_name:
+            del self._by_key[allocation.idempotency_key]
+
+    async def release(self, room_name: str) -> bool:
+        """Disconnect a room's agent and free its slot; False if the room is unknown"""
+        allocation = self._rooms.get(room_name)
+        if allocation is None:
+            return False
+        self._forget(allocation)
+        await self._unregister(allocation)
+        if allocation.agent is not None:
+            await allocation.agent.disconnect()
+        if allocation.task and not allocation.task.done():
+            allocation.task.cancel()
+        logger.info(f"🏠 Released room {room_name}")
+        return True
+    
+    async def release_anywhere(self, room_name: str) -> bool:
+        """Release a room on whichever worker runs it; False if no live worker does
+        
+        Raises RoomUnavailable when the registry or the owning worker does not answer.
+        """
+        if await self.release(room_name):
+            return True
+        if self.registry is None:
+            return False
+        try:
+            record = await self.registry.lookup(room_name)
+            if record is None:
+                return False
+            if record.owner == self.registry.worker_id:
+                # Left behind by a failed unregister
+                await self.registry.remove(room_name)
+                return False
+            reply = await self.registry.forward(record, "release")
+        except Exception as e:
+            raise RoomUnavailable(f"Room registry unavailable: {e}")
+        if reply is None or "error" in reply:
+            raise RoomUnavailable(f"Worker {record.owner} running {room_name} did not answer")
+        return bool(reply.get("released"))
+    
+    async def find_remote(self, idempotency_key: str) -> Optional[RoomRecord]:
+        """Room allocated for an idempotency key by another live worker"""
+        if self.registry is None or idempotency_key in self._by_key:
+            return None
+        try:
+            record = await self.registry.lookup_key(idempotency_key)
+        except Exception as e:
+            logger.warning(f"Room registry unavailable, allocating locally: {e}")
+            return None
+        if record is None or record.owner == self.registry.worker_id:
+            return None
+        self.reused += 1
+        return record
+    
+    async def _handle_forwarded(self, action: str, room_name: str) -> Dict[str, Any]:
+        """Perform an operation another worker forwarded to this one"""
+        if action == "release":
+            return {"released": await self.release(room_name)}
+        raise ValueError(f"Unknown room action: {action}")
+    
+    async def _heartbeat(self) -> None:
+        """Keep this worker alive in the registry, publish room states, expire dead workers"""
+        while True:
+            try:
+                await self.registry.heartbeat()
+                for allocation in list(self._rooms.values()):
+                    if allocation.registered:
+                        await self.registry.set_state(allocation.room_name, allocation.state)
+                await self.registry.sweep()
+            except Exception as e:
+                logger.warning(f"Room registry heartbeat failed: {e}")
+            await asyncio.sleep(self.registry.ttl / 3)
+    
+    async def _serve(self) -> None:
+        """Answer forwarded operations, reconnecting to the registry on errors"""
+        while True:
+            try:
+                await self.registry.serve(self._handle_forwarded)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Room registry inbox failed: {e}")
+                await asyncio.sleep(1.0)
+    
+    async def start_registry(self) -> None:
+        """Join the registry: heartbeat and answer forwarded operations"""
+        if self.registry is None or self._registry_tasks:
+            return
+        await self.registry.heartbeat()
+        self._registry_tasks = [asyncio.create_task(self._heartbeat()),
+                                asyncio.create_task(self._serve())]
+        logger.info(f"🗂️ Joined room registry as {self.registry.worker_id}")
+    
+    async def stop_registry(self) -> None:
+        """Leave the registry so other workers stop forwarding here"""
+        for task in self._registry_tasks:
+            task.cancel()
+        await asyncio.gather(*self._registry_tasks, return_exceptions=True)
+        self._registry_tasks = []
+        if self.registry is not None:
+            try:
+                await self.registry.retire()
+            except Exception as e:
+                logger.warning(f"Could not leave room registry: {e}")
+
+    def drain(self) -> None:
+        """Stop allocating rooms; running interviews are left to finish"""
+        if not self.draining:
+            self.draining = True
+            logger.info(f"🚰 Draining: {len(self._rooms)} interviews still running")
+
+    def resume(self) -> None:
+        """Accept new rooms again after a drain"""
+        if self.draining:
+            self.draining = False
+            logger.info("🚰 Drain cancelled, accepting rooms")
+
+    async def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no rooms are running; False if the timeout expired first"""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def stop(self) -> None:
+        """Release every room"""
+        for room_name in list(self._rooms):
+            await self.release(room_name)
+
+    def stats(self) -> Dict:
+        """Room occupancy and allocation counters"""
+        states: Dict[str, int] = {}
+        for allocation in self._rooms.values():
+            states[allocation.state] = states.get(allocation.state, 0) + 1
+        return {
+            "capacity": self.capacity,
+            "rooms": len(self._rooms),
+            "draining": self.draining,
+            "states": states,
+            "allocated": self.allocated,
+            "reused": self.reused,
+            "rejected": self.rejected,
+        }
+
+# Singleton instance for global access
+_scheduler: Optional[RoomScheduler] = None
+
+def get_room_scheduler() -> RoomScheduler:
+    """Get the global room scheduler"""
+    global _scheduler
+    if _scheduler is None:
+        config = get_config()
+        _scheduler = RoomScheduler(config, config.max_active_rooms, get_room_registry())
+    return _scheduler
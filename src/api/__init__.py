@@ -2,5 +2,6 @@
 API package for the Voice Agent.
 """
 from src.api.endpoints import router as api_router
+from src.api.admin import router as admin_router
 
-__all__ = ['api_router'] 
\ No newline at end of file
+__all__ = ['api_router', 'admin_router']
@@ -0,0 +1,117 @@
+"""
+Operational endpoints for the Voice Agent.
+
+Exposed under ``/admin``. When ``ADMIN_TOKEN`` is set, requests must carry
+it in the ``X-Admin-Token`` header.
+"""
+import asyncio
+import dataclasses
+import hmac
+import logging
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from src.agent import get_room_scheduler
+from src.agent.response_cache import get_response_cache
+from src.agent.room_registry import get_room_registry
+from src.config import get_config
+from src.services.text_to_speech import get_synthesis_cache
+from src.services.speech_to_text import get_session_stats
+from src.utils.admission import get_admission_stats
+from src.utils.health import get_health_stats
+from src.utils.profiling import format_collapsed, get_loop_monitor, get_memory_tracker, sample_stacks
+from src.utils.tasks import supervisor_stats
+
+logger = logging.getLogger(__name__)
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Reject the request unless it carries the configured admin token
+    
+    Without a token the endpoints are closed, unless ``ADMIN_OPEN`` says so.
+    """
+    config = get_config()
+    if not config.admin_token:
+        if not config.admin_open:
+            raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set ADMIN_TOKEN")
+        return
+    if not hmac.compare_digest(x_admin_token or "", config.admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+@router.get("/loop-lag")
+async def loop_lag():
+    """Event loop lag counters and the stacks of recent stalls"""
+    return get_loop_monitor(get_config()).stats()
+
+@router.get("/upstreams")
+async def upstreams():
+    """Admission queues and health (degraded or not) of each upstream provider"""
+    return {"admission": get_admission_stats(), "health": get_health_stats()}
+
+@router.get("/rooms")
+async def rooms():
+    """Room capacity, rooms by state and allocation counters"""
+    return get_room_scheduler().stats()
+
+@router.get("/registry")
+async def registry():
+    """Rooms of every worker in the room registry, with their owners' last heartbeats"""
+    room_registry = get_room_registry()
+    records = [await room_registry.lookup(record.room_name) for record in await room_registry.rooms()]
+    return {
+        "registry": room_registry.stats(),
+        "rooms": [dataclasses.asdict(record) for record in records if record is not None],
+    }
+
+@router.post("/drain")
+async def drain():
+    """Stop accepting rooms; running interviews continue until they end"""
+    scheduler = get_room_scheduler()
+    scheduler.drain()
+    return scheduler.stats()
+
+@router.post("/resume")
+async def resume():
+    """Accept rooms again after a drain"""
+    scheduler = get_room_scheduler()
+    scheduler.resume()
+    return scheduler.stats()
+
+@router.get("/caches")
+async def caches():
+    """Occupancy and hit rates of the LLM response cache and the TTS cache"""
+    config = get_config()
+    response_cache = get_response_cache(config)
+    return {
+        "llm_responses": response_cache.stats() if response_cache else None,
+        "tts": get_synthesis_cache(config).stats(),
+    }
+
+@router.get("/stt-sessions")
+async def stt_sessions():
+    """Connects, reconnects, utterances and audio sent per open streaming STT session"""
+    return {"sessions": get_session_stats()}
+
+@router.get("/tasks")
+async def tasks(limit: int = Query(10, ge=1, le=100)):
+    """Background tasks per room, and traced memory with its growth (TRACEMALLOC_FRAMES)"""
+    rooms = supervisor_stats()
+    memory = await asyncio.to_thread(get_memory_tracker(get_config()).report, limit)
+    if memory["tracing"] and rooms["closed"]:
+        memory["growth_per_closed_room_bytes"] = memory["growth_bytes"] // rooms["closed"]
+    return {"tasks": rooms, "memory": memory}
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(10.0, gt=0, le=60),
+    interval_ms: float = Query(5.0, ge=1, le=100),
+    all_threads: bool = True
+):
+    """Sample the live process and return collapsed stacks for a flamegraph"""
+    logger.info(f"🔬 Profiling for {seconds:.0f}s at {interval_ms:.0f} ms intervals")
+    try:
+        counts = await asyncio.to_thread(sample_stacks, seconds, interval_ms / 1000, all_threads)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return PlainTextResponse(format_collapsed(counts))
@@ -3,27 +3,31 @@ FastAPI endpoints for the Voice Agent.
 """
 import base64
 import logging
-import os
 import asyncio
 import tempfile
-from typing import List
-import uuid
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from livekit import api
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from src.config import get_config, AgentConfig
 from src.api.models import (
     TranscriptionRequest, TranscriptionResponse,
     TextToSpeechRequest, TextToSpeechResponse,
+    BatchSynthesisRequest, BatchSynthesisResult,
     InterviewQuestion, ConversationHistory, RoomInfo
 )
 from src.services import SpeechToTextService, TextToSpeechService, LanguageModelService
-from src.agent import InterviewManager, LiveKitRoomManager
+from src.services.text_to_speech import EDGE_TTS_FORMAT, EDGE_TTS_SAMPLE_RATE
+from src.agent import InterviewManager, RoomScheduler, get_agent_pool, get_room_scheduler
+from src.agent.room_scheduler import RoomUnavailable
+from src.utils.admission import AdmissionRejected, Priority
+from src.utils.audio_formats import AudioFormat, negotiate, transcode
+from src.utils.lazy import lazy_import
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
 
-# In-memory store for active rooms (in a real app, use Redis or a database)
-active_rooms = {}
+# Only needed to mint room tokens, so load it on first use
+api = lazy_import("livekit.api")
+router = APIRouter()
 
 # Service dependencies
 def get_stt_service():
@@ -45,12 +49,15 @@ def get_lm_service():
     service.initialize()  # Initialize on creation
     return service
 
-def get_interview_manager():
+def get_interview_manager(lm_service: LanguageModelService = Depends(get_lm_service)):
     """Get interview manager"""
-    lm_service = get_lm_service()
     manager = InterviewManager(lm_service)
     return manager
 
+def get_agent_starter():
+    """Get the coroutine that runs an agent in a newly created room"""
+    return start_agent_in_room
+
 @router.post("/transcribe", response_model=TranscriptionResponse)
 async def transcribe_audio(
     request: TranscriptionRequest,
@@ -68,6 +75,8 @@ async def transcribe_audio(
         text = await stt_service.transcribe(audio_data)
         
         return TranscriptionResponse(text=text, confidence=0.9)
+    except AdmissionRejected:
+        raise
     except Exception as e:
         logger.error(f"Transcription error: {e}")
         raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
@@ -75,42 +84,121 @@ async def transcribe_audio(
 @router.post("/synthesize", response_model=TextToSpeechResponse)
 async def synthesize_speech(
     request: TextToSpeechRequest,
+    accept: Optional[str] = Header(None),
     tts_service: TextToSpeechService = Depends(get_tts_service)
 ):
-    """Synthesize text to speech"""
+    """Synthesize text to speech
+    
+    The output format comes from the request body, or else from an audio
+    type in the Accept header (e.g. ``audio/ogg`` for Opus). With an audio
+    Accept header the audio is streamed back as the response body instead
+    of base64 JSON.
+    """
     try:
-        # Test TTS connection
-        await tts_service.test_connection()
-        
-        # Use the requested voice or default
-        if request.voice:
-            tts_service.config.tts_voice = request.voice
+        accepted = negotiate(accept)
+    except ValueError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    base = accepted or AudioFormat.native()
+    try:
+        fmt = AudioFormat.parse(
+            request.format or base.codec,
+            request.sample_rate or (None if request.format else base.sample_rate),
+            request.bitrate
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    try:
+        if accepted:
+            # Raw audio: encode chunk by chunk in the threadpool as the response streams
+            audio_bytes, _ = await tts_service.synthesize_bytes(request.text, request.voice)
+            if not audio_bytes:
+                raise HTTPException(status_code=500, detail="Speech synthesis failed")
+            return StreamingResponse(transcode(audio_bytes, fmt), media_type=fmt.media_type)
         
-        # Synthesize speech
-        wav_file = await tts_service.synthesize(request.text)
+        # Synthesize (or take from the cache) and convert to the requested format
+        audio_bytes, _ = await tts_service.synthesize_format(request.text, fmt, voice=request.voice)
         
-        if not wav_file:
+        if not audio_bytes:
             raise HTTPException(status_code=500, detail="Speech synthesis failed")
-            
-        # Read wav file and encode to base64
-        with open(wav_file, "rb") as f:
-            audio_bytes = f.read()
-        
-        # Clean up temp file
-        os.unlink(wav_file)
         
         # Encode to base64
         audio_data = base64.b64encode(audio_bytes).decode("utf-8")
         
         return TextToSpeechResponse(
             audio_data=audio_data,
-            sample_rate=24000,
-            format="wav"
+            sample_rate=fmt.sample_rate,
+            format=fmt.codec,
+            media_type=fmt.media_type
         )
+    except (AdmissionRejected, HTTPException):
+        raise
     except Exception as e:
         logger.error(f"Speech synthesis error: {e}")
         raise HTTPException(status_code=500, detail=f"Speech synthesis failed: {str(e)}")
 
+@router.post("/synthesize/batch")
+async def synthesize_batch(
+    request: BatchSynthesisRequest,
+    config: AgentConfig = Depends(get_config)
+):
+    """Synthesize many texts concurrently, streaming NDJSON results as they complete"""
+    if len(request.items) > config.tts_batch_max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(request.items)} items (max {config.tts_batch_max_items})"
+        )
+    
+    tts_service = TextToSpeechService(config, priority=Priority.BATCH)
+    
+    # Identical (voice, text) pairs are rendered once
+    groups: Dict[Tuple[str, str], List[int]] = {}
+    for index, item in enumerate(request.items):
+        key = (item.voice or config.tts_voice, item.text)
+        groups.setdefault(key, []).append(index)
+    
+    limit = config.tts_batch_concurrency
+    if request.max_concurrency:
+        limit = max(1, min(limit, request.max_concurrency))
+    semaphore = asyncio.Semaphore(limit)
+    
+    async def render(key: Tuple[str, str]):
+        voice, text = key
+        async with semaphore:
+            try:
+                audio, cached = await tts_service.synthesize_bytes(text, voice)
+                return key, audio, cached, None if audio else "Speech synthesis failed"
+            except AdmissionRejected as e:
+                return key, None, False, str(e)
+    
+    async def stream_results():
+        tasks = [asyncio.create_task(render(key)) for key in groups]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                key, audio, cached, error = await next_done
+                audio_data = None
+                if audio and request.include_audio:
+                    audio_data = base64.b64encode(audio).decode("utf-8")
+                for index in groups[key]:
+                    result = BatchSynthesisResult(
+                        index=index,
+                        id=request.items[index].id,
+                        voice=key[0],
+                        audio_data=audio_data,
+                        format=EDGE_TTS_FORMAT,
+                        sample_rate=EDGE_TTS_SAMPLE_RATE,
+                        cached=cached,
+                        error=error
+                    )
+                    yield result.model_dump_json() + "\n"
+        finally:
+            # Client went away or we finished: don't leave renders running
+            for task in tasks:
+                task.cancel()
+    
+    logger.info(f"🔊 Batch synthesis: {len(request.items)} items, {len(groups)} unique")
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
 @router.get("/interview/questions", response_model=List[InterviewQuestion])
 async def get_interview_questions(
     interview_manager: InterviewManager = Depends(get_interview_manager)
@@ -127,12 +215,20 @@ async def get_interview_questions(
 @router.post("/interview/generate", response_model=str)
 async def generate_interview_response(
     user_input: str,
+    question_index: int = Query(0, ge=0, description="Next question to ask; 0 starts the interview"),
     interview_manager: InterviewManager = Depends(get_interview_manager)
 ):
-    """Generate an interview response"""
+    """Generate an interview response
+    
+    The API keeps no interview state between requests, so answers to later
+    questions pass the index of the question that follows them.
+    """
     try:
+        interview_manager.question_count = question_index
         response = await interview_manager.generate_response(user_input)
         return response
+    except AdmissionRejected:
+        raise
     except Exception as e:
         logger.error(f"Response generation error: {e}")
         raise HTTPException(status_code=500, detail=f"Response generation failed: {str(e)}")
@@ -175,81 +271,103 @@ async def reset_interview(
 
 @router.post("/room/create", response_model=RoomInfo)
 async def create_room(
-    background_tasks: BackgroundTasks,
-    config: AgentConfig = Depends(get_config)
+    idempotency_key: Optional[str] = Header(None),
+    config: AgentConfig = Depends(get_config),
+    scheduler: RoomScheduler = Depends(get_room_scheduler),
+    start_agent: Callable[[str], Awaitable[None]] = Depends(get_agent_starter)
 ):
-    """Create a new LiveKit room and return connection details"""
+    """Allocate a room for one candidate, start its agent and return connection details
+
+    Retrying with the same ``Idempotency-Key`` header returns the same room
+    (with a fresh token) instead of allocating another, whichever worker
+    the retry reaches.
+    """
+    try:
+        # A room allocated by another worker is returned as is; its agent is already running
+        allocation, created = await scheduler.allocate_anywhere(start_agent, idempotency_key)
+    except RoomUnavailable as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"{e}. Please retry.",
+            headers={"Retry-After": e.retry_after_header}
+        )
+    
     try:
-        # Generate a unique room name if not provided
-        room_name = config.room_name
-        
         # Create LiveKit token
         token = api.AccessToken(
             config.livekit_api_key,
             config.livekit_api_secret
         )
         
-        # Add user identity
-        user_identity = f"user-{uuid.uuid4().hex[:8]}"
-        token.with_identity(user_identity)
+        # The candidate keeps the same identity across retries
+        token.with_identity(allocation.user_identity)
         token.with_name("Interview Candidate")
         
         # Add room access
         token.with_grants(api.VideoGrants(
             room_join=True,
-            room=room_name
+            room=allocation.room_name
         ))
         
-        # Start agent in background
-        background_tasks.add_task(start_agent_in_room, room_name)
-        
         return RoomInfo(
-            room_name=room_name,
+            room_name=allocation.room_name,
             token=token.to_jwt(),
-            url=config.livekit_url
+            url=config.livekit_url,
+            reused=not created
         )
     except Exception as e:
         logger.error(f"Room creation error: {e}")
+        if created:
+            await scheduler.release(allocation.room_name)
         raise HTTPException(status_code=500, detail=f"Room creation failed: {str(e)}")
 
 async def start_agent_in_room(room_name: str):
-    """Start the agent in the specified room"""
+    """Start the agent in the specified room (run by the room scheduler)"""
+    scheduler = get_room_scheduler()
+    try:
+        # Take a pre-initialized agent from the warm pool
+        room_manager = await get_agent_pool().acquire(room_name)
+    except Exception as e:
+        logger.error(f"Agent start error: {e}")
+        return
     try:
-        # Get config
-        config = get_config()
-        config.room_name = room_name
-        
-        # Create room manager
-        room_manager = LiveKitRoomManager(config)
-        
         # Connect to room
         connected = await room_manager.connect()
         
         if connected:
             logger.info(f"✅ Agent connected to room: {room_name}")
             
-            # Store room manager for later access
-            active_rooms[room_name] = room_manager
+            # The room may have been deleted while the agent was connecting
+            if not scheduler.attach(room_name, room_manager):
+                return
             
             # Keep agent running
-            while room_manager.is_connected:
+            while room_manager.is_connected or await room_manager.reconnect():
                 await asyncio.sleep(5)
-                
-            # Clean up when disconnected
-            if room_name in active_rooms:
-                del active_rooms[room_name]
         else:
             logger.error(f"Failed to connect agent to room: {room_name}")
     except Exception as e:
         logger.error(f"Agent start error: {e}")
+    finally:
+        # However the agent ends (failed connect, lost room, cancelled by
+        # a delete or shutdown), its tasks, STT stream and room are released
+        await room_manager.disconnect()
 
 @router.delete("/room/{room_name}")
-async def delete_room(room_name: str):
-    """Delete a room and disconnect the agent"""
-    if room_name in active_rooms:
-        room_manager = active_rooms[room_name]
-        await room_manager.disconnect()
-        del active_rooms[room_name]
+async def delete_room(
+    room_name: str,
+    scheduler: RoomScheduler = Depends(get_room_scheduler)
+):
+    """Delete a room and disconnect the agent, on whichever worker runs it"""
+    try:
+        released = await scheduler.release_anywhere(room_name)
+    except RoomUnavailable as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"{e}. Please retry.",
+            headers={"Retry-After": e.retry_after_header}
+        )
+    if released:
         return {"message": f"Room {room_name} deleted successfully"}
     else:
-        raise HTTPException(status_code=404, detail=f"Room {room_name} not found") 
\ No newline at end of file
+        raise HTTPException(status_code=404, detail=f"Room {room_name} not found")
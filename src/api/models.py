@@ -18,12 +18,39 @@ class TextToSpeechRequest(BaseModel):
     """Request model for text-to-speech API"""
     text: str = Field(..., description="Text to synthesize")
     voice: Optional[str] = Field("en-US-AriaNeural", description="Voice to use")
+    format: Optional[str] = Field(None, description="Output format: mp3, opus, wav or pcm (default: mp3, or from Accept)")
+    sample_rate: Optional[int] = Field(None, description="Output sample rate in Hz (default: 24000)")
+    bitrate: Optional[int] = Field(None, description="Bitrate in kbit/s for mp3 and opus")
 
 class TextToSpeechResponse(BaseModel):
     """Response model for text-to-speech API"""
     audio_data: str = Field(..., description="Base64 encoded audio data")
     sample_rate: int = Field(24000, description="Audio sample rate in Hz")
-    format: str = Field("wav", description="Audio format")
+    format: str = Field("mp3", description="Audio format")
+    media_type: str = Field("audio/mpeg", description="MIME type of the decoded audio data")
+
+class BatchSynthesisItem(BaseModel):
+    """A single text to synthesize in a batch request"""
+    text: str = Field(..., description="Text to synthesize")
+    voice: Optional[str] = Field(None, description="Voice to use (defaults to the configured voice)")
+    id: Optional[str] = Field(None, description="Client reference echoed back in the result")
+
+class BatchSynthesisRequest(BaseModel):
+    """Request model for batch text-to-speech API"""
+    items: List[BatchSynthesisItem] = Field(..., description="Texts to synthesize")
+    include_audio: bool = Field(True, description="Return audio data; false only seeds the TTS cache")
+    max_concurrency: Optional[int] = Field(None, description="Upper bound on concurrent renders")
+
+class BatchSynthesisResult(BaseModel):
+    """One streamed result of a batch synthesis request"""
+    index: int = Field(..., description="Position of the item in the request")
+    id: Optional[str] = Field(None, description="Client reference from the request")
+    voice: str = Field(..., description="Voice used")
+    audio_data: Optional[str] = Field(None, description="Base64 encoded audio data")
+    format: str = Field(..., description="Audio format")
+    sample_rate: int = Field(..., description="Audio sample rate in Hz")
+    cached: bool = Field(False, description="Whether the audio came from the TTS cache")
+    error: Optional[str] = Field(None, description="Error message if synthesis failed")
 
 class InterviewQuestion(BaseModel):
     """Model for an interview question"""
@@ -44,4 +71,5 @@ class RoomInfo(BaseModel):
     """Model for room information"""
     room_name: str = Field(..., description="Room name")
     token: str = Field(..., description="JWT token for room access")
-    url: str = Field(..., description="LiveKit server URL") 
\ No newline at end of file
+    url: str = Field(..., description="LiveKit server URL")
+    reused: bool = Field(False, description="Whether a retry returned an already allocated room") 
\ No newline at end of file
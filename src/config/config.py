@@ -6,8 +6,15 @@ from dataclasses import dataclass
 from typing import Optional
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+def _env_int(name: str, default: int) -> int:
+    """Read an integer environment variable"""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float environment variable"""
+    value = os.getenv(name)
+    return float(value) if value else default
 
 @dataclass
 class AgentConfig:
@@ -23,16 +30,138 @@ class AgentConfig:
     tts_voice: str = "en-US-AriaNeural"
     model_name: str = "gemini-1.5-flash"
     
+    # Admission control: concurrent upstream calls and requests/second per provider
+    llm_max_concurrency: int = 8
+    llm_rate_limit: float = 10.0
+    stt_max_concurrency: int = 16
+    stt_rate_limit: float = 20.0
+    tts_max_concurrency: int = 16
+    tts_rate_limit: float = 20.0
+    admission_queue_budget: float = 2.0  # seconds a request may wait before 503
+    
+    # LLM degraded mode: templated acknowledgments instead of generated ones
+    llm_timeout: float = 8.0
+    llm_degraded_latency: float = 3.0  # smoothed latency that marks the LLM degraded
+    llm_degraded_error_rate: float = 0.5
+    llm_recovery_interval: float = 15.0  # seconds between recovery probes while degraded
+    fast_path_max_wait: float = 1.0  # skip the LLM when its queue is longer than this
+    
+    # Responses to short answers, reused across interviews
+    llm_cache_enabled: bool = True
+    llm_cache_max_entries: int = 5000
+    llm_cache_ttl: float = 3600.0
+    llm_cache_similarity: float = 0.85  # estimated Jaccard similarity for a near match
+    
+    # Synthesized audio cache and batch synthesis
+    tts_cache_max_bytes: int = 64 * 1024 * 1024
+    tts_batch_concurrency: int = 8
+    tts_batch_max_items: int = 500
+    tts_audio_store_dir: str = ""  # pre-rendered audio (python -m src.run_prerender), disabled when empty
+    
+    # Question bank (JSONL); empty uses the bundled bank
+    question_bank_path: str = ""
+    
+    # Warm agent pool
+    agent_pool_size: int = 2
+    agent_ready_timeout: float = 10.0  # max wait for the candidate's audio track
+    max_active_rooms: int = 20  # concurrent interviews (one agent each) per process
+    drain_timeout: float = 900.0  # max wait on shutdown for running interviews to finish
+    ready_max_load: float = 0.9  # /ready fails at or above this load score
+    
+    # Room registry shared by API workers (empty URL: in-process, one worker)
+    room_registry_url: str = ""  # redis://host:6379/0
+    room_registry_ttl: float = 30.0  # a worker without a heartbeat this long is dead
+    worker_id: str = ""  # defaults to <hostname>-<pid>; leave empty with several workers
+    
+    # Inbound audio preprocessing (high-pass, noise gate, AGC)
+    audio_preprocessing: bool = True
+    highpass_cutoff_hz: float = 80.0
+    agc_target_dbfs: float = -20.0
+    noise_gate_threshold_dbfs: float = -50.0
+    
+    # Streaming STT: one Deepgram stream per room, kept open across turns
+    stt_streaming: bool = False  # live rooms answer with simulated candidate turns when off
+    stt_endpointing_ms: int = 800  # silence that ends an utterance
+    stt_replay_seconds: float = 5.0  # audio held for replay if the stream drops
+    
+    # Reconnect after a dropped room connection (services and interview are kept)
+    reconnect_timeout: float = 30.0  # give up rejoining after this long
+    reconnect_backoff: float = 0.25  # first retry delay, doubled per attempt
+    
+    # Session recording (audio segments and JSONL transcript per room)
+    recording_enabled: bool = False
+    recording_dir: str = "recordings"
+    recording_queue_size: int = 2000
+    
+    # Session capture for offline replay (inbound audio, upstream calls, event timing)
+    capture_enabled: bool = False
+    capture_dir: str = "captures"
+    
+    # Diagnostics
+    loop_lag_threshold_ms: float = 100.0  # event loop stalls longer than this are recorded
+    tracemalloc_frames: int = 0  # trace allocations for /admin/tasks (slow; 0 disables)
+    admin_token: str = ""  # required in X-Admin-Token for /admin endpoints
+    admin_open: bool = False  # serve /admin without a token when none is set (trusted networks only)
+    
     @classmethod
     def from_env(cls) -> 'AgentConfig':
         """Create config from environment variables"""
+        # Load .env here rather than at import so importing config has no side effects
+        load_dotenv()
         return cls(
             livekit_url=os.getenv("LIVEKIT_URL", ""),
             livekit_api_key=os.getenv("LIVEKIT_API_KEY", ""),
             livekit_api_secret=os.getenv("LIVEKIT_API_SECRET", ""),
             google_api_key=os.getenv("GOOGLE_API_KEY", ""),
             deepgram_api_key=os.getenv("DEEPGRAM_API_KEY", ""),
-            room_name=os.getenv("ROOM_NAME", "voice-interview-room")
+            room_name=os.getenv("ROOM_NAME", "voice-interview-room"),
+            llm_max_concurrency=_env_int("LLM_MAX_CONCURRENCY", 8),
+            llm_rate_limit=_env_float("LLM_RATE_LIMIT", 10.0),
+            stt_max_concurrency=_env_int("STT_MAX_CONCURRENCY", 16),
+            stt_rate_limit=_env_float("STT_RATE_LIMIT", 20.0),
+            tts_max_concurrency=_env_int("TTS_MAX_CONCURRENCY", 16),
+            tts_rate_limit=_env_float("TTS_RATE_LIMIT", 20.0),
+            admission_queue_budget=_env_float("ADMISSION_QUEUE_BUDGET", 2.0),
+            llm_timeout=_env_float("LLM_TIMEOUT", 8.0),
+            llm_degraded_latency=_env_float("LLM_DEGRADED_LATENCY", 3.0),
+            llm_degraded_error_rate=_env_float("LLM_DEGRADED_ERROR_RATE", 0.5),
+            llm_recovery_interval=_env_float("LLM_RECOVERY_INTERVAL", 15.0),
+            fast_path_max_wait=_env_float("FAST_PATH_MAX_WAIT", 1.0),
+            llm_cache_enabled=os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true",
+            llm_cache_max_entries=_env_int("LLM_CACHE_MAX_ENTRIES", 5000),
+            llm_cache_ttl=_env_float("LLM_CACHE_TTL", 3600.0),
+            llm_cache_similarity=_env_float("LLM_CACHE_SIMILARITY", 0.85),
+            tts_cache_max_bytes=_env_int("TTS_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+            tts_batch_concurrency=_env_int("TTS_BATCH_CONCURRENCY", 8),
+            tts_batch_max_items=_env_int("TTS_BATCH_MAX_ITEMS", 500),
+            tts_audio_store_dir=os.getenv("TTS_AUDIO_STORE_DIR", ""),
+            question_bank_path=os.getenv("QUESTION_BANK_PATH", ""),
+            agent_pool_size=_env_int("AGENT_POOL_SIZE", 2),
+            agent_ready_timeout=_env_float("AGENT_READY_TIMEOUT", 10.0),
+            max_active_rooms=_env_int("MAX_ACTIVE_ROOMS", 20),
+            drain_timeout=_env_float("DRAIN_TIMEOUT", 900.0),
+            ready_max_load=_env_float("READY_MAX_LOAD", 0.9),
+            room_registry_url=os.getenv("ROOM_REGISTRY_URL", ""),
+            room_registry_ttl=_env_float("ROOM_REGISTRY_TTL", 30.0),
+            worker_id=os.getenv("WORKER_ID", ""),
+            audio_preprocessing=os.getenv("AUDIO_PREPROCESSING", "true").lower() != "false",
+            highpass_cutoff_hz=_env_float("HIGHPASS_CUTOFF_HZ", 80.0),
+            agc_target_dbfs=_env_float("AGC_TARGET_DBFS", -20.0),
+            noise_gate_threshold_dbfs=_env_float("NOISE_GATE_THRESHOLD_DBFS", -50.0),
+            stt_streaming=os.getenv("STT_STREAMING", "false").lower() == "true",
+            stt_endpointing_ms=_env_int("STT_ENDPOINTING_MS", 800),
+            stt_replay_seconds=_env_float("STT_REPLAY_SECONDS", 5.0),
+            reconnect_timeout=_env_float("RECONNECT_TIMEOUT", 30.0),
+            reconnect_backoff=_env_float("RECONNECT_BACKOFF", 0.25),
+            recording_enabled=os.getenv("RECORDING_ENABLED", "false").lower() == "true",
+            recording_dir=os.getenv("RECORDING_DIR", "recordings"),
+            recording_queue_size=_env_int("RECORDING_QUEUE_SIZE", 2000),
+            capture_enabled=os.getenv("CAPTURE_ENABLED", "false").lower() == "true",
+            capture_dir=os.getenv("CAPTURE_DIR", "captures"),
+            loop_lag_threshold_ms=_env_float("LOOP_LAG_THRESHOLD_MS", 100.0),
+            tracemalloc_frames=_env_int("TRACEMALLOC_FRAMES", 0),
+            admin_token=os.getenv("ADMIN_TOKEN", ""),
+            admin_open=os.getenv("ADMIN_OPEN", "false").lower() == "true"
         )
     
     def validate(self) -> bool:
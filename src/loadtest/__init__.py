@@ -0,0 +1,13 @@
+"""
+Load testing for the Voice Agent API against fake providers.
+"""
+from src.loadtest.fakes import FakeBackendConfig, install_fakes
+from src.loadtest.generator import LoadReport, parse_mix, run_load
+
+__all__ = [
+    'FakeBackendConfig',
+    'install_fakes',
+    'LoadReport',
+    'parse_mix',
+    'run_load'
+]
@@ -0,0 +1,112 @@
+"""
+Load test CLI: ``python -m src.loadtest``.
+
+Starts the API with fake providers in a subprocess (or targets ``--url``),
+offers open-loop traffic and prints throughput, latency percentiles and
+error rates. Exits non-zero when a ``--max-*`` threshold is exceeded, so it
+can gate CI.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import httpx
+from src.loadtest.fakes import FakeBackendConfig
+from src.loadtest.generator import parse_mix, run_load
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _wait_ready(url: str, server: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Load test server exited with code {server.returncode}")
+        try:
+            if httpx.get(url).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Load test server at {url} did not become ready")
+
+def start_fake_server(fake: FakeBackendConfig, workers: int) -> tuple:
+    """Launch the fake-provider API in a subprocess, returning (process, base_url)"""
+    port = _free_port()
+    env = dict(os.environ, AGENT_POOL_SIZE="0", LOG_LEVEL="WARNING", **fake.to_env())
+    command = [sys.executable, "-m", "uvicorn", "src.loadtest.server:app",
+               "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+               "--no-access-log"]
+    server = subprocess.Popen(command, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_ready(base_url + "/health", server)
+    except Exception:
+        server.terminate()
+        raise
+    return server, base_url
+
+def main():
+    """Load test CLI entry point"""
+    parser = argparse.ArgumentParser(description="Open-loop load test of the Voice Agent API")
+    parser.add_argument("--url", help="Target an already running server instead of a fake one")
+    parser.add_argument("--rps", type=float, default=20.0, help="Offered requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--mix", default="transcribe=1,synthesize=1,generate=1,answer=1,room=1",
+                        help="Scenario weights, e.g. generate=3,synthesize=1")
+    parser.add_argument("--constant", action="store_true",
+                        help="Evenly spaced arrivals instead of Poisson")
+    parser.add_argument("--workers", type=int, default=1, help="Fake server worker processes")
+    parser.add_argument("--stt-latency-ms", type=float, default=150.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=400.0)
+    parser.add_argument("--tts-latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter", type=float, default=0.3,
+                        help="Sigma of the log-normal latency multiplier")
+    parser.add_argument("--failure-rate", type=float, default=0.0,
+                        help="Probability that a fake provider call fails")
+    parser.add_argument("--max-error-rate", type=float, default=None,
+                        help="Fail if the error rate exceeds this fraction")
+    parser.add_argument("--max-p99-ms", type=float, default=None,
+                        help="Fail if p99 latency exceeds this")
+    args = parser.parse_args()
+
+    fake = FakeBackendConfig(
+        stt_latency_ms=args.stt_latency_ms,
+        llm_latency_ms=args.llm_latency_ms,
+        tts_latency_ms=args.tts_latency_ms,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate
+    )
+    mix = parse_mix(args.mix)
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        server, base_url = start_fake_server(fake, args.workers)
+    try:
+        report = asyncio.run(run_load(base_url, args.rps, args.duration, mix,
+                                      poisson=not args.constant))
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=10)
+
+    print(report.format())
+
+    failed = []
+    if args.max_error_rate is not None and report.error_rate > args.max_error_rate:
+        failed.append(f"error rate {report.error_rate:.1%} > {args.max_error_rate:.1%}")
+    p99 = report.total.percentile(99)
+    if args.max_p99_ms is not None and p99 > args.max_p99_ms:
+        failed.append(f"p99 {p99:.0f} ms > {args.max_p99_ms:.0f} ms")
+    if failed:
+        print("❌ " + "; ".join(failed))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Fake STT, LLM and TTS providers for load testing.
+
+The fakes replace only the upstream provider objects, so requests still go
+through the real services, admission control and TTS cache. Each fake
+sleeps for a log-normally jittered latency and fails at a configurable
+rate.
+"""
+import asyncio
+import os
+import random
+from dataclasses import dataclass
+import numpy as np
+from fastapi import FastAPI
+from src.agent.room_scheduler import RoomScheduler
+from src.api import endpoints
+from src.config import AgentConfig, get_config
+from src.services import SpeechToTextService, TextToSpeechService, LanguageModelService
+from src.utils.audio import pcm16_to_wav_bytes
+
+@dataclass
+class FakeBackendConfig:
+    """Latency and failure behaviour of the fake providers"""
+    stt_latency_ms: float = 150.0
+    llm_latency_ms: float = 400.0
+    tts_latency_ms: float = 200.0
+    agent_start_ms: float = 50.0
+    jitter: float = 0.3  # sigma of the log-normal latency multiplier
+    failure_rate: float = 0.0
+
+    @classmethod
+    def from_env(cls) -> 'FakeBackendConfig':
+        """Create config from FAKE_* environment variables"""
+        return cls(
+            stt_latency_ms=float(os.getenv("FAKE_STT_LATENCY_MS", "150")),
+            llm_latency_ms=float(os.getenv("FAKE_LLM_LATENCY_MS", "400")),
+            tts_latency_ms=float(os.getenv("FAKE_TTS_LATENCY_MS", "200")),
+            agent_start_ms=float(os.getenv("FAKE_AGENT_START_MS", "50")),
+            jitter=float(os.getenv("FAKE_JITTER", "0.3")),
+            failure_rate=float(os.getenv("FAKE_FAILURE_RATE", "0")),
+        )
+
+    def to_env(self) -> dict:
+        """Environment variables that reproduce this config in a server process"""
+        return {
+            "FAKE_STT_LATENCY_MS": str(self.stt_latency_ms),
+            "FAKE_LLM_LATENCY_MS": str(self.llm_latency_ms),
+            "FAKE_TTS_LATENCY_MS": str(self.tts_latency_ms),
+            "FAKE_AGENT_START_MS": str(self.agent_start_ms),
+            "FAKE_JITTER": str(self.jitter),
+            "FAKE_FAILURE_RATE": str(self.failure_rate),
+        }
+
+    def latency(self, base_ms: float) -> float:
+        """One jittered latency sample in seconds"""
+        return base_ms / 1000 * random.lognormvariate(0, self.jitter)
+
+    def maybe_fail(self, provider: str) -> None:
+        """Raise a provider error at the configured failure rate"""
+        if random.random() < self.failure_rate:
+            raise RuntimeError(f"Injected {provider} failure")
+
+class FakeSTT:
+    """Stands in for the Deepgram STT plugin"""
+
+    def __init__(self, fake: FakeBackendConfig):
+        self.fake = fake
+
+    async def recognize(self, audio_data: bytes) -> str:
+        await asyncio.sleep(self.fake.latency(self.fake.stt_latency_ms))
+        self.fake.maybe_fail("stt")
+        return "I have five years of experience building backend services."
+
+class FakeResponse:
+    """Minimal stand-in for a Gemini response"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeGenerativeModel:
+    """Stands in for genai.GenerativeModel"""
+
+    def __init__(self, fake: FakeBackendConfig):
+        self.fake = fake
+
+    async def generate_content_async(self, prompt: str) -> FakeResponse:
+        await asyncio.sleep(self.fake.latency(self.fake.llm_latency_ms))
+        self.fake.maybe_fail("llm")
+        return FakeResponse("Thanks for sharing that. Can you tell me more about the impact?")
+
+class FakeSpeechToTextService(SpeechToTextService):
+    """STT service backed by FakeSTT"""
+
+    def __init__(self, config: AgentConfig, fake: FakeBackendConfig):
+        super().__init__(config)
+        self.fake = fake
+
+    async def initialize(self) -> bool:
+        self.stt = FakeSTT(self.fake)
+        return True
+
+class FakeLanguageModelService(LanguageModelService):
+    """Language model service backed by FakeGenerativeModel"""
+
+    def __init__(self, config: AgentConfig, fake: FakeBackendConfig):
+        super().__init__(config)
+        self.fake = fake
+
+    def initialize(self) -> bool:
+        self.model = FakeGenerativeModel(self.fake)
+        return True
+
+class FakeTextToSpeechService(TextToSpeechService):
+    """TTS service that renders silence after a fake provider delay"""
+
+    def __init__(self, config: AgentConfig, fake: FakeBackendConfig):
+        super().__init__(config)
+        self.fake = fake
+
+    async def _render(self, text: str, voice: str) -> bytes:
+        async with self.admission.slot(self.priority):
+            await asyncio.sleep(self.fake.latency(self.fake.tts_latency_ms))
+            self.fake.maybe_fail("tts")
+        # Roughly the length of the spoken text
+        samples = np.zeros(int(len(text) * 0.06 * 24000), dtype=np.int16)
+        return pcm16_to_wav_bytes(samples, 24000)
+
+def fake_agent_config() -> AgentConfig:
+    """Agent config with placeholder credentials and no warm agents"""
+    config = get_config()
+    return AgentConfig(
+        livekit_url="wss://loadtest.invalid",
+        livekit_api_key="loadtest-key",
+        livekit_api_secret="loadtest-secret-loadtest-secret-loadtest",
+        google_api_key="loadtest",
+        deepgram_api_key="loadtest",
+        llm_max_concurrency=config.llm_max_concurrency,
+        llm_rate_limit=config.llm_rate_limit,
+        stt_max_concurrency=config.stt_max_concurrency,
+        stt_rate_limit=config.stt_rate_limit,
+        tts_max_concurrency=config.tts_max_concurrency,
+        tts_rate_limit=config.tts_rate_limit,
+        admission_queue_budget=config.admission_queue_budget,
+        agent_pool_size=0,
+        max_active_rooms=config.max_active_rooms
+    )
+
+def install_fakes(app: FastAPI, fake: FakeBackendConfig) -> None:
+    """Route the app's service dependencies to fake providers"""
+    config = fake_agent_config()
+
+    def get_fake_lm_service():
+        service = FakeLanguageModelService(config, fake)
+        service.initialize()
+        return service
+
+    async def start_fake_agent(room_name: str):
+        await asyncio.sleep(fake.latency(fake.agent_start_ms))
+
+    # Fake agents end right after starting, so rooms free up immediately
+    scheduler = RoomScheduler(config, config.max_active_rooms)
+
+    app.dependency_overrides.update({
+        get_config: lambda: config,
+        endpoints.get_stt_service: lambda: FakeSpeechToTextService(config, fake),
+        endpoints.get_tts_service: lambda: FakeTextToSpeechService(config, fake),
+        endpoints.get_lm_service: get_fake_lm_service,
+        endpoints.get_agent_starter: lambda: start_fake_agent,
+        endpoints.get_room_scheduler: lambda: scheduler,
+    })
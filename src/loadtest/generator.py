@@ -0,0 +1,179 @@
+"""
+Open-loop HTTP load generator for the Voice Agent API.
+
+Requests are launched on a fixed schedule (constant or Poisson arrivals)
+whether or not earlier ones have finished, which is how independent
+candidates behave. Latency is measured from each request's scheduled
+start, not from when it was actually sent, so a stalled server or client
+cannot hide queueing delay (coordinated omission).
+"""
+import asyncio
+import base64
+import random
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+import httpx
+import numpy as np
+from src.utils.audio import pcm16_to_wav_bytes
+
+# One second of 16 kHz silence for /transcribe
+_SILENCE = base64.b64encode(pcm16_to_wav_bytes(np.zeros(16000, dtype=np.int16), 16000)).decode("utf-8")
+
+def _transcribe(seq: int) -> Tuple[str, str, dict]:
+    return "POST", "/api/v1/transcribe", {"json": {"audio_data": _SILENCE, "sample_rate": 16000}}
+
+def _synthesize(seq: int) -> Tuple[str, str, dict]:
+    # Unique text per request (and per run) so the TTS cache does not absorb the load
+    text = f"Thank you. Question {seq}-{uuid.uuid4().hex[:8]}: tell me about a project you are proud of."
+    return "POST", "/api/v1/synthesize", {"json": {"text": text}}
+
+def _generate(seq: int) -> Tuple[str, str, dict]:
+    return "POST", "/api/v1/interview/generate", {
+        "params": {"user_input": "I led the migration of our billing system to a new platform."}
+    }
+
+def _answer(seq: int) -> Tuple[str, str, dict]:
+    # Past the first question the interviewer acknowledges the answer with the LLM;
+    # answers longer than the response cache's limit always reach it
+    return "POST", "/api/v1/interview/generate", {
+        "params": {"user_input": f"I led the migration of our billing system to a new platform, "
+                                 f"moving {seq} services without downtime over two quarters.",
+                   "question_index": 1}
+    }
+
+def _create_room(seq: int) -> Tuple[str, str, dict]:
+    return "POST", "/api/v1/room/create", {}
+
+SCENARIOS: Dict[str, Callable[[int], Tuple[str, str, dict]]] = {
+    "transcribe": _transcribe,
+    "synthesize": _synthesize,
+    "generate": _generate,
+    "answer": _answer,
+    "room": _create_room,
+}
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse ``name=weight,...`` into scenario weights"""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario: {name} (expected one of {', '.join(SCENARIOS)})")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+@dataclass
+class ScenarioStats:
+    """Outcomes for one scenario"""
+    latencies: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+
+    @property
+    def sent(self) -> int:
+        return sum(self.statuses.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(count for status, count in self.statuses.items() if not str(status).startswith("2"))
+
+    def percentile(self, q: float) -> float:
+        """Latency percentile in milliseconds"""
+        if not self.latencies:
+            return 0.0
+        return float(np.percentile(self.latencies, q)) * 1000
+
+@dataclass
+class LoadReport:
+    """Results of a load run"""
+    target_rps: float
+    duration: float
+    elapsed: float = 0.0
+    max_dispatch_lag: float = 0.0
+    scenarios: Dict[str, ScenarioStats] = field(default_factory=dict)
+
+    @property
+    def total(self) -> ScenarioStats:
+        combined = ScenarioStats()
+        for stats in self.scenarios.values():
+            combined.latencies.extend(stats.latencies)
+            combined.statuses.update(stats.statuses)
+        return combined
+
+    @property
+    def error_rate(self) -> float:
+        total = self.total
+        return total.errors / total.sent if total.sent else 0.0
+
+    def format(self) -> str:
+        """Human readable summary table"""
+        lines = [
+            f"Target {self.target_rps:.1f} req/s for {self.duration:.0f}s, finished in {self.elapsed:.1f}s",
+            f"{'scenario':<12}{'sent':>7}{'req/s':>8}{'errors':>8}{'p50 ms':>9}{'p90 ms':>9}"
+            f"{'p99 ms':>9}{'max ms':>9}  statuses",
+        ]
+        rows = list(self.scenarios.items()) + [("total", self.total)]
+        for name, stats in rows:
+            statuses = " ".join(f"{status}:{count}" for status, count in sorted(stats.statuses.items(), key=str))
+            lines.append(
+                f"{name:<12}{stats.sent:>7}{stats.sent / self.elapsed:>8.1f}"
+                f"{stats.errors / max(stats.sent, 1):>8.1%}"
+                f"{stats.percentile(50):>9.1f}{stats.percentile(90):>9.1f}"
+                f"{stats.percentile(99):>9.1f}{stats.percentile(100):>9.1f}  {statuses}"
+            )
+        if self.max_dispatch_lag > 0.05:
+            lines.append(f"⚠️ Generator fell behind schedule by up to {self.max_dispatch_lag * 1000:.0f} ms; "
+                         f"results understate the offered load")
+        return "\n".join(lines)
+
+async def run_load(base_url: str, rps: float, duration: float, mix: Dict[str, float],
+                   poisson: bool = True, timeout: float = 30.0,
+                   transport: Optional[httpx.AsyncBaseTransport] = None,
+                   seed: Optional[int] = None) -> LoadReport:
+    """Offer ``rps`` requests/second for ``duration`` seconds and collect results"""
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    report = LoadReport(target_rps=rps, duration=duration,
+                        scenarios={name: ScenarioStats() for name in names})
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=200)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits,
+                                 transport=transport) as client:
+
+        async def fire(seq: int, name: str, scheduled: float):
+            method, path, kwargs = SCENARIOS[name](seq)
+            stats = report.scenarios[name]
+            try:
+                response = await client.request(method, path, **kwargs)
+                await response.aread()
+                stats.statuses[response.status_code] += 1
+            except httpx.TimeoutException:
+                stats.statuses["timeout"] += 1
+            except httpx.HTTPError as e:
+                stats.statuses[type(e).__name__] += 1
+            stats.latencies.append(time.monotonic() - scheduled)
+
+        tasks = []
+        start = time.monotonic()
+        scheduled = start
+        seq = 0
+        while True:
+            scheduled += rng.expovariate(rps) if poisson else 1.0 / rps
+            if scheduled - start >= duration:
+                break
+            delay = scheduled - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                report.max_dispatch_lag = max(report.max_dispatch_lag, -delay)
+            name = rng.choices(names, weights)[0]
+            tasks.append(asyncio.create_task(fire(seq, name, scheduled)))
+            seq += 1
+
+        await asyncio.gather(*tasks)
+        report.elapsed = time.monotonic() - start
+    return report
@@ -0,0 +1,10 @@
+"""
+API app wired to fake providers, for ``uvicorn src.loadtest.server:app``.
+
+Fake latency and failure rates come from FAKE_* environment variables
+(see FakeBackendConfig).
+"""
+from src.main import app
+from src.loadtest.fakes import FakeBackendConfig, install_fakes
+
+install_fakes(app, FakeBackendConfig.from_env())
@@ -5,10 +5,21 @@ import os
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from src.api import api_router
+from dotenv import load_dotenv
+from src.api import api_router, admin_router
+from src.agent import get_agent_pool, get_room_scheduler
+from src.config import get_config
 from src.utils.logging import setup_logging
+from src.utils.admission import AdmissionRejected, get_admission_stats
+from src.utils.capacity import load_report
+from src.utils.health import get_health_stats
+from src.utils.profiling import get_loop_monitor, get_memory_tracker
+from src.utils.serving import fast_json_response_class, uvicorn_options
 from src import __version__
 
+# .env may set LOG_LEVEL, LOG_FORMAT, PORT and WEB_CONCURRENCY, so load it first
+load_dotenv()
+
 # Set up logging
 logger = setup_logging()
 
@@ -16,7 +27,8 @@ logger = setup_logging()
 app = FastAPI(
     title="Real-Time Voice Interview Agent",
     description="API for real-time voice interview agent with Edge TTS",
-    version=__version__
+    version=__version__,
+    default_response_class=fast_json_response_class()
 )
 
 # Add CORS middleware
@@ -30,6 +42,60 @@ app.add_middleware(
 
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
+app.include_router(admin_router, prefix="/admin", tags=["admin"])
+
+# Warm agent pool lifecycle
+@app.on_event("startup")
+async def start_agent_pool():
+    """Start pre-warming agents so new rooms don't pay initialization"""
+    config = get_config()
+    if config.agent_pool_size > 0 and config.validate():
+        await get_agent_pool().start()
+
+@app.on_event("shutdown")
+async def stop_agent_pool():
+    """Release idle warm agents"""
+    await get_agent_pool().stop()
+
+@app.on_event("startup")
+async def accept_rooms():
+    """Accept rooms (clears a drain left over from an earlier lifespan) and join the room registry"""
+    scheduler = get_room_scheduler()
+    scheduler.resume()
+    await scheduler.start_registry()
+
+@app.on_event("shutdown")
+async def release_rooms():
+    """Drain on shutdown (SIGTERM): let running interviews finish, then disconnect any left"""
+    scheduler = get_room_scheduler()
+    scheduler.drain()
+    timeout = get_config().drain_timeout
+    if len(scheduler) and not await scheduler.wait_idle(timeout):
+        logger.warning(f"Drain timed out after {timeout:.0f}s, disconnecting {len(scheduler)} interviews")
+    await scheduler.stop()
+    await scheduler.stop_registry()
+
+# Event loop lag monitoring
+@app.on_event("startup")
+async def start_loop_monitor():
+    """Watch for callbacks that block the shared event loop, and trace allocations when enabled"""
+    get_loop_monitor(get_config()).start()
+    get_memory_tracker(get_config()).start()
+
+@app.on_event("shutdown")
+async def stop_loop_monitor():
+    """Stop the loop lag monitor"""
+    await get_loop_monitor().stop()
+
+# Overload handler: fail fast with a retry hint instead of timing out
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    """Return 503 with Retry-After when an upstream service is saturated"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Service temporarily overloaded ({exc.service}). Please retry."},
+        headers={"Retry-After": exc.retry_after_header}
+    )
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -41,15 +107,41 @@ async def global_exception_handler(request: Request, exc: Exception):
         content={"detail": "An unexpected error occurred. Please try again later."}
     )
 
-# Health check endpoint
+def current_load() -> dict:
+    """Load report for this process"""
+    return load_report(
+        get_room_scheduler().stats(),
+        get_admission_stats(),
+        get_health_stats(),
+        get_loop_monitor().stats(),
+        ready_max_load=get_config().ready_max_load
+    )
+
+# Health check endpoint (liveness)
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {
-        "status": "healthy",
+        "status": "draining" if get_room_scheduler().draining else "healthy",
         "version": __version__
     }
 
+# Readiness: whether this process should be sent new interviews
+@app.get("/ready")
+async def readiness_check():
+    """503 while draining, at room capacity or overloaded"""
+    report = current_load()
+    return JSONResponse(
+        status_code=200 if report["ready"] else 503,
+        content={"ready": report["ready"], "reasons": report["reasons"], "load": report["load"]}
+    )
+
+# Load report for the autoscaler
+@app.get("/load")
+async def load():
+    """Load score (0-1) with rooms, queue depths, upstream health and loop lag"""
+    return current_load()
+
 # Root redirect to docs
 @app.get("/")
 async def root():
@@ -57,11 +149,27 @@ async def root():
     return {"message": "Welcome to the Voice Interview Agent API", "docs_url": "/docs"}
 
 if __name__ == "__main__":
+    import argparse
     import uvicorn
     
-    # Get port from environment or use default
-    port = int(os.getenv("PORT", "8000"))
+    parser = argparse.ArgumentParser(description="Run the Voice Agent API server")
+    parser.add_argument("--production", action="store_true",
+                        default=os.getenv("SERVE_PROFILE", "dev") == "production",
+                        help="Serve with uvloop, httptools and multiple workers instead of reload")
+    parser.add_argument("--port", type=int, default=None, help="Port (default: $PORT or 8000)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes in production (default: $WEB_CONCURRENCY or 1)")
+    parser.add_argument("--profile-startup", help="Report import costs and exit", action="store_true")
+    args = parser.parse_args()
+    
+    if args.profile_startup:
+        from src.utils.startup import format_startup_report
+        print(format_startup_report("src.main"))
+        raise SystemExit(0)
+    
+    profile = "production" if args.production else "dev"
+    options = uvicorn_options(profile, port=args.port, workers=args.workers)
     
     # Run the application
-    logger.info(f"Starting server on port {port}")
-    uvicorn.run("src.main:app", host="0.0.0.0", port=port, reload=True) 
\ No newline at end of file
+    logger.info(f"Starting server on port {options['port']} ({profile} profile)")
+    uvicorn.run("src.main:app", **options)
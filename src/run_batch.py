@@ -0,0 +1,245 @@
+"""
+Batch CLI for re-transcribing and re-scoring recorded interviews.
+
+Recordings are decoded in a process pool, transcribed and evaluated with
+bounded async concurrency, and each result is appended to a JSONL results
+file as soon as it completes. The results file doubles as the checkpoint:
+rerunning the same command skips interviews that already succeeded.
+STT and LLM errors fail the interview rather than recording an empty
+transcript or a canned reply, so a rerun retries it.
+
+Input is either a manifest (JSONL, one ``{"id": ..., "audio": path-or-list}``
+per line, paths relative to the manifest) or a directory. In a directory,
+every session recorder room directory (``inbound-*.wav`` segments) and
+every top-level ``*.wav`` file is one interview.
+"""
+import argparse
+import asyncio
+import glob
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from dotenv import load_dotenv
+from src.config import get_config
+from src.services import SpeechToTextService, LanguageModelService
+from src.agent import InterviewManager
+from src.agent.interview_manager import CLOSING
+from src.utils.admission import Priority
+from src.utils.audio import pcm16_to_wav_bytes, read_wav_samples, resample
+from src.utils.logging import setup_logging
+
+# .env may set LOG_LEVEL and LOG_FORMAT, so load it before logging is set up
+load_dotenv()
+logger = setup_logging()
+
+STT_SAMPLE_RATE = 16000
+
+@dataclass
+class BatchItem:
+    """One recorded interview to process"""
+    id: str
+    audio: List[str] = field(default_factory=list)
+    transcript: Optional[str] = None  # recorded transcript.jsonl, if any
+
+def discover_items(source: str) -> List[BatchItem]:
+    """Build the work list from a manifest file or a recordings directory"""
+    items = []
+    if os.path.isfile(source):
+        base = os.path.dirname(os.path.abspath(source))
+        with open(source, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                audio = entry.get("audio", [])
+                if isinstance(audio, str):
+                    audio = [audio]
+                transcript = entry.get("transcript")
+                items.append(BatchItem(
+                    id=str(entry["id"]),
+                    audio=[os.path.join(base, p) for p in audio],
+                    transcript=os.path.join(base, transcript) if transcript else None
+                ))
+        return items
+
+    for name in sorted(os.listdir(source)):
+        path = os.path.join(source, name)
+        if os.path.isdir(path):
+            segments = sorted(glob.glob(os.path.join(path, "inbound-*.wav")))
+            transcript = os.path.join(path, "transcript.jsonl")
+            if segments or os.path.exists(transcript):
+                items.append(BatchItem(
+                    id=name,
+                    audio=segments,
+                    transcript=transcript if os.path.exists(transcript) else None
+                ))
+        elif name.endswith(".wav"):
+            items.append(BatchItem(id=os.path.splitext(name)[0], audio=[path]))
+    return items
+
+def decode_recording(paths: List[str]) -> bytes:
+    """Decode and join audio files into one 16 kHz mono WAV (runs in a worker process)"""
+    chunks = []
+    for path in paths:
+        samples, sample_rate = read_wav_samples(path)
+        chunks.append(resample(samples, sample_rate, STT_SAMPLE_RATE))
+    samples = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int16)
+    return pcm16_to_wav_bytes(samples, STT_SAMPLE_RATE)
+
+def load_recorded_transcript(path: str) -> Tuple[str, List[str]]:
+    """Candidate turns of a recorded transcript.jsonl, joined, and the questions asked
+    
+    Questions are taken from the agent turns (their ``question`` field, or the
+    whole text in older recordings); the closing is not a question.
+    """
+    lines, questions = [], []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                event = json.loads(line)
+                if event.get("role") == "candidate":
+                    lines.append(event.get("text", ""))
+                elif event.get("role") == "agent":
+                    question = event.get("question") or event.get("text", "")
+                    if question and question != CLOSING:
+                        questions.append(question)
+    return " ".join(lines), questions
+
+def load_completed(results_path: str) -> Set[str]:
+    """IDs that already have a successful result (the checkpoint)"""
+    done = set()
+    if os.path.exists(results_path):
+        with open(results_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partial line from an interrupted run
+                if result.get("status") == "ok":
+                    done.add(result["id"])
+    return done
+
+class BatchProcessor:
+    """Runs recorded interviews through STT and LLM evaluation"""
+
+    def __init__(self, results_path: str, concurrency: int, decode_workers: int,
+                 mode: str = "both"):
+        config = get_config()
+        self.results_path = results_path
+        self.mode = mode
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.executor = ProcessPoolExecutor(max_workers=decode_workers)
+        self.stt_service = SpeechToTextService(config, priority=Priority.BATCH)
+        self.lm_service = LanguageModelService(config, priority=Priority.BATCH)
+        self.completed = 0
+        self.failed = 0
+        self.audio_seconds = 0.0
+
+    async def initialize(self) -> bool:
+        """Initialize the services needed for the selected mode"""
+        if self.mode in ("transcribe", "both") and not await self.stt_service.initialize():
+            return False
+        if self.mode in ("score", "both") and not self.lm_service.initialize():
+            return False
+        return True
+
+    async def process_item(self, item: BatchItem, results_file) -> None:
+        """Decode, transcribe and evaluate one interview, then append its result"""
+        async with self.semaphore:
+            result: Dict = {"id": item.id, "timings": {}}
+            loop = asyncio.get_running_loop()
+            try:
+                transcript = ""
+                # Recorded questions reflect adaptive selection and custom banks; else the plan
+                recorded, asked = load_recorded_transcript(item.transcript) if item.transcript else ("", [])
+                if self.mode in ("transcribe", "both") and item.audio:
+                    start = time.monotonic()
+                    wav_bytes = await loop.run_in_executor(self.executor, decode_recording, item.audio)
+                    result["timings"]["decode"] = round(time.monotonic() - start, 3)
+                    result["audio_seconds"] = round((len(wav_bytes) - 44) / (2 * STT_SAMPLE_RATE), 2)
+                    self.audio_seconds += result["audio_seconds"]
+
+                    start = time.monotonic()
+                    transcript = await self.stt_service.transcribe(wav_bytes, strict=True)
+                    result["timings"]["stt"] = round(time.monotonic() - start, 3)
+                else:
+                    transcript = recorded
+                result["transcript"] = transcript
+
+                if self.mode in ("score", "both"):
+                    start = time.monotonic()
+                    manager = InterviewManager(self.lm_service)
+                    result["evaluation"] = await manager.evaluate(transcript, strict=True, questions=asked)
+                    result["timings"]["llm"] = round(time.monotonic() - start, 3)
+
+                result["status"] = "ok"
+                self.completed += 1
+            except Exception as e:
+                logger.error(f"Batch item {item.id} failed: {e}")
+                result["status"] = "error"
+                result["error"] = str(e)
+                self.failed += 1
+
+            # Written as soon as it completes, so an interrupted run loses nothing
+            results_file.write(json.dumps(result) + "\n")
+            results_file.flush()
+
+    async def run(self, items: List[BatchItem]) -> None:
+        """Process all items not already completed"""
+        done = load_completed(self.results_path)
+        pending = [item for item in items if item.id not in done]
+        logger.info(f"📦 {len(items)} interviews, {len(done)} already done, {len(pending)} to process")
+
+        start = time.monotonic()
+        try:
+            with open(self.results_path, "a", encoding="utf-8") as results_file:
+                tasks = [asyncio.create_task(self.process_item(item, results_file)) for item in pending]
+                for finished, task in enumerate(asyncio.as_completed(tasks), 1):
+                    await task
+                    if finished % 10 == 0 or finished == len(tasks):
+                        elapsed = time.monotonic() - start
+                        logger.info(f"📊 {finished}/{len(tasks)} processed, "
+                                    f"{finished / elapsed * 3600:.0f} interviews/hour")
+        finally:
+            self.executor.shutdown()
+
+        elapsed = max(time.monotonic() - start, 1e-6)
+        logger.info(f"✅ Batch complete: {self.completed} ok, {self.failed} failed in {elapsed:.1f}s "
+                    f"({self.completed / elapsed * 3600:.0f} interviews/hour, "
+                    f"{self.audio_seconds / elapsed:.1f}x real time)")
+
+def main():
+    """Batch CLI entry point"""
+    parser = argparse.ArgumentParser(description="Re-transcribe and re-score recorded interviews")
+    parser.add_argument("source", help="Manifest (JSONL) or recordings directory")
+    parser.add_argument("--output", "-o", default="batch_results.jsonl",
+                        help="Results file, also used as the resume checkpoint")
+    parser.add_argument("--mode", choices=["transcribe", "score", "both"], default="both",
+                        help="Transcribe audio, score transcripts, or both")
+    parser.add_argument("--concurrency", "-c", type=int, default=8,
+                        help="Interviews processed concurrently")
+    parser.add_argument("--decode-workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes used for audio decoding")
+    parser.add_argument("--debug", "-d", help="Enable debug logging", action="store_true")
+
+    args = parser.parse_args()
+
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    async def run():
+        processor = BatchProcessor(args.output, args.concurrency, args.decode_workers, args.mode)
+        if not await processor.initialize():
+            logger.error("❌ Failed to initialize services")
+            return
+        await processor.run(discover_items(args.source))
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,40 @@
 """
 CLI script to run the Voice Agent directly without the FastAPI server.
+
+Runs one agent in ``--room``, or every room in a ``--manifest``: JSONL, one
+``{"room": ..., "voice": ..., "questions": ...}`` per line, where
+``questions`` is a question bank path relative to the manifest. Manifest
+rooms in a process share one set of services. ``--processes`` shards the
+rooms across worker processes, and aggregate stats are logged every
+``--stats-interval`` seconds.
 """
 import asyncio
+import dataclasses
+import json
 import logging
 import argparse
-from src.config import get_config
+import multiprocessing
+import os
+import queue
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+from dotenv import load_dotenv
+from src.config import AgentConfig, get_config
 from src.agent import LiveKitRoomManager
-from src.utils.logging import setup_logging
+from src.agent.question_bank import QuestionBank
+from src.services import SpeechToTextService, TextToSpeechService, LanguageModelService
+from src.utils.admission import Priority, get_admission_stats
+from src.utils.logging import set_log_context, setup_logging
+from src.utils.profiling import get_loop_monitor
 
+# .env may set LOG_LEVEL and LOG_FORMAT, so load it before logging is set up
+load_dotenv()
 logger = setup_logging()
 
+# Seconds between connection checks for each room
+KEEPALIVE_INTERVAL = 10
+
 async def run_agent(room_name: str = None):
     """Run the agent directly"""
     try:
@@ -21,6 +46,9 @@ async def run_agent(room_name: str = None):
             
         logger.info(f"Starting agent in room: {config.room_name}")
         
+        # Report callbacks that block the event loop
+        get_loop_monitor(config).start()
+        
         # Create room manager
         room_manager = LiveKitRoomManager(config)
         
@@ -40,7 +68,8 @@ async def run_agent(room_name: str = None):
                     await asyncio.sleep(10)
                     if not room_manager.is_connected:
                         logger.warning("Connection lost, attempting reconnect...")
-                        await room_manager.connect()
+                        if not await room_manager.reconnect():
+                            break
             except KeyboardInterrupt:
                 logger.info("👋 Shutting down...")
             finally:
@@ -51,20 +80,244 @@ async def run_agent(room_name: str = None):
     except Exception as e:
         logger.error(f"Error running agent: {e}")
 
+@dataclass
+class RoomSpec:
+    """One room in a manifest"""
+    room: str
+    voice: Optional[str] = None
+    questions: Optional[str] = None  # question bank (JSONL)
+
+def load_manifest(path: str) -> List[RoomSpec]:
+    """Read a JSONL room manifest"""
+    base = os.path.dirname(os.path.abspath(path))
+    specs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            questions = entry.get("questions")
+            specs.append(RoomSpec(
+                room=str(entry["room"]),
+                voice=entry.get("voice"),
+                questions=os.path.join(base, questions) if questions else None
+            ))
+    names = [spec.room for spec in specs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate rooms in manifest: {', '.join(duplicates)}")
+    return specs
+
+def shard(specs: List[RoomSpec], index: int, count: int) -> List[RoomSpec]:
+    """Rooms handled by worker ``index`` of ``count``"""
+    return specs[index::count]
+
+class MultiRoomRunner:
+    """Runs many rooms in one process on one set of services"""
+
+    def __init__(self, config: AgentConfig, specs: List[RoomSpec]):
+        self.config = config
+        self.specs = specs
+        self.stt_service = SpeechToTextService(config, priority=Priority.REALTIME)
+        self.tts_service = TextToSpeechService(config, priority=Priority.REALTIME)
+        self.lm_service = LanguageModelService(config, priority=Priority.REALTIME)
+        self.rooms: Dict[str, LiveKitRoomManager] = {}
+        self._banks: Dict[str, QuestionBank] = {}
+        self.reconnects = 0
+        self.failed = 0
+
+    def build_room(self, spec: RoomSpec) -> LiveKitRoomManager:
+        """Room manager for a spec, on the shared services"""
+        room_config = dataclasses.replace(self.config, room_name=spec.room,
+                                          tts_voice=spec.voice or self.config.tts_voice)
+        bank = None
+        if spec.questions:
+            # Rooms on the same question set share one loaded bank
+            bank = self._banks.setdefault(spec.questions, QuestionBank(spec.questions))
+        return LiveKitRoomManager(room_config, self.stt_service, self.tts_service,
+                                  self.lm_service, bank)
+
+    async def run_room(self, spec: RoomSpec) -> None:
+        """Connect a room and keep it connected until cancelled"""
+        set_log_context(room=spec.room)
+        room_manager = self.build_room(spec)
+        self.rooms[spec.room] = room_manager
+        try:
+            if not await room_manager.connect():
+                self.failed += 1
+                logger.error("❌ Failed to start agent")
+                return
+            while True:
+                await asyncio.sleep(KEEPALIVE_INTERVAL)
+                if not room_manager.is_connected:
+                    self.reconnects += 1
+                    logger.warning("Connection lost, attempting reconnect...")
+                    if not await room_manager.reconnect():
+                        self.failed += 1
+                        return
+        finally:
+            await room_manager.disconnect()
+
+    async def run(self, report: Callable[[Dict], None], interval: float) -> None:
+        """Run every room, passing stats to ``report`` every ``interval`` seconds"""
+        get_loop_monitor(self.config).start()
+
+        # Initialize shared services once, before the rooms race to do it
+        if not self.lm_service.initialize() or not await self.stt_service.initialize():
+            logger.error("❌ Service initialization failed")
+            return
+
+        logger.info(f"Starting {len(self.specs)} rooms")
+        rooms = [asyncio.create_task(self.run_room(spec)) for spec in self.specs]
+        try:
+            while not all(task.done() for task in rooms):
+                await asyncio.wait(rooms, timeout=interval)
+                report(self.stats())
+        finally:
+            for task in rooms:
+                task.cancel()
+            await asyncio.gather(*rooms, return_exceptions=True)
+
+    def stats(self) -> Dict:
+        """Counters summed over this process's rooms"""
+        managers = list(self.rooms.values())
+        cache = self.tts_service.cache.stats()
+        admission = get_admission_stats()
+        return {
+            "rooms": len(self.specs),
+            "connected": sum(m.is_connected for m in managers),
+            "interviewing": sum(m.is_connected and m.participant_ready.is_set() for m in managers),
+            "turns": sum(m.interview_manager.question_count for m in managers),
+            "fast_path_turns": sum(m.interview_manager.fast_path_turns for m in managers),
+            "reconnects": self.reconnects,
+            "failed": self.failed,
+            "tts_cache_hits": cache["hits"],
+            "tts_cache_misses": cache["misses"],
+            "llm_queued": admission.get("llm", {}).get("queued", 0),
+            "loop_lag_ms": get_loop_monitor().stats()["recent_lag_ms"],
+        }
+
+def merge_stats(stats: Iterable[Dict]) -> Dict:
+    """Combine per-process stats: counters add up, loop lag is the worst"""
+    merged: Dict = {}
+    for entry in stats:
+        for key, value in entry.items():
+            if key == "loop_lag_ms":
+                merged[key] = max(merged.get(key, 0.0), value)
+            else:
+                merged[key] = merged.get(key, 0) + value
+    return merged
+
+def format_stats(stats: Dict) -> str:
+    """One-line summary of (merged) room stats"""
+    lookups = stats["tts_cache_hits"] + stats["tts_cache_misses"]
+    hit_rate = stats["tts_cache_hits"] / lookups * 100 if lookups else 0.0
+    return (f"🏠 {stats['connected']}/{stats['rooms']} connected, {stats['interviewing']} interviewing, "
+            f"{stats['turns']} turns ({stats['fast_path_turns']} fast path), "
+            f"TTS cache {hit_rate:.0f}% hits, LLM queue {stats['llm_queued']}, "
+            f"loop lag {stats['loop_lag_ms']:.0f} ms, {stats['reconnects']} reconnects, "
+            f"{stats['failed']} failed")
+
+def run_rooms(manifest: str, interval: float) -> None:
+    """Run every manifest room in this process"""
+    runner = MultiRoomRunner(get_config(), load_manifest(manifest))
+    report = lambda stats: logger.info(format_stats(stats))
+    try:
+        asyncio.run(runner.run(report, interval))
+    except KeyboardInterrupt:
+        logger.info("👋 Shutting down...")
+
+def _run_shard(manifest: str, index: int, count: int, stats_queue, interval: float, debug: bool) -> None:
+    """Worker process: run one shard of the manifest, sending stats to the parent"""
+    if debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+    runner = MultiRoomRunner(get_config(), shard(load_manifest(manifest), index, count))
+    try:
+        asyncio.run(runner.run(lambda stats: stats_queue.put((index, stats)), interval))
+    except KeyboardInterrupt:
+        pass
+
+def run_sharded(manifest: str, processes: int, interval: float, debug: bool = False) -> None:
+    """Run the manifest sharded across worker processes, logging merged stats"""
+    rooms = len(load_manifest(manifest))
+    processes = max(1, min(processes, rooms))
+    context = multiprocessing.get_context("spawn")
+    stats_queue = context.Queue()
+    workers = [
+        context.Process(target=_run_shard, name=f"rooms-{index}",
+                        args=(manifest, index, processes, stats_queue, interval, debug))
+        for index in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    logger.info(f"Running {rooms} rooms across {processes} processes")
+
+    latest: Dict[int, Dict] = {}
+    next_report = time.monotonic() + interval
+    
+    def report():
+        logger.info(f"{format_stats(merge_stats(latest.values()))} [{len(latest)}/{processes} processes]")
+    
+    try:
+        while any(worker.is_alive() for worker in workers):
+            try:
+                index, stats = stats_queue.get(timeout=1.0)
+                latest[index] = stats
+            except queue.Empty:
+                pass
+            if latest and time.monotonic() >= next_report:
+                report()
+                next_report += interval
+    except KeyboardInterrupt:
+        # Workers share the terminal and get the interrupt too
+        logger.info("👋 Shutting down...")
+    finally:
+        for worker in workers:
+            worker.join()
+    # Final stats sent as the workers exited
+    while True:
+        try:
+            index, stats = stats_queue.get(timeout=0.1)
+            latest[index] = stats
+        except queue.Empty:
+            break
+    if latest:
+        report()
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(description="Run the Voice Agent CLI")
     parser.add_argument("--room", "-r", help="Room name to join", default=None)
+    parser.add_argument("--manifest", "-m", help="Run every room in a JSONL manifest", default=None)
+    parser.add_argument("--processes", "-p", type=int, default=1,
+                        help="Worker processes to shard manifest rooms across")
+    parser.add_argument("--stats-interval", type=float, default=10.0,
+                        help="Seconds between aggregate stats lines (manifest mode)")
     parser.add_argument("--debug", "-d", help="Enable debug logging", action="store_true")
+    parser.add_argument("--profile-startup", help="Report import costs and exit", action="store_true")
     
     args = parser.parse_args()
     
+    if args.profile_startup:
+        from src.utils.startup import format_startup_report
+        print(format_startup_report("src.run_cli"))
+        return
+    
     # Set logging level
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    if args.manifest:
+        if args.room:
+            parser.error("--room and --manifest are mutually exclusive")
+        if args.processes > 1:
+            run_sharded(args.manifest, args.processes, args.stats_interval, args.debug)
+        else:
+            run_rooms(args.manifest, args.stats_interval)
+        return
+    
     # Run the agent
     asyncio.run(run_agent(args.room))
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,87 @@
+"""
+Pre-render interview speech into the on-disk audio store.
+
+Synthesizes every question in the bank (plus the welcome, closing and fast
+path acknowledgments) for each requested voice, so live interviews read
+question audio from disk instead of waiting on Edge TTS. Entries already
+in the store are skipped, so the command can be rerun after editing the
+bank.
+"""
+import argparse
+import asyncio
+import logging
+import time
+from typing import List
+from dotenv import load_dotenv
+from src.config import get_config
+from src.services.text_to_speech import AudioStore, TextToSpeechService
+from src.agent.acknowledgments import AcknowledgmentGenerator
+from src.agent.interview_manager import CLOSING, WELCOME
+from src.agent.question_bank import QuestionBank, DEFAULT_BANK_PATH
+from src.utils.admission import Priority
+from src.utils.logging import setup_logging
+
+# .env may set LOG_LEVEL and LOG_FORMAT, so load it before logging is set up
+load_dotenv()
+logger = setup_logging()
+
+def phrases_for(bank: QuestionBank) -> List[str]:
+    """Every text an interview over this bank can speak verbatim"""
+    texts = [q.text for q in bank.questions]
+    # The opening question is spoken together with the welcome
+    texts += [f"{WELCOME} {q.text}" for q in bank.plan(1)]
+    texts += [CLOSING] + AcknowledgmentGenerator.phrases()
+    return list(dict.fromkeys(texts))
+
+async def prerender(store: AudioStore, texts: List[str], voices: List[str], concurrency: int) -> None:
+    """Render missing (voice, text) pairs into the store"""
+    tts_service = TextToSpeechService(get_config(), priority=Priority.BATCH)
+    semaphore = asyncio.Semaphore(concurrency)
+    pending = [(voice, text) for voice in voices for text in texts if not store.has(voice, text)]
+    logger.info(f"🎧 {len(texts)} phrases x {len(voices)} voices, {len(pending)} to render")
+
+    rendered = 0
+    failed = 0
+
+    async def render(voice: str, text: str):
+        nonlocal rendered, failed
+        async with semaphore:
+            try:
+                data = await tts_service._render(text, voice)
+                await asyncio.to_thread(store.put, voice, text, data)
+                rendered += 1
+            except Exception as e:
+                logger.error(f"Failed to render '{text[:40]}' ({voice}): {e}")
+                failed += 1
+
+    start = time.monotonic()
+    await asyncio.gather(*(render(voice, text) for voice, text in pending))
+    logger.info(f"✅ Rendered {rendered}, failed {failed} in {time.monotonic() - start:.1f}s")
+
+def main():
+    """Pre-render CLI entry point"""
+    config = get_config()
+    parser = argparse.ArgumentParser(description="Pre-render question audio into the audio store")
+    parser.add_argument("--bank", default=config.question_bank_path or DEFAULT_BANK_PATH,
+                        help="Question bank (JSONL)")
+    parser.add_argument("--output", "-o", default=config.tts_audio_store_dir,
+                        help="Audio store directory (default: $TTS_AUDIO_STORE_DIR)")
+    parser.add_argument("--voice", action="append",
+                        help="Voice to render (repeatable, default: the configured voice)")
+    parser.add_argument("--concurrency", "-c", type=int, default=4,
+                        help="Concurrent Edge TTS requests")
+    parser.add_argument("--debug", "-d", help="Enable debug logging", action="store_true")
+
+    args = parser.parse_args()
+
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+    if not args.output:
+        parser.error("--output or TTS_AUDIO_STORE_DIR is required")
+
+    bank = QuestionBank(args.bank)
+    asyncio.run(prerender(AudioStore(args.output), phrases_for(bank), args.voice or [config.tts_voice],
+                          args.concurrency))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Replay a captured room session offline for latency debugging.
+
+Re-runs a room's turn pipeline from a capture (``CAPTURE_ENABLED=true``)
+without LiveKit, Gemini, Edge TTS or Deepgram: inbound audio is fed through
+the same preprocessing at its captured offsets, the candidate's answers
+arrive when they did, and every LLM and TTS request is answered with the
+recorded response after the recorded latency. ``--speed`` divides every
+wait (upstream latency, answer timing, playback), so a long interview can
+be replayed in seconds while CPU work on the event loop stays real.
+
+The replay writes its own capture and prints per-turn answer-to-speech
+latency for the original session and the replay side by side.
+"""
+import argparse
+import asyncio
+import dataclasses
+import logging
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+import numpy as np
+from dotenv import load_dotenv
+from src.config import AgentConfig, get_config
+from src.agent import LiveKitRoomManager
+from src.services import TextToSpeechService, LanguageModelService
+from src.services.text_to_speech import EDGE_TTS_SAMPLE_RATE
+from src.utils.admission import Priority
+from src.utils.audio import pcm16_to_wav_bytes
+from src.utils.capture import CaptureReader, SessionCapture, set_capture
+from src.utils.logging import setup_logging
+
+# .env may set LOG_LEVEL and LOG_FORMAT, so load it before logging is set up
+load_dotenv()
+logger = setup_logging()
+
+# Speaking rate used to size stand-in audio for phrases rendered before the capture started
+STAND_IN_CHARS_PER_SECOND = 15
+
+class ReplayUpstream:
+    """Recorded upstream calls, handed out in capture order"""
+
+    def __init__(self, reader: CaptureReader, speed: float = 1.0):
+        self.reader = reader
+        self.speed = speed
+        self._pending: Dict[str, List[Dict[str, Any]]] = {
+            service: reader.calls(service) for service in ("llm", "tts")
+        }
+        self.unmatched = 0
+
+    def take(self, service: str, request: Any, in_order: bool = False) -> Optional[Dict[str, Any]]:
+        """Next recorded call with this request (or simply the next one, in order)"""
+        pending = self._pending[service]
+        for index, event in enumerate(pending):
+            if event["request"] == request:
+                return pending.pop(index)
+        self.unmatched += 1
+        if in_order and pending:
+            return pending.pop(0)
+        return None
+
+    async def respond(self, event: Dict[str, Any]) -> None:
+        """Wait out a call's recorded latency and raise its recorded error"""
+        await asyncio.sleep(event["latency"] / self.speed)
+        if event["error"] == "timeout":
+            raise asyncio.TimeoutError()
+        if event["error"]:
+            raise RuntimeError(event["error"])
+
+class ReplayModel:
+    """Stands in for the Gemini model"""
+
+    def __init__(self, upstream: ReplayUpstream):
+        self.upstream = upstream
+
+    async def generate_content_async(self, prompt: str):
+        # Prompts hold the conversation so far, so the next call is the best match
+        event = self.upstream.take("llm", prompt, in_order=True)
+        if event is None:
+            raise RuntimeError("No recorded LLM response left")
+        await self.upstream.respond(event)
+        return SimpleNamespace(text=event["response"])
+
+class ReplayLanguageModelService(LanguageModelService):
+    """Language model service answered from a capture"""
+
+    def __init__(self, config: AgentConfig, upstream: ReplayUpstream,
+                 priority: Priority = Priority.REALTIME):
+        super().__init__(config, priority=priority)
+        self.upstream = upstream
+
+    def initialize(self) -> bool:
+        if self.model is None:
+            self.model = ReplayModel(self.upstream)
+        return True
+
+class ReplayTextToSpeechService(TextToSpeechService):
+    """Text-to-speech service answered from a capture"""
+
+    def __init__(self, config: AgentConfig, upstream: ReplayUpstream,
+                 priority: Priority = Priority.REALTIME):
+        super().__init__(config, priority=priority)
+        self.upstream = upstream
+        # Audio store reads were not captured; everything comes from the recording
+        self.store = None
+
+    async def _render(self, text: str, voice: str) -> bytes:
+        event = self.upstream.take("tts", {"voice": voice, "text": text})
+        if event is None:
+            # Rendered before the capture started (pre-warmed agent): silence, instantly
+            seconds = max(len(text) / STAND_IN_CHARS_PER_SECOND, 0.5)
+            return pcm16_to_wav_bytes(np.zeros(int(seconds * EDGE_TTS_SAMPLE_RATE), dtype=np.int16),
+                                      EDGE_TTS_SAMPLE_RATE)
+        async with self.admission.slot(self.priority):
+            await self.upstream.respond(event)
+        return self.upstream.reader.payload(event)
+
+class NullAudioSource:
+    """Audio source that discards the agent's speech"""
+
+    async def capture_frame(self, frame) -> None:
+        pass
+
+class ReplayRoomManager(LiveKitRoomManager):
+    """Runs a room's turn pipeline against a capture instead of a live room"""
+
+    def __init__(self, config: AgentConfig, reader: CaptureReader, speed: float = 1.0):
+        self.reader = reader
+        self.speed = speed
+        self.upstream = ReplayUpstream(reader, speed)
+        super().__init__(config,
+                         tts_service=ReplayTextToSpeechService(config, self.upstream),
+                         lm_service=ReplayLanguageModelService(config, self.upstream))
+        self.audio_source = NullAudioSource()
+        self.playback_rate = speed
+        self._answers = reader.of_kind("answer")
+        self._start = time.monotonic()
+
+    async def initialize(self) -> bool:
+        """Pre-render the welcome and warm the fast path, as a live room does"""
+        if self.is_initialized:
+            return True
+        self.lm_service.initialize()
+        if not await self.prerender(self.interview_manager.questions[0]):
+            return False
+        self.tasks.spawn(self.prerender_fast_path(
+            ReplayTextToSpeechService(self.config, self.upstream, priority=Priority.BATCH)), key="fast_path")
+        self.is_initialized = True
+        return True
+
+    async def _until(self, offset: float) -> None:
+        """Sleep until a captured offset, scaled by the replay speed"""
+        delay = self._start + offset / self.speed - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def next_answer(self, turn: int) -> Optional[str]:
+        """The candidate's captured answer, when it was given"""
+        if turn >= len(self._answers):
+            return None
+        answer = self._answers[turn]
+        await self._until(answer["t"])
+        return answer["text"]
+
+    async def feed_audio(self) -> None:
+        """Push captured inbound frames through preprocessing at their offsets"""
+        process = self.inbound_processor()
+        for offset, samples in self.reader.frames():
+            await self._until(offset)
+            process(samples)
+
+    async def run(self, output_dir: str) -> SessionCapture:
+        """Replay the session, capturing the replay into ``output_dir``"""
+        self._start = time.monotonic()
+        self.capture = SessionCapture(f"{self.reader.room_name}-replay", output_dir,
+                                      sample_rate=self.reader.sample_rate)
+        self.capture.start()
+        set_capture(self.capture)
+        self.is_connected = True
+        self.tasks.spawn(self.feed_audio(), key="feeder")
+        try:
+            if not await self.initialize():
+                logger.error("❌ Welcome render failed")
+                return self.capture
+            started = self.reader.of_kind("interview_start")
+            await self._until(started[0]["t"] if started else 0.0)
+            self.participant_ready.set()
+            # Live, answers cannot arrive before the welcome; replay keeps that order
+            # even when the replay has fallen behind the captured timeline
+            await self.start_interview()
+            await self.handle_user_audio()
+        finally:
+            await self.tasks.close()
+            self.is_connected = False
+            self.release_prerendered()
+            capture, self.capture = self.capture, None
+            await asyncio.to_thread(capture.close)
+        return capture
+
+def format_report(original: CaptureReader, replay: CaptureReader, speed: float) -> str:
+    """Per-turn answer-to-speech latency, original against replay"""
+    replayed = {turn["turn"]: turn["latency"] for turn in replay.turn_latencies()}
+    lines = [f"{'turn':>4}  {'original':>9}  {'replay':>9}  (replay at {speed:g}x)"]
+    for turn in original.turn_latencies():
+        latency = replayed.get(turn["turn"])
+        replay_text = f"{latency:8.3f}s" if latency is not None else "        -"
+        lines.append(f"{turn['turn']:>4}  {turn['latency']:8.3f}s  {replay_text}")
+    return "\n".join(lines)
+
+async def replay(capture_dir: str, speed: float, output_dir: str) -> CaptureReader:
+    """Replay a capture and return the replay's own capture"""
+    reader = CaptureReader(capture_dir)
+    config = dataclasses.replace(get_config(), room_name=reader.room_name, capture_enabled=False)
+    room_manager = ReplayRoomManager(config, reader, speed)
+    logger.info(f"⏪ Replaying {reader.room_name} at {speed:g}x")
+    capture = await room_manager.run(output_dir)
+    if room_manager.upstream.unmatched:
+        logger.warning(f"{room_manager.upstream.unmatched} upstream calls had no exact recorded match")
+    return CaptureReader(capture.directory)
+
+def main():
+    """Replay CLI entry point"""
+    parser = argparse.ArgumentParser(description="Replay a captured room session")
+    parser.add_argument("capture", help="Capture directory (<CAPTURE_DIR>/<room>)")
+    parser.add_argument("--speed", "-s", type=float, default=1.0,
+                        help="Replay speed, e.g. 10 for ten times faster than real time")
+    parser.add_argument("--output", "-o", default=None,
+                        help="Directory to keep the replay's capture in (default: discarded)")
+    parser.add_argument("--debug", "-d", help="Enable debug logging", action="store_true")
+
+    args = parser.parse_args()
+
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+
+    with tempfile.TemporaryDirectory() as scratch:
+        result = asyncio.run(replay(args.capture, args.speed, args.output or scratch))
+        print(format_report(CaptureReader(args.capture), result, args.speed))
+
+if __name__ == "__main__":
+    main()
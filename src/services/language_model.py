@@ -1,21 +1,35 @@
 """
 Language model service using Google Gemini.
 """
+import asyncio
 import logging
-import google.generativeai as genai
+import time
+from typing import Optional
 from src.config import AgentConfig
+from src.utils.admission import AdmissionRejected, Priority, get_admission_controller
+from src.utils.capture import get_capture
+from src.utils.health import get_upstream_health
+from src.utils.lazy import lazy_import
+
+# Loaded on first use so importing the service stays cheap
+genai = lazy_import("google.generativeai")
 
 logger = logging.getLogger(__name__)
 
 class LanguageModelService:
     """Handles interaction with language models"""
     
-    def __init__(self, config: AgentConfig):
+    def __init__(self, config: AgentConfig, priority: Priority = Priority.INTERACTIVE):
         self.config = config
         self.model = None
+        self.priority = priority
+        self.admission = get_admission_controller("llm", config)
+        self.health = get_upstream_health("llm", config)
     
     def initialize(self) -> bool:
-        """Initialize the language model"""
+        """Initialize the language model (no-op if already initialized)"""
+        if self.model is not None:
+            return True
         try:
             genai.configure(api_key=self.config.google_api_key)
             self.model = genai.GenerativeModel(self.config.model_name)
@@ -26,16 +40,58 @@ class LanguageModelService:
             logger.error(f"Language model initialization failed: {e}")
             return False
     
-    async def generate_response(self, prompt: str) -> str:
-        """Generate a response from the language model"""
+    def is_overloaded(self) -> bool:
+        """Whether a new request would queue longer than the fast path allows"""
+        return self.admission.estimate_wait(self.priority) > self.config.fast_path_max_wait
+    
+    async def generate_response(self, prompt: str, fallback: Optional[str] = None,
+                                strict: bool = False) -> str:
+        """Generate a response from the language model
+        
+        With a fallback, the model is skipped while it is degraded and the
+        fallback is returned on errors and timeouts. With ``strict``, errors
+        and timeouts are raised instead of answered with a canned reply.
+        """
         if not self.model:
+            if strict:
+                raise RuntimeError("Language model not initialized")
             logger.error("Language model not initialized")
-            return "I'm sorry, I'm having trouble thinking right now."
+            return fallback or "I'm sorry, I'm having trouble thinking right now."
+        
+        if fallback is not None and not self.health.should_try():
+            return fallback
             
+        capture = get_capture()
+        start = None
         try:
-            response_obj = self.model.generate_content(prompt)
-            return response_obj.text.strip()
+            async with self.admission.slot(self.priority):
+                start = time.monotonic()
+                response_obj = await asyncio.wait_for(
+                    self.model.generate_content_async(prompt),
+                    timeout=self.config.llm_timeout
+                )
+                text = response_obj.text.strip()
+            latency = time.monotonic() - start
+            self.health.record_success(latency)
+            if capture:
+                capture.record_call("llm", prompt, text, latency)
+            return text
             
+        except AdmissionRejected:
+            raise
+        except asyncio.TimeoutError:
+            self.health.record_failure()
+            if capture and start is not None:
+                capture.record_call("llm", prompt, latency=time.monotonic() - start, error="timeout")
+            if strict:
+                raise
+            logger.warning(f"Language model timed out after {self.config.llm_timeout:.1f}s")
+            return fallback or "I'm having trouble processing that. Let's continue with the interview."
         except Exception as e:
+            self.health.record_failure()
+            if capture and start is not None:
+                capture.record_call("llm", prompt, latency=time.monotonic() - start, error=str(e))
+            if strict:
+                raise
             logger.error(f"Language model error: {e}")
-            return "I'm having trouble processing that. Let's continue with the interview." 
\ No newline at end of file
+            return fallback or "I'm having trouble processing that. Let's continue with the interview."
@@ -1,26 +1,42 @@
 """
 Speech-to-text service using Deepgram.
 """
+import asyncio
 import logging
-from livekit.plugins import deepgram
+import time
+import weakref
+from typing import Dict, List, Optional
+import numpy as np
 from src.config import AgentConfig
+from src.utils.admission import AdmissionRejected, Priority, get_admission_controller
+from src.utils.audio import AudioRingBuffer
+from src.utils.lazy import lazy_import
+
+# Loaded on first use so importing the service stays cheap
+deepgram = lazy_import("livekit.plugins.deepgram")
+rtc = lazy_import("livekit.rtc")
 
 logger = logging.getLogger(__name__)
 
 class SpeechToTextService:
     """Handles speech transcription"""
     
-    def __init__(self, config: AgentConfig):
+    def __init__(self, config: AgentConfig, priority: Priority = Priority.INTERACTIVE):
         self.config = config
         self.stt = None
+        self.priority = priority
+        self.admission = get_admission_controller("stt", config)
     
     async def initialize(self) -> bool:
-        """Initialize the STT service"""
+        """Initialize the STT service (no-op if already initialized)"""
+        if self.stt is not None:
+            return True
         try:
             self.stt = deepgram.STT(
                 model="nova-2-general",
                 language="en-US", 
                 api_key=self.config.deepgram_api_key,
+                endpointing_ms=self.config.stt_endpointing_ms,
             )
             logger.info("✅ Deepgram STT initialized")
             return True
@@ -29,15 +45,201 @@ class SpeechToTextService:
             logger.error(f"STT initialization failed: {e}")
             return False
     
-    async def transcribe(self, audio_data: bytes) -> str:
-        """Transcribe audio data to text"""
+    async def transcribe(self, audio_data: bytes, strict: bool = False) -> str:
+        """Transcribe audio data to text
+        
+        Errors give an empty transcript, or are raised with ``strict``.
+        """
         if not self.stt:
+            if strict:
+                raise RuntimeError("STT service not initialized")
             logger.error("STT service not initialized")
             return ""
             
         try:
-            transcript = await self.stt.recognize(audio_data)
+            async with self.admission.slot(self.priority):
+                transcript = await self.stt.recognize(audio_data)
             return transcript.strip()
+        except AdmissionRejected:
+            raise
         except Exception as e:
+            if strict:
+                raise
             logger.error(f"Transcription error: {e}")
-            return "" 
\ No newline at end of file
+            return ""
+    
+    def open_session(self, name: str, sample_rate: int = 16000) -> 'TranscriptionSession':
+        """Create a streaming session that stays open across turns (call start() on it)"""
+        return TranscriptionSession(self, name, sample_rate=sample_rate,
+                                    replay_seconds=self.config.stt_replay_seconds)
+
+# Live sessions, for the admin endpoint
+_sessions: "weakref.WeakSet[TranscriptionSession]" = weakref.WeakSet()
+
+class TranscriptionSession:
+    """Long-lived Deepgram stream for one room, segmented into utterances
+    
+    The websocket is opened once and reused for every turn; the plugin sends
+    KeepAlive messages while the candidate is silent. Final transcripts are
+    joined until Deepgram's end-of-speech (endpointing) event, then queued as
+    one utterance. Audio sent since the last final transcript is held back
+    so that if the stream drops it can be replayed into a new one.
+    """
+    
+    def __init__(self, service: SpeechToTextService, name: str, sample_rate: int = 16000,
+                 replay_seconds: float = 5.0, max_reconnects: int = 5):
+        self.service = service
+        self.name = name
+        self.sample_rate = sample_rate
+        self.max_reconnects = max_reconnects
+        self.utterances: asyncio.Queue = asyncio.Queue()
+        self._stream = None
+        self._reader: Optional[asyncio.Task] = None
+        self._replay = AudioRingBuffer(max(int(replay_seconds * sample_rate), 1))
+        self._segments: List[str] = []
+        self._speech_started = False
+        self._closed = False
+        
+        # Stats
+        self.connects = 0
+        self.reconnects = 0
+        self.utterance_count = 0
+        self.audio_seconds = 0.0
+        self.replayed_seconds = 0.0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+    
+    @property
+    def is_open(self) -> bool:
+        return self._stream is not None and not self._closed
+    
+    async def start(self) -> None:
+        """Open the stream (connection setup is paid here, once per session)"""
+        await self._connect()
+        self.opened_at = time.monotonic()
+        _sessions.add(self)
+        logger.info(f"🎙️ STT session opened for {self.name}")
+    
+    async def _connect(self) -> None:
+        # Stream setups count against the STT admission limits like recognize calls
+        async with self.service.admission.slot(self.service.priority):
+            self._stream = self.service.stt.stream()
+        self.connects += 1
+        self._reader = asyncio.create_task(self._read(self._stream))
+    
+    def push_audio(self, samples: np.ndarray) -> None:
+        """Send int16 mono samples to the stream"""
+        if self._closed or self._stream is None or not len(samples):
+            return
+        self._replay.write(samples)
+        self.audio_seconds += len(samples) / self.sample_rate
+        self._push(self._stream, samples)
+    
+    def _push(self, stream, samples: np.ndarray) -> None:
+        frame = rtc.AudioFrame(samples.tobytes(), self.sample_rate, 1, len(samples))
+        try:
+            stream.push_frame(frame)
+        except Exception:
+            # The stream is closing; the reader reconnects and replays this audio
+            pass
+    
+    async def _read(self, stream) -> None:
+        try:
+            async for event in stream:
+                kind = getattr(event.type, "value", event.type)
+                if kind == "start_of_speech":
+                    self._speech_started = True
+                elif kind == "final_transcript":
+                    text = event.alternatives[0].text.strip() if event.alternatives else ""
+                    if text:
+                        self._segments.append(text)
+                    # Everything sent so far is transcribed, only newer audio needs replay
+                    self._replay.clear()
+                elif kind == "end_of_speech":
+                    self._emit()
+            error = "stream ended"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        
+        if not self._closed:
+            self.last_error = error
+            logger.warning(f"STT stream for {self.name} dropped ({error}), reconnecting")
+            await self._reconnect()
+    
+    async def _reconnect(self) -> None:
+        for attempt in range(self.max_reconnects):
+            await asyncio.sleep(min(0.25 * 2 ** attempt, 4.0))
+            if self._closed:
+                return
+            try:
+                await self._connect()
+            except Exception as e:
+                self.last_error = str(e) or type(e).__name__
+                continue
+            # Audio not yet covered by a final transcript goes to the new stream
+            pending = self._replay.peek(self._replay.available)
+            if len(pending):
+                self._push(self._stream, np.array(pending))
+                self.replayed_seconds += len(pending) / self.sample_rate
+            self.reconnects += 1
+            logger.info(f"🔁 STT stream for {self.name} reconnected, replayed {len(pending) / self.sample_rate:.1f}s")
+            return
+        
+        logger.error(f"STT stream for {self.name} gave up after {self.max_reconnects} attempts")
+        self._stream = None
+        self._emit()
+        self.utterances.put_nowait(None)
+    
+    def _emit(self) -> None:
+        if self._segments:
+            self.utterances.put_nowait(" ".join(self._segments))
+            self.utterance_count += 1
+        self._segments = []
+        self._speech_started = False
+    
+    async def next_utterance(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Next endpointed utterance; None once the session is closed or lost"""
+        if self._stream is None and self.utterances.empty():
+            return None
+        try:
+            return await asyncio.wait_for(self.utterances.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+    
+    async def close(self) -> None:
+        """Flush and close the stream, releasing any waiter"""
+        if self._closed:
+            return
+        self._closed = True
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            try:
+                await stream.aclose()
+            except Exception:
+                pass
+        if self._reader:
+            self._reader.cancel()
+        self._emit()
+        self.utterances.put_nowait(None)
+        _sessions.discard(self)
+        logger.info(f"🎙️ STT session closed for {self.name}: {self.stats()}")
+    
+    def stats(self) -> Dict:
+        return {
+            "name": self.name,
+            "open": self.is_open,
+            "uptime_s": round(time.monotonic() - self.opened_at, 1) if self.opened_at else 0.0,
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "utterances": self.utterance_count,
+            "audio_s": round(self.audio_seconds, 1),
+            "replayed_s": round(self.replayed_seconds, 2),
+            "in_speech": self._speech_started,
+            "last_error": self.last_error,
+        }
+
+def get_session_stats() -> List[Dict]:
+    """Stats of every open streaming STT session"""
+    return [session.stats() for session in list(_sessions)]
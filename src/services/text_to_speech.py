@@ -1,32 +1,199 @@
 """
 Text-to-speech service using Microsoft Edge TTS.
 """
+import asyncio
+import hashlib
 import os
 import logging
 import tempfile
+import time
 import wave
-from typing import Optional
-import edge_tts
-from livekit import rtc
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+import numpy as np
 from src.config import AgentConfig
+from src.utils.admission import AdmissionRejected, Priority, get_admission_controller
+from src.utils.audio_formats import AudioFormat, NATIVE_CODEC, NATIVE_SAMPLE_RATE, decode_pcm16, transcode_bytes
+from src.utils.capture import get_capture
+from src.utils.lazy import lazy_import
+
+# Loaded on first use so importing the service stays cheap
+edge_tts = lazy_import("edge_tts")
+rtc = lazy_import("livekit.rtc")
 
 logger = logging.getLogger(__name__)
 
+# Edge TTS streams 24 kHz mono MP3 (audio-24khz-48kbitrate-mono-mp3)
+EDGE_TTS_FORMAT = NATIVE_CODEC
+EDGE_TTS_SAMPLE_RATE = NATIVE_SAMPLE_RATE
+
+# Rate of the agent's LiveKit audio source
+PLAYBACK_SAMPLE_RATE = 16000
+
+CacheKey = Tuple[str, str]
+
+class _Render:
+    """A render in flight, owned by the cache, and how many callers await it"""
+    
+    def __init__(self, priority: Priority):
+        self.priority = priority
+        self.waiters = 0
+        self.task: Optional[asyncio.Task] = None
+
+class SynthesisCache:
+    """LRU cache of synthesized audio keyed by (voice, text)
+
+    Concurrent requests for the same key share a single upstream render. The
+    render runs in a task of its own: a caller that is cancelled stops
+    waiting without affecting the others, and the render is only cancelled
+    once nobody waits for it. Callers never join a render admitted at a
+    lower priority than their own.
+    """
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, bytes]" = OrderedDict()
+        self._size = 0
+        self._inflight: Dict[CacheKey, _Render] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: CacheKey) -> Optional[bytes]:
+        """Cached audio for a key, if present"""
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+        return data
+    
+    def put(self, key: CacheKey, data: bytes) -> None:
+        """Store audio, evicting least recently used entries over the size budget"""
+        if len(data) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key))
+        self._entries[key] = data
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+    
+    async def get_or_render(self, key: CacheKey, render: Callable[[], Awaitable[bytes]],
+                            priority: Priority = Priority.INTERACTIVE) -> Tuple[bytes, bool]:
+        """Return (audio, was_cached), rendering at most once per key and priority at a time"""
+        data = self.get(key)
+        if data is not None:
+            self.hits += 1
+            return data, True
+        
+        inflight = self._inflight.get(key)
+        cached = inflight is not None and inflight.priority <= priority
+        if cached:
+            self.hits += 1
+        else:
+            # Nothing in flight, or a render queued behind lower-priority traffic
+            self.misses += 1
+            inflight = _Render(priority)
+            inflight.task = asyncio.create_task(self._run(key, inflight, render))
+            self._inflight[key] = inflight
+        
+        inflight.waiters += 1
+        try:
+            return await asyncio.shield(inflight.task), cached
+        finally:
+            inflight.waiters -= 1
+            if not inflight.waiters and not inflight.task.done():
+                # Every caller was cancelled; nobody needs the audio now
+                inflight.task.cancel()
+    
+    async def _run(self, key: CacheKey, inflight: _Render,
+                   render: Callable[[], Awaitable[bytes]]) -> bytes:
+        try:
+            data = await render()
+            self.put(key, data)
+            return data
+        finally:
+            if self._inflight.get(key) is inflight:
+                del self._inflight[key]
+    
+    def stats(self) -> Dict[str, int]:
+        """Cache occupancy and hit counts"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+# Shared by every TTS service in the process
+_cache: Optional[SynthesisCache] = None
+
+def get_synthesis_cache(config: AgentConfig) -> SynthesisCache:
+    """Get the process-wide synthesis cache"""
+    global _cache
+    if _cache is None:
+        _cache = SynthesisCache(config.tts_cache_max_bytes)
+    return _cache
+
+class AudioStore:
+    """Pre-rendered audio on disk, keyed by voice and text
+
+    Layout: ``<directory>/<voice>/<sha1 of text>.mp3``. Filled offline by
+    ``python -m src.run_prerender`` and read before calling Edge TTS.
+    """
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+    
+    def path(self, voice: str, text: str) -> str:
+        """File that holds (or would hold) the audio for a voice and text"""
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, voice, f"{digest}.{EDGE_TTS_FORMAT}")
+    
+    def has(self, voice: str, text: str) -> bool:
+        return os.path.exists(self.path(voice, text))
+    
+    def get(self, voice: str, text: str) -> Optional[bytes]:
+        """Stored audio, if present (blocking; call off the loop)"""
+        try:
+            with open(self.path(voice, text), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+    
+    def put(self, voice: str, text: str, data: bytes) -> None:
+        """Store audio atomically"""
+        path = self.path(voice, text)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+def get_audio_store(config: AgentConfig) -> Optional[AudioStore]:
+    """Pre-rendered audio store, if one is configured"""
+    return AudioStore(config.tts_audio_store_dir) if config.tts_audio_store_dir else None
+
 class TextToSpeechService:
     """Handles text-to-speech synthesis using Edge TTS"""
     
-    def __init__(self, config: AgentConfig):
+    def __init__(self, config: AgentConfig, priority: Priority = Priority.INTERACTIVE):
         self.config = config
+        self.priority = priority
+        self.admission = get_admission_controller("tts", config)
+        self.cache = get_synthesis_cache(config)
+        self.store = get_audio_store(config)
     
     async def test_connection(self) -> bool:
         """Test Edge TTS connection"""
         try:
             communicate = edge_tts.Communicate("Test", self.config.tts_voice)
             audio_data = b""
-            async for chunk in communicate.stream():
-                if chunk["type"] == "audio":
-                    audio_data += chunk["data"]
-                    break  # Only test a small segment
+            async with self.admission.slot(self.priority):
+                async for chunk in communicate.stream():
+                    if chunk["type"] == "audio":
+                        audio_data += chunk["data"]
+                        break  # Only test a small segment
             
             if len(audio_data) > 0:
                 logger.info("✅ Edge TTS test successful")
@@ -35,33 +202,112 @@ class TextToSpeechService:
                 logger.error("No audio data received from Edge TTS")
                 return False
                 
+        except AdmissionRejected:
+            raise
         except Exception as e:
             logger.error(f"Edge TTS test failed: {e}")
             return False
     
-    async def synthesize(self, text: str) -> Optional[str]:
-        """Synthesize text to speech and return temp file path"""
+    async def _render(self, text: str, voice: str) -> bytes:
+        """Stream audio for text from Edge TTS into memory"""
+        communicate = edge_tts.Communicate(text, voice)
+        capture = get_capture()
+        chunks = []
+        async with self.admission.slot(self.priority):
+            start = time.monotonic()
+            try:
+                async for chunk in communicate.stream():
+                    if chunk["type"] == "audio":
+                        chunks.append(chunk["data"])
+                if not chunks:
+                    raise RuntimeError("No audio data received from Edge TTS")
+            except Exception as e:
+                if capture:
+                    capture.record_call("tts", {"voice": voice, "text": text},
+                                        latency=time.monotonic() - start, error=str(e))
+                raise
+        data = b"".join(chunks)
+        if capture:
+            capture.record_call("tts", {"voice": voice, "text": text}, data, time.monotonic() - start)
+        return data
+    
+    async def _load_or_render(self, text: str, voice: str) -> bytes:
+        """Pre-rendered audio from the store, falling back to Edge TTS"""
+        if self.store:
+            data = await asyncio.to_thread(self.store.get, voice, text)
+            if data:
+                return data
+        return await self._render(text, voice)
+    
+    async def synthesize_bytes(self, text: str, voice: Optional[str] = None) -> Tuple[Optional[bytes], bool]:
+        """Synthesize text to audio bytes, returning (audio, was_cached)"""
+        voice = voice or self.config.tts_voice
         try:
-            logger.info(f"🔊 Synthesizing: {text[:50]}...")
-            
-            # Create Edge TTS communicator
-            communicate = edge_tts.Communicate(text, self.config.tts_voice)
+            return await self.cache.get_or_render((voice, text), lambda: self._load_or_render(text, voice),
+                                                  self.priority)
+        except AdmissionRejected:
+            raise
+        except Exception as e:
+            logger.error(f"Speech synthesis error: {e}")
+            return None, False
+    
+    async def synthesize_format(self, text: str, fmt: AudioFormat,
+                                voice: Optional[str] = None) -> Tuple[Optional[bytes], bool]:
+        """Synthesize text in an output format, returning (audio, was_cached)
+        
+        The cache holds Edge TTS output; other formats are transcoded off the loop.
+        """
+        audio_data, cached = await self.synthesize_bytes(text, voice)
+        if audio_data and not fmt.is_native:
+            audio_data = await asyncio.to_thread(transcode_bytes, audio_data, fmt)
+        return audio_data, cached
+    
+    async def synthesize_pcm(self, text: str, voice: Optional[str] = None,
+                             sample_rate: int = PLAYBACK_SAMPLE_RATE) -> Optional[np.ndarray]:
+        """Synthesize text to mono int16 samples, decoded off the loop"""
+        audio_data, _ = await self.synthesize_bytes(text, voice)
+        if not audio_data:
+            return None
+        try:
+            return await asyncio.to_thread(decode_pcm16, audio_data, sample_rate)
+        except Exception as e:
+            logger.error(f"Speech decoding error: {e}")
+            return None
+    
+    async def synthesize(self, text: str, voice: Optional[str] = None,
+                         sample_rate: int = PLAYBACK_SAMPLE_RATE) -> Optional[str]:
+        """Synthesize text to a PCM16 WAV temp file and return its path"""
+        logger.info("🔊 Synthesizing: %.50s...", text)
+        
+        try:
+            audio_data, _ = await self.synthesize_format(text, AudioFormat("wav", sample_rate), voice)
+            if not audio_data:
+                return None
             
             # Create temporary file to store audio
             with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-                tmp_filename = tmp_file.name
-            
-            # Save audio to temporary file
-            await communicate.save(tmp_filename)
-            
-            return tmp_filename
-            
+                tmp_file.write(audio_data)
+                return tmp_file.name
+        except AdmissionRejected:
+            raise
         except Exception as e:
             logger.error(f"Speech synthesis error: {e}")
             return None
     
     @staticmethod
-    async def play_wav_file(wav_filename: str, audio_source: rtc.AudioSource) -> float:
+    async def play_pcm(samples: np.ndarray, sample_rate: int, audio_source: "rtc.AudioSource") -> float:
+        """Play mono int16 samples and return the duration"""
+        audio_frame = rtc.AudioFrame(
+            data=samples.astype(np.int16, copy=False).tobytes(),
+            sample_rate=sample_rate,
+            num_channels=1,
+            samples_per_channel=len(samples)
+        )
+        await audio_source.capture_frame(audio_frame)
+        return len(samples) / sample_rate
+    
+    @staticmethod
+    async def play_wav_file(wav_filename: str, audio_source: "rtc.AudioSource") -> float:
         """Play WAV file and return duration"""
         try:
             with wave.open(wav_filename, 'rb') as wav_file:
@@ -70,7 +316,7 @@ class TextToSpeechService:
                 num_channels = wav_file.getnchannels()
                 sample_width = wav_file.getsampwidth()
                 
-                logger.info(f"📊 Audio format: {sample_rate}Hz, {num_channels}ch, {sample_width*8}bit")
+                logger.debug("📊 Audio format: %dHz, %dch, %dbit", sample_rate, num_channels, sample_width * 8)
                 
                 # Read all audio data
                 audio_data = wav_file.readframes(wav_file.getnframes())
@@ -0,0 +1,243 @@
+"""
+Admission control and upstream rate limiting for the Voice Agent.
+
+Every upstream call (Gemini, Deepgram, Edge TTS) goes through an
+``AdmissionController`` for its service. The controller bounds concurrency,
+orders waiters by priority class and throttles requests with a token bucket
+per provider. When the estimated queueing delay exceeds the latency budget
+the request is rejected immediately with ``AdmissionRejected`` instead of
+piling up behind everyone else.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Admission priority classes, lower values are served first"""
+    REALTIME = 0      # Live interview rooms
+    INTERACTIVE = 1   # REST API calls
+    BATCH = 2         # Offline and bulk jobs
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted within the latency budget"""
+
+    def __init__(self, service: str, retry_after: float, reason: str = "overloaded"):
+        self.service = service
+        self.retry_after = max(retry_after, 0.0)
+        self.reason = reason
+        super().__init__(f"{service} {reason}, retry after {self.retry_after:.1f}s")
+
+    @property
+    def retry_after_header(self) -> str:
+        """Retry-After header value (whole seconds, at least 1)"""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class TokenBucket:
+    """Token bucket rate limiter for a single upstream provider"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Reserve tokens and return how long the caller must wait before using them"""
+        self._refill()
+        self._tokens -= tokens
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+    def refund(self, tokens: float = 1.0) -> None:
+        """Return tokens from a reservation that was not used"""
+        self._tokens = min(self.capacity, self._tokens + tokens)
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available (negative while in debt)"""
+        self._refill()
+        return self._tokens
+
+
+class AdmissionController:
+    """Bounded, priority-ordered concurrency limiter for one upstream service"""
+
+    def __init__(self, name: str, max_concurrency: int, queue_budget: float,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 initial_service_time: float = 0.5):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.queue_budget = queue_budget
+        self.rate_limiter = rate_limiter
+        self._active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._avg_service_time = initial_service_time
+        self.admitted = 0
+        self.rejected = 0
+
+    @property
+    def active(self) -> int:
+        """Number of requests currently holding a slot"""
+        return self._active
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting for a slot"""
+        self._prune()
+        return len(self._waiters)
+
+    def _prune(self) -> None:
+        """Drop waiters that timed out or were cancelled"""
+        if any(fut.done() for _, _, fut in self._waiters):
+            self._waiters = [w for w in self._waiters if not w[2].done()]
+            heapq.heapify(self._waiters)
+
+    def estimate_wait(self, priority: Priority) -> float:
+        """Estimate queueing delay for a new request of the given priority"""
+        self._prune()
+        if self._active < self.max_concurrency and not self._waiters:
+            return 0.0
+        ahead = sum(1 for p, _, _ in self._waiters if p <= priority)
+        return (ahead + 1) * self._avg_service_time / self.max_concurrency
+
+    def _reject(self, retry_after: float, reason: str) -> AdmissionRejected:
+        self.rejected += 1
+        logger.warning(f"⛔ {self.name} admission rejected ({reason}), retry after {retry_after:.2f}s")
+        return AdmissionRejected(self.name, retry_after, reason)
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE) -> None:
+        """Acquire a slot, waiting in priority order or failing fast
+
+        Realtime requests are never rejected: they queue ahead of everything
+        else, so a live interview degrades in latency rather than failing.
+        """
+        fail_fast = priority != Priority.REALTIME
+        estimate = self.estimate_wait(priority)
+        if fail_fast and estimate > self.queue_budget:
+            raise self._reject(estimate, "queue over latency budget")
+
+        if estimate > 0:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (int(priority), next(self._counter), future))
+            try:
+                await asyncio.wait_for(asyncio.shield(future),
+                                       timeout=self.queue_budget if fail_fast else None)
+            except asyncio.TimeoutError:
+                if future.done() and not future.cancelled():
+                    # Slot was handed over just as we timed out, pass it on
+                    self._release_slot()
+                else:
+                    future.cancel()
+                raise self._reject(self._avg_service_time, "queue wait timed out")
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self._release_slot()
+                else:
+                    future.cancel()
+                raise
+        else:
+            self._active += 1
+
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.reserve()
+            if fail_fast and wait > self.queue_budget:
+                self.rate_limiter.refund()
+                self._release_slot()
+                raise self._reject(wait, "upstream rate limit")
+            if wait > 0:
+                try:
+                    await asyncio.sleep(wait)
+                except asyncio.CancelledError:
+                    self._release_slot()
+                    raise
+
+        self.admitted += 1
+
+    def _release_slot(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                # Hand the slot straight to the next waiter
+                future.set_result(None)
+                return
+        self._active -= 1
+
+    def release(self, elapsed: Optional[float] = None) -> None:
+        """Release a slot, updating the service time estimate"""
+        if elapsed is not None:
+            self._avg_service_time = 0.8 * self._avg_service_time + 0.2 * elapsed
+        self._release_slot()
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.INTERACTIVE):
+        """Context manager holding a slot for the duration of an upstream call"""
+        await self.acquire(priority)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - start)
+
+    def stats(self) -> Dict[str, float]:
+        """Snapshot of controller state"""
+        return {
+            "active": self._active,
+            "queued": self.queue_depth,
+            "max_concurrency": self.max_concurrency,
+            "avg_service_time": round(self._avg_service_time, 4),
+            "estimated_wait": round(self.estimate_wait(Priority.INTERACTIVE), 4),
+            "queue_budget": self.queue_budget,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+# Per-service controllers shared by everything in the process
+_controllers: Dict[str, AdmissionController] = {}
+
+
+def get_admission_controller(service: str, config=None) -> AdmissionController:
+    """Get the shared admission controller for a service ("llm", "stt" or "tts")"""
+    controller = _controllers.get(service)
+    if controller is None:
+        if config is None:
+            from src.config import get_config
+            config = get_config()
+        max_concurrency = getattr(config, f"{service}_max_concurrency")
+        rate = getattr(config, f"{service}_rate_limit")
+        controller = AdmissionController(
+            name=service,
+            max_concurrency=max_concurrency,
+            queue_budget=config.admission_queue_budget,
+            rate_limiter=TokenBucket(rate) if rate > 0 else None,
+        )
+        _controllers[service] = controller
+    return controller
+
+
+def get_admission_stats() -> Dict[str, Dict[str, float]]:
+    """Stats for every controller created so far"""
+    return {name: controller.stats() for name, controller in _controllers.items()}
+
+
+def reset_admission_controllers() -> None:
+    """Drop all controllers so they are rebuilt from the current config"""
+    _controllers.clear()
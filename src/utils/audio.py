@@ -4,9 +4,11 @@ Audio processing utilities for the Voice Agent.
 import base64
 import io
 import logging
+import struct
 import tempfile
 import wave
 from typing import Tuple, Optional
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -81,3 +83,266 @@ def create_silent_wav(duration_ms: int, sample_rate: int = 16000,
     except Exception as e:
         logger.error(f"Error creating silent WAV: {e}")
         return ""
+
+class AudioRingBuffer:
+    """Fixed-capacity ring buffer of int16 samples with zero-copy windows
+
+    The backing array holds every sample twice (at ``i`` and ``i + capacity``)
+    so any window of up to ``capacity`` samples is a contiguous NumPy view,
+    even when it wraps. It is safe for one producer and one consumer without
+    locks: the producer only advances ``write_pos`` after copying, the
+    consumer only advances ``read_pos``. Views stay valid until the producer
+    overwrites those samples, so consume them before writing ``capacity``
+    more samples.
+    """
+    
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._buf = np.zeros(capacity * 2, dtype=np.int16)
+        self.write_pos = 0
+        self.read_pos = 0
+        self.overruns = 0
+    
+    @property
+    def available(self) -> int:
+        """Number of unread samples"""
+        return self.write_pos - self.read_pos
+    
+    def write(self, samples) -> int:
+        """Append samples (int16 array, bytes or memoryview), overwriting the oldest on overflow"""
+        if not isinstance(samples, np.ndarray):
+            samples = np.frombuffer(samples, dtype=np.int16)
+        n = len(samples)
+        cap = self.capacity
+        if n > cap:
+            samples = samples[-cap:]
+            self.write_pos += n - cap
+            n = cap
+        
+        idx = self.write_pos % cap
+        end = idx + n
+        self._buf[idx:end] = samples
+        if end <= cap:
+            self._buf[idx + cap:end + cap] = samples
+        else:
+            split = cap - idx
+            self._buf[idx + cap:] = samples[:split]
+            self._buf[:end - cap] = samples[split:]
+        
+        self.write_pos += n
+        if self.write_pos - self.read_pos > cap:
+            # Consumer fell behind: drop the oldest unread samples
+            self.overruns += 1
+            self.read_pos = self.write_pos - cap
+        return n
+    
+    def _view(self, start: int, n: int) -> np.ndarray:
+        idx = start % self.capacity
+        return self._buf[idx:idx + n]
+    
+    def peek(self, n: int) -> np.ndarray:
+        """View of up to n unread samples without consuming them"""
+        return self._view(self.read_pos, min(n, self.available))
+    
+    def read(self, n: int) -> np.ndarray:
+        """View of up to n unread samples, consuming them"""
+        n = min(n, self.available)
+        view = self._view(self.read_pos, n)
+        self.read_pos += n
+        return view
+    
+    def latest(self, n: int) -> np.ndarray:
+        """View of the most recent n samples, regardless of the read position"""
+        n = min(n, self.capacity, self.write_pos)
+        return self._view(self.write_pos - n, n)
+    
+    def rewind(self, n: int) -> int:
+        """Move the read position back up to n samples (pre-roll), returning how far it moved"""
+        target = max(self.write_pos - self.capacity, 0, self.read_pos - n)
+        moved = self.read_pos - target
+        self.read_pos = target
+        return moved
+    
+    def pre_roll(self, duration_ms: int, sample_rate: int = 16000) -> int:
+        """Rewind so the next read starts duration_ms before the newest sample
+
+        Call when voice activity is detected so the first syllable, spoken
+        before the detector triggered, is included in what is sent to STT.
+        """
+        n = int(sample_rate * duration_ms / 1000)
+        self.read_pos = max(self.write_pos - min(n, self.capacity), 0)
+        return self.available
+    
+    def clear(self) -> None:
+        """Discard all unread samples"""
+        self.read_pos = self.write_pos
+
+
+class JitterBuffer:
+    """Small reordering buffer for fixed-size audio frames
+
+    Frames are pushed with a sequence number and popped in order once the
+    buffer holds ``depth`` frames. A missing frame is concealed by replaying
+    the previous frame at half amplitude (silence after repeated losses);
+    frames arriving after their slot was played are dropped. All storage is
+    preallocated, and popped frames are views into it.
+    """
+    
+    def __init__(self, frame_samples: int, depth: int = 3, slots: int = 16):
+        if slots <= depth:
+            raise ValueError("slots must be larger than depth")
+        self.frame_samples = frame_samples
+        self.depth = depth
+        self.slots = slots
+        self._frames = np.zeros((slots, frame_samples), dtype=np.int16)
+        self._seqs = np.full(slots, -1, dtype=np.int64)
+        self._conceal = np.zeros(frame_samples, dtype=np.int16)
+        self._last: Optional[np.ndarray] = None
+        self._next_seq: Optional[int] = None
+        self._highest_seq = -1
+        self._consecutive_losses = 0
+        self.late = 0
+        self.concealed = 0
+    
+    @property
+    def buffered(self) -> int:
+        """Number of frames waiting to be played"""
+        if self._next_seq is None:
+            return 0
+        return int(np.count_nonzero(self._seqs >= self._next_seq))
+    
+    def push(self, seq: int, samples) -> bool:
+        """Add a frame, returning False if it arrived too late or too early to place"""
+        if not isinstance(samples, np.ndarray):
+            samples = np.frombuffer(samples, dtype=np.int16)
+        if self._next_seq is None:
+            self._next_seq = seq
+        if seq < self._next_seq:
+            self.late += 1
+            return False
+        if seq >= self._next_seq + self.slots:
+            # Far ahead of playout: resynchronize on the new stream position
+            self._seqs.fill(-1)
+            self._next_seq = seq
+        
+        slot = seq % self.slots
+        self._frames[slot, :len(samples)] = samples[:self.frame_samples]
+        if len(samples) < self.frame_samples:
+            self._frames[slot, len(samples):] = 0
+        self._seqs[slot] = seq
+        self._highest_seq = max(self._highest_seq, seq)
+        return True
+    
+    def pop(self) -> Optional[np.ndarray]:
+        """Next frame in order, a concealment frame, or None while filling"""
+        if self._next_seq is None or self._highest_seq - self._next_seq + 1 < self.depth:
+            return None
+        
+        slot = self._next_seq % self.slots
+        self._next_seq += 1
+        if self._seqs[slot] == self._next_seq - 1:
+            self._seqs[slot] = -1
+            self._consecutive_losses = 0
+            self._last = self._frames[slot]
+            return self._last
+        
+        # Lost or still missing: conceal
+        self.concealed += 1
+        self._consecutive_losses += 1
+        if self._last is not None and self._consecutive_losses == 1:
+            np.right_shift(self._last, 1, out=self._conceal)
+        else:
+            self._conceal.fill(0)
+        return self._conceal
+
+def encode_mulaw(samples: np.ndarray) -> np.ndarray:
+    """Encode int16 samples as 8-bit G.711 mu-law"""
+    x = samples.astype(np.int32) >> 2  # G.711 works on 14-bit samples
+    mask = np.where(x < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(x), 8159) + 0x21
+    segment = np.floor(np.log2(magnitude)).astype(np.int32) - 5
+    encoded = (np.minimum(segment, 7) << 4) | ((magnitude >> (np.minimum(segment, 7) + 1)) & 0x0F)
+    encoded = np.where(segment >= 8, 0x7F, encoded)
+    return (encoded ^ mask).astype(np.uint8)
+
+def write_mulaw_wav(output_path: str, samples: np.ndarray, sample_rate: int = 16000) -> str:
+    """Write mono int16 samples to a mu-law WAV file (half the size of PCM16)"""
+    encoded = encode_mulaw(samples).tobytes()
+    num_samples = len(encoded)
+    # fmt chunk for WAVE_FORMAT_MULAW (7): 8-bit mono, non-PCM formats need a fact chunk
+    fmt = struct.pack("<HHIIHHH", 7, 1, sample_rate, sample_rate, 1, 8, 0)
+    with open(output_path, "wb") as f:
+        f.write(b"RIFF")
+        f.write(struct.pack("<I", 4 + (8 + len(fmt)) + 12 + (8 + num_samples) + (num_samples % 2)))
+        f.write(b"WAVE")
+        f.write(b"fmt " + struct.pack("<I", len(fmt)) + fmt)
+        f.write(b"fact" + struct.pack("<II", 4, num_samples))
+        f.write(b"data" + struct.pack("<I", num_samples))
+        f.write(encoded)
+        if num_samples % 2:
+            f.write(b"\x00")
+    return output_path
+
+def decode_mulaw(encoded: np.ndarray) -> np.ndarray:
+    """Decode 8-bit G.711 mu-law to int16 samples"""
+    u = ~encoded.astype(np.int32) & 0xFF
+    exponent = (u >> 4) & 0x07
+    magnitude = (((u & 0x0F) << 3) + 0x84) << exponent
+    return np.where(u & 0x80, 0x84 - magnitude, magnitude - 0x84).astype(np.int16)
+
+def read_wav_samples(wav_file_path: str) -> Tuple[np.ndarray, int]:
+    """Read a PCM16 or mu-law WAV file as mono int16 samples and its sample rate"""
+    with open(wav_file_path, "rb") as f:
+        data = f.read()
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError(f"{wav_file_path} is not a WAV file")
+    
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        chunk_size = struct.unpack("<I", data[pos + 4:pos + 8])[0]
+        body = data[pos + 8:pos + 8 + chunk_size]
+        if chunk_id == b"fmt ":
+            fmt = struct.unpack("<HHIIHH", body[:16])
+        elif chunk_id == b"data":
+            break
+        pos += 8 + chunk_size + (chunk_size % 2)
+    else:
+        raise ValueError(f"{wav_file_path} has no data chunk")
+    if fmt is None:
+        raise ValueError(f"{wav_file_path} has no fmt chunk")
+    
+    format_tag, num_channels, sample_rate, _, _, bits = fmt
+    if format_tag == 1 and bits == 16:
+        samples = np.frombuffer(body[:len(body) // 2 * 2], dtype="<i2")
+    elif format_tag == 7 and bits == 8:
+        samples = decode_mulaw(np.frombuffer(body, dtype=np.uint8))
+    else:
+        raise ValueError(f"Unsupported WAV encoding (format {format_tag}, {bits} bit)")
+    
+    if num_channels > 1:
+        frames = len(samples) // num_channels
+        samples = samples[:frames * num_channels].reshape(frames, num_channels)
+        samples = samples.mean(axis=1).astype(np.int16)
+    return samples, sample_rate
+
+def resample(samples: np.ndarray, from_rate: int, to_rate: int) -> np.ndarray:
+    """Resample int16 audio with linear interpolation"""
+    if from_rate == to_rate or len(samples) == 0:
+        return samples
+    target_len = int(round(len(samples) * to_rate / from_rate))
+    positions = np.arange(target_len) * (from_rate / to_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+
+def pcm16_to_wav_bytes(samples: np.ndarray, sample_rate: int = 16000) -> bytes:
+    """Wrap mono int16 samples in an in-memory WAV file"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.astype("<i2").tobytes())
+    return buffer.getvalue()
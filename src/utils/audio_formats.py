@@ -0,0 +1,210 @@
+"""
+Output formats and transcoding for synthesized speech.
+
+Edge TTS produces 24 kHz mono MP3 at 48 kbit/s. A request for exactly that
+is served as is. Any other format is decoded and re-encoded with PyAV
+(FFmpeg), one encoded chunk at a time, so responses can stream while the
+encoder is still running.
+
+    mp3   MPEG audio (audio/mpeg), selectable bitrate
+    opus  Opus in Ogg (audio/ogg), the smallest for speech
+    wav   PCM16 WAV (audio/wav)
+    pcm   raw little-endian PCM16 (audio/L16)
+"""
+import io
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
+from src.utils.audio import pcm16_to_wav_bytes
+from src.utils.lazy import lazy_import
+
+# FFmpeg bindings, only loaded when a request needs transcoding
+av = lazy_import("av")
+
+NATIVE_CODEC = "mp3"
+NATIVE_SAMPLE_RATE = 24000
+NATIVE_BITRATE = 48
+
+# codec -> (media type, default sample rate, default bitrate in kbit/s, bitrate range)
+FORMATS = {
+    "mp3": ("audio/mpeg", NATIVE_SAMPLE_RATE, NATIVE_BITRATE, (8, 320)),
+    "opus": ("audio/ogg", 24000, 24, (6, 256)),
+    "wav": ("audio/wav", NATIVE_SAMPLE_RATE, None, None),
+    "pcm": ("audio/L16", NATIVE_SAMPLE_RATE, None, None),
+}
+
+# Accept header media types and the format each one selects
+MEDIA_TYPES = {
+    "audio/mpeg": "mp3",
+    "audio/mp3": "mp3",
+    "audio/ogg": "opus",
+    "audio/opus": "opus",
+    "audio/wav": "wav",
+    "audio/wave": "wav",
+    "audio/x-wav": "wav",
+    "audio/l16": "pcm",
+}
+
+# Opus only encodes at these rates
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+MIN_SAMPLE_RATE = 8000
+MAX_SAMPLE_RATE = 48000
+
+# Seconds of audio per encoder call, and so roughly per streamed chunk
+CHUNK_SECONDS = 0.5
+
+@dataclass(frozen=True)
+class AudioFormat:
+    """A requested output format"""
+    codec: str
+    sample_rate: int
+    bitrate: Optional[int] = None  # kbit/s, compressed formats only
+
+    @classmethod
+    def parse(cls, codec: str, sample_rate: Optional[int] = None,
+              bitrate: Optional[int] = None) -> 'AudioFormat':
+        """Validated format with defaults filled in; raises ValueError"""
+        codec = codec.lower()
+        if codec not in FORMATS:
+            raise ValueError(f"Unsupported format '{codec}' (choose from {', '.join(FORMATS)})")
+        _, default_rate, default_bitrate, bitrate_range = FORMATS[codec]
+        sample_rate = sample_rate or default_rate
+        if not MIN_SAMPLE_RATE <= sample_rate <= MAX_SAMPLE_RATE:
+            raise ValueError(f"Sample rate must be between {MIN_SAMPLE_RATE} and {MAX_SAMPLE_RATE} Hz")
+        if codec == "opus" and sample_rate not in OPUS_SAMPLE_RATES:
+            raise ValueError(f"Opus sample rate must be one of {', '.join(map(str, OPUS_SAMPLE_RATES))}")
+        if bitrate_range is None:
+            bitrate = None
+        else:
+            bitrate = bitrate or default_bitrate
+            low, high = bitrate_range
+            if not low <= bitrate <= high:
+                raise ValueError(f"{codec} bitrate must be between {low} and {high} kbit/s")
+        return cls(codec, sample_rate, bitrate)
+
+    @classmethod
+    def native(cls) -> 'AudioFormat':
+        """What Edge TTS produces"""
+        return cls(NATIVE_CODEC, NATIVE_SAMPLE_RATE, NATIVE_BITRATE)
+
+    @property
+    def is_native(self) -> bool:
+        return self == AudioFormat.native()
+
+    @property
+    def media_type(self) -> str:
+        media_type = FORMATS[self.codec][0]
+        if self.codec == "pcm":
+            return f"{media_type};rate={self.sample_rate};channels=1"
+        return media_type
+
+def _accept_entries(accept: str) -> List[Tuple[float, str, dict]]:
+    """Media ranges of an Accept header, highest quality first"""
+    entries = []
+    for position, part in enumerate(accept.split(",")):
+        fields = [f.strip() for f in part.split(";")]
+        media_type = fields[0].lower()
+        if not media_type:
+            continue
+        params = {}
+        for field in fields[1:]:
+            key, _, value = field.partition("=")
+            params[key.strip().lower()] = value.strip()
+        try:
+            quality = float(params.pop("q", 1))
+        except ValueError:
+            quality = 0.0
+        if quality > 0:
+            entries.append((-quality, position, media_type, params))
+    entries.sort()
+    return [(-q, media_type, params) for q, _, media_type, params in entries]
+
+def negotiate(accept: Optional[str]) -> Optional[AudioFormat]:
+    """Audio format selected by an Accept header
+
+    Returns None when the client accepts JSON (or anything) rather than a
+    specific audio type. Raises ValueError when it only accepts audio types
+    we cannot produce.
+    """
+    if not accept:
+        return None
+    entries = _accept_entries(accept)
+    for _, media_type, params in entries:
+        if media_type in ("application/json", "*/*", "application/*"):
+            return None
+        if media_type == "audio/*":
+            return AudioFormat.native()
+        codec = MEDIA_TYPES.get(media_type)
+        if codec:
+            rate = params.get("rate")
+            return AudioFormat.parse(codec, int(rate) if rate and rate.isdigit() else None)
+    if any(media_type.startswith("audio/") for _, media_type, _ in entries):
+        raise ValueError(f"None of the requested audio types are supported: {accept}")
+    return None
+
+def decode_pcm16(data: bytes, sample_rate: int) -> np.ndarray:
+    """Decode compressed audio to mono int16 samples at a sample rate (CPU bound)"""
+    chunks = []
+    with av.open(io.BytesIO(data)) as container:
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=sample_rate)
+        for frame in container.decode(audio=0):
+            for out in resampler.resample(frame):
+                chunks.append(out.to_ndarray().reshape(-1))
+        for out in resampler.resample(None):
+            chunks.append(out.to_ndarray().reshape(-1))
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int16)
+
+class _Sink:
+    """Write-only file object the muxer writes to; drained after each packet"""
+
+    def __init__(self):
+        self._buf = bytearray()
+
+    def write(self, data) -> int:
+        self._buf += data
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = bytes(self._buf)
+        self._buf.clear()
+        return data
+
+def _encode(samples: np.ndarray, fmt: AudioFormat) -> Iterator[bytes]:
+    container_format, codec = ("ogg", "libopus") if fmt.codec == "opus" else ("mp3", "libmp3lame")
+    sink = _Sink()
+    step = int(fmt.sample_rate * CHUNK_SECONDS)
+    with av.open(sink, mode="w", format=container_format) as container:
+        stream = container.add_stream(codec, rate=fmt.sample_rate, layout="mono")
+        stream.bit_rate = fmt.bitrate * 1000
+        for start in range(0, len(samples), step):
+            frame = av.AudioFrame.from_ndarray(samples[start:start + step].reshape(1, -1),
+                                               format="s16", layout="mono")
+            frame.sample_rate = fmt.sample_rate
+            for packet in stream.encode(frame):
+                container.mux(packet)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+        for packet in stream.encode(None):
+            container.mux(packet)
+    # The container trailer is written on close
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
+
+def transcode(data: bytes, fmt: AudioFormat) -> Iterator[bytes]:
+    """Convert native Edge TTS audio to a format, yielding encoded chunks (CPU bound)"""
+    if fmt.is_native:
+        yield data
+        return
+    samples = decode_pcm16(data, fmt.sample_rate)
+    if fmt.codec == "wav":
+        yield pcm16_to_wav_bytes(samples, fmt.sample_rate)
+    elif fmt.codec == "pcm":
+        yield samples.astype("<i2", copy=False).tobytes()
+    else:
+        yield from _encode(samples, fmt)
+
+def transcode_bytes(data: bytes, fmt: AudioFormat) -> bytes:
+    """Convert native Edge TTS audio to a format in one piece (CPU bound)"""
+    return b"".join(transcode(data, fmt))
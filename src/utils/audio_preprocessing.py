@@ -0,0 +1,175 @@
+"""
+Inbound audio preprocessing for the Voice Agent.
+
+Cleans up candidate audio before it reaches VAD and STT: a high-pass filter
+removes DC offset and low-frequency rumble, an energy noise gate attenuates
+background noise between words, and automatic gain control brings quiet or
+hot microphones to a consistent level.
+
+Each stream gets its own ``AudioPreprocessor`` which keeps filter and gain
+state across frames. All buffers are allocated once in the constructor, so
+processing a frame does not allocate.
+"""
+import math
+from dataclasses import dataclass
+import numpy as np
+
+# Level of a full-scale int16 sine, used as the 0 dBFS reference
+_FULL_SCALE = 32768.0
+
+def _db_to_linear(db: float) -> float:
+    return 10.0 ** (db / 20.0)
+
+@dataclass
+class PreprocessorConfig:
+    """Settings for the inbound audio preprocessing stage"""
+    enabled: bool = True
+    sample_rate: int = 16000
+    frame_ms: int = 10
+    highpass_cutoff_hz: float = 80.0
+    agc_target_dbfs: float = -20.0
+    agc_max_gain_db: float = 24.0
+    agc_min_gain_db: float = -12.0
+    agc_attack_ms: float = 20.0
+    agc_release_ms: float = 500.0
+    gate_threshold_dbfs: float = -50.0
+    gate_open_ratio_db: float = 6.0  # Open when this far above the noise floor
+    gate_floor_db: float = -30.0     # Attenuation applied while closed
+    gate_hold_ms: float = 200.0
+
+    @property
+    def frame_samples(self) -> int:
+        """Samples per processing frame"""
+        return self.sample_rate * self.frame_ms // 1000
+
+    @classmethod
+    def from_agent_config(cls, config) -> 'PreprocessorConfig':
+        """Build preprocessing settings from an AgentConfig"""
+        return cls(
+            enabled=config.audio_preprocessing,
+            highpass_cutoff_hz=config.highpass_cutoff_hz,
+            agc_target_dbfs=config.agc_target_dbfs,
+            gate_threshold_dbfs=config.noise_gate_threshold_dbfs,
+        )
+
+class AudioPreprocessor:
+    """High-pass filter, noise gate and AGC for one inbound stream"""
+
+    def __init__(self, config: PreprocessorConfig):
+        self.config = config
+        n = config.frame_samples
+        self.frame_samples = n
+        frame_seconds = config.frame_ms / 1000.0
+
+        # One-pole high-pass y[n] = a*y[n-1] + x[n] - x[n-1]. Within a frame the
+        # recursion unrolls to y = M @ dx + a^(k+1) * y_prev, where M is lower
+        # triangular with M[k, j] = a^(k-j), so a frame is one matrix product.
+        a = math.exp(-2.0 * math.pi * config.highpass_cutoff_hz / config.sample_rate)
+        powers = a ** np.arange(n, dtype=np.float64)
+        k, j = np.indices((n, n))
+        self._hp_matrix = np.where(k >= j, powers[np.abs(k - j)], 0.0).astype(np.float32)
+        self._hp_decay = (a ** np.arange(1, n + 1)).astype(np.float32)
+        self._x_prev = np.float32(0.0)
+        self._y_prev = np.float32(0.0)
+
+        # Gain smoothing coefficients (per frame)
+        self._attack = 1.0 - math.exp(-frame_seconds / (config.agc_attack_ms / 1000.0))
+        self._release = 1.0 - math.exp(-frame_seconds / (config.agc_release_ms / 1000.0))
+        # Levels are kept in int16 sample units to avoid rescaling every frame
+        self._target = _db_to_linear(config.agc_target_dbfs) * _FULL_SCALE
+        self._max_gain = _db_to_linear(config.agc_max_gain_db)
+        self._min_gain = _db_to_linear(config.agc_min_gain_db)
+        self._gate_threshold = _db_to_linear(config.gate_threshold_dbfs) * _FULL_SCALE
+        self._gate_ratio = _db_to_linear(config.gate_open_ratio_db)
+        self._gate_floor = _db_to_linear(config.gate_floor_db)
+        self._gate_hold_frames = max(1, int(config.gate_hold_ms / config.frame_ms))
+
+        # Running state
+        self.envelope = self._target
+        self.noise_floor = self._gate_threshold
+        self.gain = 1.0
+        self.gate_gain = 1.0
+        self.gate_open = False
+        self._hold = 0
+
+        # Preallocated work buffers
+        self._x = np.zeros(n + 1, dtype=np.float32)
+        self._dx = np.zeros(n, dtype=np.float32)
+        self._y = np.zeros(n, dtype=np.float32)
+        self._tmp = np.zeros(n, dtype=np.float32)
+        self._ramp = (np.arange(1, n + 1, dtype=np.float32) / n)
+        self._out = np.zeros(n, dtype=np.int16)
+
+    def process(self, frame) -> np.ndarray:
+        """Process one frame of int16 samples and return the cleaned frame
+
+        The returned array is reused by the next call; copy it (or write it
+        into a ring buffer) before processing another frame.
+        """
+        if not isinstance(frame, np.ndarray):
+            frame = np.frombuffer(frame, dtype=np.int16)
+        if len(frame) != self.frame_samples:
+            raise ValueError(f"expected {self.frame_samples} samples, got {len(frame)}")
+
+        if not self.config.enabled:
+            np.copyto(self._out, frame)
+            return self._out
+
+        x, dx, y, tmp = self._x, self._dx, self._y, self._tmp
+
+        # High-pass filter, carrying the previous input/output sample across frames
+        x[0] = self._x_prev
+        np.copyto(x[1:], frame)
+        np.subtract(x[1:], x[:-1], out=dx)
+        self._hp_matrix.dot(dx, out=y)
+        np.multiply(self._hp_decay, self._y_prev, out=tmp)
+        np.add(y, tmp, out=y)
+        self._x_prev = x[-1]
+        self._y_prev = y[-1]
+
+        rms = math.sqrt(float(np.dot(y, y)) / self.frame_samples)
+
+        # Energy noise gate with a noise floor that falls fast and rises slowly
+        if rms < self.noise_floor:
+            self.noise_floor = rms + (self.noise_floor - rms) * 0.5
+        else:
+            self.noise_floor += (rms - self.noise_floor) * 0.002
+        speech = rms > self._gate_threshold and rms > self.noise_floor * self._gate_ratio
+        if speech:
+            self._hold = self._gate_hold_frames
+        elif self._hold > 0:
+            self._hold -= 1
+        self.gate_open = speech or self._hold > 0
+        gate_target = 1.0 if self.gate_open else self._gate_floor
+
+        # AGC follows the speech envelope only, so it doesn't pump up the noise
+        if self.gate_open:
+            coeff = self._attack if rms > self.envelope else self._release
+            self.envelope += (rms - self.envelope) * coeff
+        gain_target = min(self._max_gain, max(self._min_gain, self._target / max(self.envelope, 1e-6)))
+
+        # Ramp the combined gain across the frame to avoid zipper noise
+        start = self.gain * self.gate_gain
+        end = gain_target * gate_target
+        np.multiply(self._ramp, end - start, out=tmp)
+        np.add(tmp, start, out=tmp)
+        np.multiply(y, tmp, out=y)
+        self.gain = gain_target
+        self.gate_gain = gate_target
+
+        # minimum/maximum are cheaper than np.clip for small arrays
+        np.minimum(y, 32767.0, out=y)
+        np.maximum(y, -32768.0, out=y)
+        np.copyto(self._out, y, casting="unsafe")
+        return self._out
+
+    def reset(self) -> None:
+        """Clear filter and gain state (e.g. when the speaker changes)"""
+        self._x_prev = np.float32(0.0)
+        self._y_prev = np.float32(0.0)
+        self.envelope = self._target
+        self.noise_floor = self._gate_threshold
+        self.gain = 1.0
+        self.gate_gain = 1.0
+        self.gate_open = False
+        self._hold = 0
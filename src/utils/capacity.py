@@ -0,0 +1,53 @@
+"""
+Load and readiness reporting for autoscaling.
+
+The load score is the utilisation of whichever resource is closest to its
+limit:
+
+- rooms: running interviews over the room capacity
+- queues: the worst upstream's estimated queueing delay over its budget
+- loop: smoothed event loop lag over the stall threshold
+
+so 1.0 means this process cannot take more work without some requests
+being rejected or stalled. A degraded upstream is reported but does not
+raise the score: adding instances does not make Gemini faster.
+"""
+from typing import Any, Dict, List
+
+
+def _ratio(value: float, limit: float) -> float:
+    return value / limit if limit > 0 else 1.0
+
+
+def load_report(rooms: Dict[str, Any], admission: Dict[str, Dict[str, float]],
+                health: Dict[str, Dict[str, float]], loop: Dict[str, Any],
+                ready_max_load: float = 0.9) -> Dict[str, Any]:
+    """Combine room, admission, health and loop lag stats into a load report"""
+    components = {
+        "rooms": _ratio(rooms["rooms"], rooms["capacity"]),
+        "queues": max((_ratio(s["estimated_wait"], s["queue_budget"]) for s in admission.values()),
+                      default=0.0),
+        "loop": _ratio(loop["recent_lag_ms"], loop["threshold_ms"]) if loop["running"] else 0.0,
+    }
+    score = min(max(components.values()), 1.0)
+
+    not_ready: List[str] = []
+    if rooms["draining"]:
+        not_ready.append("draining")
+    if rooms["rooms"] >= rooms["capacity"]:
+        not_ready.append("rooms at capacity")
+    if score >= ready_max_load:
+        not_ready.append(f"load {score:.2f} >= {ready_max_load:.2f}")
+
+    return {
+        "ready": not not_ready,
+        "reasons": not_ready,
+        "load": round(score, 3),
+        "components": {name: round(value, 3) for name, value in components.items()},
+        "rooms": rooms,
+        "queues": {name: {"active": s["active"], "queued": s["queued"],
+                          "estimated_wait": s["estimated_wait"]}
+                   for name, s in admission.items()},
+        "degraded_upstreams": sorted(name for name, s in health.items() if s["degraded"]),
+        "loop_lag_ms": loop["recent_lag_ms"],
+    }
@@ -0,0 +1,207 @@
+"""
+Session capture for deterministic replay.
+
+A capture records everything one room's turn pipeline depended on, with
+timing, so a production session can be replayed offline
+(``python -m src.run_replay``):
+
+    events.jsonl   one JSON object per event, in order: a sequence number,
+                   the offset in seconds from the start of the session and
+                   the event kind. ``frame`` events point into inbound.pcm,
+                   ``call`` events hold an upstream request, its response
+                   and latency, other kinds are pipeline milestones
+                   (answer, response, speak_start, ...)
+    inbound.pcm    raw candidate audio as received (16-bit, before
+                   preprocessing), appended frame by frame
+    payloads/      binary upstream responses (synthesized audio)
+
+Like ``SessionRecorder``, events are queued from the event loop and written
+by a background thread; when the writer falls behind, events are dropped
+and counted. The capture for the current room is found through a context
+variable, so services record their upstream calls without knowing which
+room they are serving.
+"""
+import contextvars
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+_capture_var: contextvars.ContextVar = contextvars.ContextVar("session_capture", default=None)
+
+def get_capture() -> Optional["SessionCapture"]:
+    """Capture of the room the current task belongs to, if capturing"""
+    return _capture_var.get()
+
+def set_capture(capture: Optional["SessionCapture"]) -> None:
+    """Attribute the current task's upstream calls and events to a capture"""
+    _capture_var.set(capture)
+
+class SessionCapture:
+    """Records one room's inbound audio, upstream calls and events off the event loop"""
+
+    def __init__(self, room_name: str, output_dir: str, sample_rate: int = 16000,
+                 max_queue: int = 5000):
+        self.room_name = room_name
+        self.directory = os.path.join(output_dir, room_name)
+        self.sample_rate = sample_rate
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start = time.monotonic()
+        self._seq = 0
+        self._frame_samples = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        """Start the background writer thread"""
+        os.makedirs(os.path.join(self.directory, "payloads"), exist_ok=True)
+        self._start = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name=f"capture-{self.room_name}",
+                                        daemon=True)
+        self._thread.start()
+        self.record_event("session_start", room=self.room_name, sample_rate=self.sample_rate)
+        logger.info(f"🎞️ Capturing room {self.room_name} to {self.directory}")
+
+    def _offer(self, event: Dict[str, Any], payload: Any = None) -> bool:
+        self._seq += 1
+        event["seq"] = self._seq
+        event["t"] = round(time.monotonic() - self._start, 6)
+        try:
+            self._queue.put_nowait((event, payload))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def record_frame(self, data) -> bool:
+        """Queue a frame of inbound int16 audio as received"""
+        # Copy: frame buffers are reused by the SDK
+        samples = np.frombuffer(data, dtype=np.int16).copy()
+        event = {"kind": "frame", "offset": self._frame_samples, "samples": len(samples)}
+        if self._offer(event, samples):
+            self._frame_samples += len(samples)
+            return True
+        return False
+
+    def record_call(self, service: str, request: Any, response: Any = None, latency: float = 0.0,
+                    error: Optional[str] = None) -> bool:
+        """Queue an upstream call; bytes responses are stored as payload files"""
+        event: Dict[str, Any] = {
+            "kind": "call",
+            "service": service,
+            "request": request,
+            "latency": round(latency, 6),
+            "error": error,
+        }
+        if isinstance(response, (bytes, bytearray)):
+            return self._offer(event, bytes(response))
+        event["response"] = response
+        return self._offer(event)
+
+    def record_event(self, name: str, **fields: Any) -> bool:
+        """Queue a pipeline milestone"""
+        event: Dict[str, Any] = {"kind": name}
+        event.update(fields)
+        return self._offer(event)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush queued events and stop the writer thread (blocking; call off the loop)"""
+        if not self._thread:
+            return
+        self.record_event("session_end", dropped=self.dropped)
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning(f"Capture for {self.room_name} did not drain in time")
+        self._thread.join(timeout)
+        self._thread = None
+        if self.dropped:
+            logger.warning(f"Capture for {self.room_name} dropped {self.dropped} events")
+
+    def _run(self) -> None:
+        """Writer thread: drain the queue until stopped"""
+        events = open(os.path.join(self.directory, "events.jsonl"), "w", encoding="utf-8")
+        audio = open(os.path.join(self.directory, "inbound.pcm"), "wb")
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                event, payload = item
+                try:
+                    if event["kind"] == "frame":
+                        audio.write(payload.astype("<i2", copy=False).tobytes())
+                    elif payload is not None:
+                        name = f"{event['seq']:06d}.bin"
+                        with open(os.path.join(self.directory, "payloads", name), "wb") as f:
+                            f.write(payload)
+                        event["payload"] = name
+                    events.write(json.dumps(event) + "\n")
+                except Exception as e:
+                    logger.error(f"Capture write error: {e}")
+        finally:
+            events.close()
+            audio.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Capture counters"""
+        return {
+            "queued": self._queue.qsize(),
+            "dropped": self.dropped,
+            "events": self._seq,
+            "frame_samples": self._frame_samples,
+        }
+
+class CaptureReader:
+    """Reads a capture directory back for replay"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, "events.jsonl"), "r", encoding="utf-8") as f:
+            self.events: List[Dict[str, Any]] = [json.loads(line) for line in f if line.strip()]
+        start = next((e for e in self.events if e["kind"] == "session_start"), {})
+        self.room_name = start.get("room", os.path.basename(directory.rstrip(os.sep)))
+        self.sample_rate = start.get("sample_rate", 16000)
+
+    def of_kind(self, kind: str) -> List[Dict[str, Any]]:
+        """Events of one kind, in order"""
+        return [event for event in self.events if event["kind"] == kind]
+
+    def calls(self, service: str) -> List[Dict[str, Any]]:
+        """Recorded upstream calls to a service, in order"""
+        return [event for event in self.events if event["kind"] == "call" and event["service"] == service]
+
+    def payload(self, event: Dict[str, Any]) -> Optional[bytes]:
+        """Binary response of a call, if it had one"""
+        name = event.get("payload")
+        if not name:
+            return None
+        with open(os.path.join(self.directory, "payloads", name), "rb") as f:
+            return f.read()
+
+    def frames(self) -> Iterator[tuple]:
+        """(offset seconds, int16 samples) for each captured inbound frame"""
+        audio = np.fromfile(os.path.join(self.directory, "inbound.pcm"), dtype="<i2")
+        for event in self.of_kind("frame"):
+            start = event["offset"]
+            yield event["t"], audio[start:start + event["samples"]].astype(np.int16)
+
+    def turn_latencies(self) -> List[Dict[str, Any]]:
+        """Per turn: seconds from the candidate's answer to the agent starting to speak"""
+        turns = []
+        answer = None
+        for event in self.events:
+            if event["kind"] == "answer":
+                answer = event
+            elif event["kind"] == "speak_start" and answer is not None:
+                turns.append({"turn": answer["turn"], "latency": round(event["t"] - answer["t"], 3)})
+                answer = None
+        return turns
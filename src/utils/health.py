@@ -0,0 +1,132 @@
+"""
+Upstream health tracking for the Voice Agent.
+
+``UpstreamHealth`` watches the latency and outcome of calls to one provider.
+When the smoothed latency or the recent failure rate crosses its threshold
+the upstream is marked degraded and callers switch to a local fallback.
+While degraded, a single probe request is let through every recovery
+interval; a fast, successful probe marks the upstream healthy again.
+"""
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamHealth:
+    """Latency and error tracker with degraded/healthy hysteresis"""
+
+    def __init__(self, name: str, latency_threshold: float, error_threshold: float = 0.5,
+                 window: int = 20, min_samples: int = 5, recovery_interval: float = 15.0):
+        self.name = name
+        self.latency_threshold = latency_threshold
+        self.error_threshold = error_threshold
+        self.min_samples = min_samples
+        self.recovery_interval = recovery_interval
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._latency: Optional[float] = None
+        self._degraded_since: Optional[float] = None
+        self._next_probe = 0.0
+        self.degraded_count = 0
+
+    @property
+    def is_degraded(self) -> bool:
+        return self._degraded_since is not None
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def should_try(self) -> bool:
+        """Whether a caller should use the upstream now
+
+        Always true while healthy. While degraded, true for one probe per
+        recovery interval, whose outcome decides whether to recover.
+        """
+        if not self.is_degraded:
+            return True
+        now = time.monotonic()
+        if now < self._next_probe:
+            return False
+        self._next_probe = now + self.recovery_interval
+        return True
+
+    def record_success(self, latency: float) -> None:
+        """Report a completed call and its upstream latency in seconds"""
+        self._outcomes.append(True)
+        if self.is_degraded:
+            if latency < self.latency_threshold:
+                self._latency = latency
+                self._outcomes.clear()
+                self._set_healthy()
+            return
+        self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+        self._evaluate()
+
+    def record_failure(self) -> None:
+        """Report a failed or timed out call"""
+        self._outcomes.append(False)
+        self._evaluate()
+
+    def _evaluate(self) -> None:
+        if self.is_degraded:
+            return
+        if self._latency is not None and self._latency > self.latency_threshold:
+            self._set_degraded(f"latency {self._latency:.2f}s")
+        elif len(self._outcomes) >= self.min_samples and self.error_rate > self.error_threshold:
+            self._set_degraded(f"error rate {self.error_rate:.0%}")
+
+    def _set_degraded(self, reason: str) -> None:
+        self._degraded_since = time.monotonic()
+        self._next_probe = self._degraded_since + self.recovery_interval
+        self.degraded_count += 1
+        logger.warning(f"🩺 {self.name} degraded ({reason}), using fast path")
+
+    def _set_healthy(self) -> None:
+        duration = time.monotonic() - self._degraded_since
+        self._degraded_since = None
+        logger.info(f"🩺 {self.name} recovered after {duration:.1f}s")
+
+    def stats(self) -> Dict[str, float]:
+        """Snapshot of health state"""
+        return {
+            "degraded": self.is_degraded,
+            "latency": round(self._latency, 4) if self._latency is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "degraded_count": self.degraded_count,
+        }
+
+
+# Per-service trackers shared by everything in the process
+_trackers: Dict[str, UpstreamHealth] = {}
+
+
+def get_upstream_health(service: str, config=None) -> UpstreamHealth:
+    """Get the shared health tracker for a service"""
+    tracker = _trackers.get(service)
+    if tracker is None:
+        if config is None:
+            from src.config import get_config
+            config = get_config()
+        tracker = UpstreamHealth(
+            name=service,
+            latency_threshold=getattr(config, f"{service}_degraded_latency"),
+            error_threshold=getattr(config, f"{service}_degraded_error_rate"),
+            recovery_interval=getattr(config, f"{service}_recovery_interval"),
+        )
+        _trackers[service] = tracker
+    return tracker
+
+
+def get_health_stats() -> Dict[str, Dict[str, float]]:
+    """Stats for every tracker created so far"""
+    return {name: tracker.stats() for name, tracker in _trackers.items()}
+
+
+def reset_upstream_health() -> None:
+    """Drop all trackers so they are rebuilt from the current config"""
+    _trackers.clear()
@@ -0,0 +1,58 @@
+"""
+Lazy loading of heavy provider SDKs.
+
+Importing ``google.generativeai``, ``livekit.rtc`` or the Deepgram plugin
+costs seconds, most of which is wasted in processes that never touch them
+(API workers serving only cached synthesis, batch tools, CLI helpers).
+``lazy_import`` returns a stand-in module that performs the real import on
+first attribute access and records how long it took.
+"""
+import importlib
+import time
+import types
+from typing import Dict, List
+
+# Every lazily imported module, and the seconds spent on its first load
+_modules: Dict[str, "LazyModule"] = {}
+_load_times: Dict[str, float] = {}
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self.__name__)
+            _load_times[self.__name__] = time.perf_counter() - start
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the real module has been imported"""
+        return self.__dict__["_module"] is not None
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a proxy for a module that is imported on first use"""
+    if name not in _modules:
+        _modules[name] = LazyModule(name)
+    return _modules[name]
+
+def get_lazy_modules() -> List[LazyModule]:
+    """All modules registered for lazy loading"""
+    return list(_modules.values())
+
+def get_lazy_load_times() -> Dict[str, float]:
+    """First-use import cost of every lazily loaded module so far"""
+    return dict(_load_times)
@@ -1,29 +1,208 @@
 """
 Logging configuration for the Voice Agent.
+
+Log records are handed to a bounded in-memory queue and written to
+stdout/files by a background listener thread, so a slow terminal or disk
+never stalls the event loop. Records carry room and turn correlation IDs
+from context variables, and can be rendered as JSON lines.
 """
+import atexit
+import contextvars
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import time
+from contextlib import contextmanager
 from typing import Optional
 
-def setup_logging(level: int = logging.INFO, log_file: Optional[str] = None):
+# Correlation IDs for the current task (asyncio copies these into new tasks)
+_room_var: contextvars.ContextVar = contextvars.ContextVar("log_room", default=None)
+_turn_var: contextvars.ContextVar = contextvars.ContextVar("log_turn", default=None)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["DroppingQueueHandler"] = None
+
+def set_log_context(room: Optional[str] = None, turn: Optional[int] = None) -> None:
+    """Set correlation IDs for log records emitted by the current task"""
+    if room is not None:
+        _room_var.set(room)
+    if turn is not None:
+        _turn_var.set(turn)
+
+@contextmanager
+def log_context(room: Optional[str] = None, turn: Optional[int] = None):
+    """Temporarily set correlation IDs for log records"""
+    tokens = []
+    if room is not None:
+        tokens.append((_room_var, _room_var.set(room)))
+    if turn is not None:
+        tokens.append((_turn_var, _turn_var.set(turn)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+class ContextFilter(logging.Filter):
+    """Attach room/turn correlation IDs to every record"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.room = _room_var.get()
+        record.turn = _turn_var.get()
+        return True
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only resolve the message here; full formatting happens on the listener thread.
+        # Copy first: other handlers (e.g. pytest's caplog) still see the original record
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class TextFormatter(logging.Formatter):
+    """Plain text format with correlation IDs when present"""
+
+    def __init__(self):
+        super().__init__(
+            fmt="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S"
+        )
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        room = getattr(record, "room", None)
+        if room:
+            turn = getattr(record, "turn", None)
+            prefix = f"[{room}" + (f"#{turn}" if turn is not None else "") + "] "
+            date_end = text.index("] ") + 2
+            text = text[:date_end] + prefix + text[date_end:]
+        return text
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line for log aggregation"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "room", None):
+            entry["room"] = record.room
+        if getattr(record, "turn", None) is not None:
+            entry["turn"] = record.turn
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+class LogSampler:
+    """Rate limiter for high-frequency (e.g. per-frame) log statements
+
+    Emits at most one record per ``interval`` seconds and reports how many
+    were suppressed in between.
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float = 5.0):
+        self.logger = logger
+        self.interval = interval
+        self._next = 0.0
+        self.suppressed = 0
+
+    def log(self, level: int, msg: str, *args) -> None:
+        """Log if the interval has elapsed, otherwise count and skip"""
+        if not self.logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        if now < self._next:
+            self.suppressed += 1
+            return
+        if self.suppressed:
+            msg = f"{msg} (+{self.suppressed} suppressed)"
+        self.suppressed = 0
+        self._next = now + self.interval
+        self.logger.log(level, msg, *args)
+
+    def debug(self, msg: str, *args) -> None:
+        self.log(logging.DEBUG, msg, *args)
+
+    def info(self, msg: str, *args) -> None:
+        self.log(logging.INFO, msg, *args)
+
+def get_dropped_log_records() -> int:
+    """Number of log records dropped because the queue was full"""
+    return _queue_handler.dropped if _queue_handler else 0
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def setup_logging(level: Optional[int] = None, log_file: Optional[str] = None,
+                  json_format: Optional[bool] = None, queue_size: int = 10000):
     """Configure logging for the application"""
+    global _listener, _queue_handler
+
+    if level is None:
+        level = logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+    if json_format is None:
+        json_format = os.getenv("LOG_FORMAT", "text").lower() == "json"
+
+    root = logging.getLogger()
+    root.setLevel(level)
+
+    # Already configured: the listener keeps running
+    if _listener is not None:
+        return logging.getLogger(__name__)
+
+    formatter = JsonFormatter() if json_format else TextFormatter()
     handlers = [logging.StreamHandler(sys.stdout)]
-    
+
     if log_file:
         handlers.append(logging.FileHandler(log_file))
-    
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        handlers=handlers
-    )
-    
+
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # Producers only enqueue; the listener thread does formatting and I/O
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    _queue_handler = DroppingQueueHandler(log_queue)
+    _queue_handler.addFilter(ContextFilter())
+    root.addHandler(_queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
     # Reduce verbose logging from libraries
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     logging.getLogger("httpx").setLevel(logging.WARNING)
-    
+
     logger = logging.getLogger(__name__)
     logger.info("Logging configured")
-    
-    return logger 
\ No newline at end of file
+
+    return logger
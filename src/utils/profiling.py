@@ -0,0 +1,268 @@
+"""
+Runtime diagnostics for the Voice Agent.
+
+Every room shares one asyncio loop, so a single blocking call stalls all of
+them. ``LoopLagMonitor`` keeps a heartbeat on the loop and a watchdog
+thread beside it: when the heartbeat is late, the watchdog snapshots the
+loop thread's stack while it is still blocked, which points straight at
+the offending callback.
+
+``sample_stacks`` is a time-boxed sampling profiler for the live process.
+It reads every thread's frames at a fixed interval and aggregates them
+into collapsed stacks (``frame;frame;frame count``), the input format of
+flamegraph.pl, speedscope and similar tools.
+
+``MemoryTracker`` accounts Python allocations with tracemalloc: the biggest
+allocation sites, and growth since a baseline snapshot. Memory that keeps
+growing as interviews start and end is garbage retained between them.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Only one sampling session at a time; sampling is not free
+_profile_lock = threading.Lock()
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+def _stack_labels(frame, limit: int = 64) -> List[str]:
+    """Frame labels from outermost to innermost"""
+    labels = []
+    while frame is not None and len(labels) < limit:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+class LoopLagMonitor:
+    """Detects event loop stalls and captures the stack that caused them"""
+
+    def __init__(self, threshold: float = 0.1, interval: float = 0.05, max_events: int = 50):
+        self.threshold = threshold
+        self.interval = interval
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.recent_lag = 0.0  # exponentially smoothed, for load reporting
+        self.stalls = 0
+        self.beats = 0
+        self._last_beat = 0.0
+        self._loop_thread_id: Optional[int] = None
+        self._stall_stack: Optional[List[str]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start monitoring the running loop (call from within the loop)"""
+        if self.is_running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"⏱️ Loop lag monitor started (threshold {self.threshold * 1000:.0f} ms)")
+
+    async def stop(self) -> None:
+        """Stop the heartbeat and the watchdog thread"""
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog:
+            await asyncio.to_thread(self._watchdog.join, 1.0)
+            self._watchdog = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_beat = now
+            self.beats += 1
+            lag = max(0.0, now - expected)
+            self.total_lag += lag
+            self.recent_lag += 0.1 * (lag - self.recent_lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.threshold:
+                self._record_stall(lag)
+
+    def _record_stall(self, lag: float) -> None:
+        self.stalls += 1
+        stack = self._stall_stack or []
+        self._stall_stack = None
+        self.events.append({
+            "ts": time.time(),
+            "lag_ms": round(lag * 1000, 1),
+            "stack": stack,
+        })
+        logger.warning("🐢 Event loop blocked for %.0f ms in %s", lag * 1000,
+                       stack[-1] if stack else "unknown")
+
+    def _watch(self) -> None:
+        """Watchdog thread: snapshot the loop thread while it is blocked"""
+        while not self._stopped.wait(self.interval):
+            overdue = time.monotonic() - self._last_beat - self.interval
+            if overdue >= self.threshold and self._stall_stack is None:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    self._stall_stack = _stack_labels(frame)
+
+    def stats(self) -> Dict[str, Any]:
+        """Lag counters and recent stalls with their stacks"""
+        return {
+            "running": self.is_running,
+            "threshold_ms": round(self.threshold * 1000, 1),
+            "beats": self.beats,
+            "stalls": self.stalls,
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "mean_lag_ms": round(self.total_lag / self.beats * 1000, 2) if self.beats else 0.0,
+            "recent_lag_ms": round(self.recent_lag * 1000, 2),
+            "recent": list(self.events),
+        }
+
+def sample_stacks(duration: float, interval: float = 0.005,
+                  all_threads: bool = True) -> Counter:
+    """Sample thread stacks for ``duration`` seconds (blocking; run in a thread)
+
+    Returns a counter of collapsed stacks, each prefixed with its thread name.
+    Raises RuntimeError if another sampling session is already running.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise RuntimeError("A profiling session is already running")
+    try:
+        own_id = threading.get_ident()
+        main_id = threading.main_thread().ident
+        counts: Counter = Counter()
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (not all_threads and thread_id != main_id):
+                    continue
+                labels = [names.get(thread_id, str(thread_id))] + _stack_labels(frame)
+                counts[";".join(label.replace(";", ":") for label in labels)] += 1
+            time.sleep(interval)
+        return counts
+    finally:
+        _profile_lock.release()
+
+def format_collapsed(counts: Counter) -> str:
+    """Render sampled stacks in collapsed format, hottest first"""
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+class MemoryTracker:
+    """tracemalloc-based accounting of Python allocations
+
+    Tracing slows every allocation, so it only runs when started with a
+    positive frame count. A baseline snapshot is taken on start.
+    """
+
+    def __init__(self, frames: int = 0):
+        self.frames = frames
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._baseline_at = 0.0
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self) -> None:
+        """Start tracing (no-op when disabled or already tracing)"""
+        if self.frames <= 0 or self.tracing:
+            return
+        tracemalloc.start(self.frames)
+        self.reset_baseline()
+        logger.info(f"🧮 Tracing allocations ({self.frames} frames per traceback)")
+
+    def stop(self) -> None:
+        """Stop tracing and drop the baseline"""
+        if self.tracing:
+            tracemalloc.stop()
+        self._baseline = None
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+    def reset_baseline(self) -> None:
+        """Measure growth from now on"""
+        self._baseline = self._snapshot()
+        self._baseline_at = time.time()
+
+    def report(self, limit: int = 10) -> Dict[str, Any]:
+        """Traced totals, top allocation sites and top growth since the baseline
+
+        Taking a snapshot walks every traced block: blocking, run in a thread.
+        """
+        if not self.tracing:
+            return {"tracing": False}
+        snapshot = self._snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+
+        def site(stat) -> str:
+            frame = stat.traceback[0]
+            return f"{frame.filename}:{frame.lineno}"
+
+        top = snapshot.statistics("lineno")[:limit]
+        growth = []
+        baseline_bytes = 0
+        if self._baseline is not None:
+            baseline_bytes = sum(stat.size for stat in self._baseline.statistics("filename"))
+            growth = [stat for stat in snapshot.compare_to(self._baseline, "lineno")
+                      if stat.size_diff > 0][:limit]
+        return {
+            "tracing": True,
+            "frames": tracemalloc.get_traceback_limit(),
+            "current_bytes": current,
+            "peak_bytes": peak,
+            "growth_bytes": sum(stat.size for stat in snapshot.statistics("filename")) - baseline_bytes,
+            "baseline_ts": self._baseline_at,
+            "top": [{"site": site(stat), "bytes": stat.size, "blocks": stat.count} for stat in top],
+            "growth": [{"site": site(stat), "bytes": stat.size_diff, "blocks": stat.count_diff}
+                       for stat in growth],
+        }
+
+# Global monitor instance for the process
+_monitor: Optional[LoopLagMonitor] = None
+
+def get_loop_monitor(config=None) -> LoopLagMonitor:
+    """Get the process-wide loop lag monitor"""
+    global _monitor
+    if _monitor is None:
+        threshold = config.loop_lag_threshold_ms / 1000 if config else 0.1
+        _monitor = LoopLagMonitor(threshold=threshold)
+    return _monitor
+
+_memory: Optional[MemoryTracker] = None
+
+def get_memory_tracker(config=None) -> MemoryTracker:
+    """Get the process-wide memory tracker"""
+    global _memory
+    if _memory is None:
+        _memory = MemoryTracker(frames=config.tracemalloc_frames if config else 0)
+    return _memory
@@ -0,0 +1,186 @@
+"""
+Session recording for the Voice Agent.
+
+Audio and transcript events are handed to a bounded queue from the event
+loop and written by a background thread, so recording never blocks the
+turn loop. When the writer falls behind, new items are dropped and counted
+rather than applying backpressure to the room.
+
+Each room gets a directory containing:
+    inbound-0000.wav ...   candidate audio, mu-law WAV segments
+    outbound-0000.wav ...  agent speech, mu-law WAV (compressed formats such
+                           as the provider's MP3 are kept as they are)
+    transcript.jsonl       one JSON object per turn event
+"""
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from typing import Any, Dict, Optional
+import numpy as np
+from src.utils.audio import read_wav_samples, write_mulaw_wav
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+def _sniff_extension(path: str) -> str:
+    """Guess an audio file's extension from its header"""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(4)
+    except OSError:
+        return "bin"
+    if header.startswith(b"RIFF"):
+        return "wav"
+    if header.startswith(b"OggS"):
+        return "ogg"
+    if header.startswith(b"ID3") or header[:1] == b"\xff":
+        return "mp3"
+    return "bin"
+
+class SessionRecorder:
+    """Records one room's audio and transcript off the event loop"""
+
+    def __init__(self, room_name: str, output_dir: str, max_queue: int = 2000,
+                 segment_seconds: int = 30, sample_rate: int = 16000):
+        self.room_name = room_name
+        self.directory = os.path.join(output_dir, room_name)
+        self.sample_rate = sample_rate
+        self.segment_samples = segment_seconds * sample_rate
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._turn = 0
+        self.dropped = 0
+        self.written_segments = 0
+
+        # Writer thread state
+        self._pending: list = []
+        self._pending_samples = 0
+        self._inbound_index = 0
+        self._outbound_index = 0
+        self._transcript = None
+
+    def start(self) -> None:
+        """Start the background writer thread"""
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name=f"recorder-{self.room_name}",
+                                        daemon=True)
+        self._thread.start()
+        logger.info(f"⏺️ Recording room {self.room_name} to {self.directory}")
+
+    def _offer(self, item: Any) -> bool:
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def record_audio(self, samples) -> bool:
+        """Queue a frame of inbound int16 audio; returns False if it was dropped"""
+        # Copy: callers pass reused buffers and ring buffer views
+        return self._offer(("audio", np.array(samples, dtype=np.int16, copy=True)))
+
+    def record_file(self, path: str) -> bool:
+        """Hand over an outbound audio file; the recorder owns it if this returns True"""
+        return self._offer(("file", path))
+
+    def record_speech(self, samples, sample_rate: int) -> bool:
+        """Queue played int16 agent speech; returns False if it was dropped"""
+        return self._offer(("speech", (np.array(samples, dtype=np.int16, copy=True), sample_rate)))
+
+    def record_turn(self, role: str, text: str, **fields: Any) -> bool:
+        """Queue a transcript event"""
+        self._turn += 1
+        event: Dict[str, Any] = {
+            "ts": time.time(),
+            "room": self.room_name,
+            "turn": self._turn,
+            "role": role,
+            "text": text,
+        }
+        event.update(fields)
+        return self._offer(("turn", event))
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush queued items and stop the writer thread (blocking; call off the loop)"""
+        if not self._thread:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning(f"Recorder for {self.room_name} did not drain in time")
+        self._thread.join(timeout)
+        self._thread = None
+        if self.dropped:
+            logger.warning(f"Recorder for {self.room_name} dropped {self.dropped} items")
+
+    def _run(self) -> None:
+        """Writer thread: drain the queue until stopped"""
+        self._transcript = open(os.path.join(self.directory, "transcript.jsonl"), "a",
+                                encoding="utf-8")
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                try:
+                    self._write(item)
+                except Exception as e:
+                    logger.error(f"Recording write error: {e}")
+        finally:
+            self._flush_inbound()
+            self._transcript.close()
+
+    def _write(self, item) -> None:
+        kind, payload = item
+        if kind == "audio":
+            self._pending.append(payload)
+            self._pending_samples += len(payload)
+            if self._pending_samples >= self.segment_samples:
+                self._flush_inbound()
+        elif kind == "file":
+            extension = _sniff_extension(payload)
+            if extension == "wav":
+                # Uncompressed playback WAVs are stored as mu-law, like inbound audio
+                samples, sample_rate = read_wav_samples(payload)
+                write_mulaw_wav(self._outbound_path("wav"), samples, sample_rate)
+                os.unlink(payload)
+            else:
+                shutil.move(payload, self._outbound_path(extension))
+        elif kind == "speech":
+            samples, sample_rate = payload
+            write_mulaw_wav(self._outbound_path("wav"), samples, sample_rate)
+        elif kind == "turn":
+            self._transcript.write(json.dumps(payload) + "\n")
+            self._transcript.flush()
+
+    def _outbound_path(self, extension: str) -> str:
+        target = os.path.join(self.directory, f"outbound-{self._outbound_index:04d}.{extension}")
+        self._outbound_index += 1
+        self.written_segments += 1
+        return target
+
+    def _flush_inbound(self) -> None:
+        if not self._pending:
+            return
+        samples = np.concatenate(self._pending)
+        self._pending = []
+        self._pending_samples = 0
+        target = os.path.join(self.directory, f"inbound-{self._inbound_index:04d}.wav")
+        write_mulaw_wav(target, samples, self.sample_rate)
+        self._inbound_index += 1
+        self.written_segments += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Recording counters"""
+        return {
+            "queued": self._queue.qsize(),
+            "dropped": self.dropped,
+            "segments": self.written_segments,
+            "turns": self._turn,
+        }
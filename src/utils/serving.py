@@ -0,0 +1,65 @@
+"""
+Server launch profiles for the Voice Agent API.
+
+``dev`` keeps the previous behaviour: one process, file-watch reload.
+``production`` runs shared-nothing worker processes on uvloop and the
+httptools HTTP parser, with tuned keep-alive and listen backlog. It starts
+one worker unless told otherwise: admission limits, ``MAX_ACTIVE_ROOMS`` and
+the agent pool are per process, so N workers offer N times each of them. uvloop,
+httptools and orjson are optional (``pip install "uvicorn[standard]" orjson``);
+each falls back to the stdlib implementation when it is not installed.
+"""
+import importlib.util
+import logging
+import os
+from typing import Any, Dict, Optional, Type
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+PROFILES = ("dev", "production")
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+def fast_json_response_class() -> Type[JSONResponse]:
+    """ORJSONResponse when orjson is installed, otherwise the stdlib JSONResponse"""
+    if _installed("orjson"):
+        from fastapi.responses import ORJSONResponse
+        return ORJSONResponse
+    return JSONResponse
+
+def uvicorn_options(profile: str = "dev", port: Optional[int] = None,
+                    workers: Optional[int] = None) -> Dict[str, Any]:
+    """Keyword arguments for ``uvicorn.run`` for a serving profile"""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown serving profile: {profile} (expected one of {', '.join(PROFILES)})")
+
+    options: Dict[str, Any] = {
+        "host": os.getenv("HOST", "0.0.0.0"),
+        "port": port or int(os.getenv("PORT", "8000")),
+    }
+    if profile == "dev":
+        options["reload"] = True
+        return options
+
+    loop = "uvloop" if _installed("uvloop") else "asyncio"
+    http = "httptools" if _installed("httptools") else "h11"
+    if loop == "asyncio" or http == "h11":
+        logger.warning(f"⚠️ Production profile without uvloop/httptools (using {loop}/{http}); "
+                       f"install uvicorn[standard] for full speed")
+
+    options.update(
+        loop=loop,
+        http=http,
+        workers=workers or int(os.getenv("WEB_CONCURRENCY", "1")),
+        # Outlive typical load balancer idle timeouts (60s) so the proxy closes first
+        timeout_keep_alive=int(os.getenv("KEEPALIVE_TIMEOUT", "75")),
+        backlog=int(os.getenv("BACKLOG", "2048")),
+        access_log=os.getenv("ACCESS_LOG", "false").lower() == "true",
+        proxy_headers=True,
+    )
+    if options["workers"] > 1:
+        logger.info(f"🧮 {options['workers']} workers: per-process limits (admission, MAX_ACTIVE_ROOMS, "
+                    f"AGENT_POOL_SIZE) apply to each worker")
+    return options
@@ -0,0 +1,89 @@
+"""
+Startup import profiling for the Voice Agent.
+
+Runs ``python -X importtime`` in a fresh interpreter so the numbers reflect
+a cold start, then reports what the entry module pulls in eagerly and what
+the lazily loaded provider SDKs would cost on first use.
+"""
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+# Run from the repository root so ``src`` is importable
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@dataclass
+class ImportEntry:
+    """One line of ``-X importtime`` output"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+def _parse_importtime(stderr: str) -> List[ImportEntry]:
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        if line.count("|") < 2:
+            continue
+        head, cumulative, name = line.split("|", 2)
+        self_us = int(head.replace("import time:", "").strip())
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append(ImportEntry(name.strip(), self_us, int(cumulative.strip()), depth))
+    return entries
+
+def profile_imports(module: str) -> Tuple[List[ImportEntry], Dict[str, float]]:
+    """Import a module cold, returning its import entries and deferred SDK load times"""
+    code = (
+        "import json\n"
+        f"import {module}\n"
+        "from src.utils.lazy import get_lazy_load_times, get_lazy_modules\n"
+        "for lazy in get_lazy_modules():\n"
+        "    lazy._load()\n"
+        "from src.utils.logging import stop_logging\n"
+        "stop_logging()  # flush the log thread so it can't interleave with the report\n"
+        "print(json.dumps(get_lazy_load_times()))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=_PROJECT_ROOT
+    )
+    entries = _parse_importtime(result.stderr)
+
+    # importtime prints a module when it finishes; the entry module's imports
+    # are the lines between the previous top-level import and its own line
+    end = next((i for i, e in enumerate(entries) if e.depth == 0 and e.module == module), None)
+    if end is None:
+        raise RuntimeError(f"Could not profile {module}: {result.stderr.strip()[-500:]}")
+    start = end
+    while start > 0 and entries[start - 1].depth > 0:
+        start -= 1
+
+    deferred = {}
+    output = result.stdout.strip().splitlines()
+    if output:
+        try:
+            deferred = json.loads(output[-1])
+        except json.JSONDecodeError:
+            pass
+    return entries[start:end + 1], deferred
+
+def format_startup_report(module: str, top: int = 15) -> str:
+    """Human readable import cost report for an entry module"""
+    eager, deferred = profile_imports(module)
+    eager_total = eager[-1].cumulative_us
+
+    lines = [f"Startup import profile for {module}: {eager_total / 1000:.1f} ms", "",
+             "  cumulative        self  module"]
+    heaviest = sorted((e for e in eager if e.depth == 1), key=lambda e: e.cumulative_us, reverse=True)
+    for entry in heaviest[:top]:
+        lines.append(f"  {entry.cumulative_us / 1000:8.1f} ms {entry.self_us / 1000:8.1f} ms  {entry.module}")
+
+    lines += ["", f"Deferred until first use: {sum(deferred.values()) * 1000:.1f} ms"]
+    for name, seconds in sorted(deferred.items(), key=lambda item: item[1], reverse=True):
+        lines.append(f"  {seconds * 1000:8.1f} ms  {name}")
+    return "\n".join(lines)
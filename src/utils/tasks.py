@@ -0,0 +1,145 @@
+"""
+Supervised background tasks.
+
+A bare ``asyncio.create_task`` from an event callback leaves the task
+referenced only weakly by the loop: it can be garbage-collected mid-flight,
+outlive the room that started it, or be started twice when the callback
+fires again. A ``TaskSupervisor`` owns every task of one room, TaskGroup
+style:
+
+- it holds a strong reference until the task finishes, and logs failures
+- tasks spawned under a key are deduplicated: while one runs, spawning the
+  same key returns it, or replaces it with ``replace=True``
+- ``close()`` cancels everything and waits; tasks that ignore cancellation
+  are counted as leaked, and nothing can be spawned afterwards
+
+Open supervisors are listed by ``supervisor_stats()`` for the admin API.
+"""
+import asyncio
+import logging
+import time
+import weakref
+from collections import Counter
+from typing import Any, Coroutine, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Every open supervisor in the process, and counters of closed ones
+_supervisors: "weakref.WeakSet[TaskSupervisor]" = weakref.WeakSet()
+_closed = {"supervisors": 0, "leaked": 0}
+
+class TaskSupervisor:
+    """Owns, deduplicates and cancels the background tasks of one room"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.created_at = time.monotonic()
+        self._tasks: Set[asyncio.Task] = set()
+        self._keyed: Dict[str, asyncio.Task] = {}
+        self.closed = False
+        self.spawned = 0
+        self.failed = 0
+        self.refused = 0
+        self.leaked = 0
+        _supervisors.add(self)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def spawn(self, coro: Coroutine, name: str = "", key: Optional[str] = None,
+              replace: bool = False) -> Optional[asyncio.Task]:
+        """Run a coroutine as a task of this supervisor
+
+        With a ``key``, a task already running under it is returned (and the
+        coroutine discarded) unless ``replace`` cancels it first. Returns
+        None once the supervisor is closed.
+        """
+        if self.closed:
+            coro.close()
+            self.refused += 1
+            logger.debug(f"{self.name}: not starting {name or key} after close")
+            return None
+        if key is not None:
+            running = self._keyed.get(key)
+            if running is not None and not running.done():
+                if not replace:
+                    coro.close()
+                    return running
+                running.cancel()
+        task = asyncio.create_task(coro, name=f"{self.name}:{name or key or 'task'}")
+        self._tasks.add(task)
+        if key is not None:
+            self._keyed[key] = task
+        task.add_done_callback(self._finished)
+        self.spawned += 1
+        return task
+
+    def get(self, key: str) -> Optional[asyncio.Task]:
+        """Latest task spawned under a key, running or finished"""
+        return self._keyed.get(key)
+
+    def cancel(self, key: str) -> bool:
+        """Cancel the task running under a key; False if none is"""
+        task = self._keyed.get(key)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        return True
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self.failed += 1
+            logger.error(f"Task {task.get_name()} failed: {error!r}")
+
+    async def close(self, timeout: float = 5.0) -> int:
+        """Cancel every task and wait for them; returns how many were cancelled
+
+        The calling task is never cancelled, so a room's own task may close it.
+        """
+        if self.closed:
+            return 0
+        self.closed = True
+        current = asyncio.current_task()
+        tasks = [task for task in self._tasks if task is not current and not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            if pending:
+                self.leaked += len(pending)
+                _closed["leaked"] += len(pending)
+                logger.warning(f"{self.name}: {len(pending)} tasks ignored cancellation: "
+                               f"{', '.join(sorted(task.get_name() for task in pending))}")
+        _closed["supervisors"] += 1
+        _supervisors.discard(self)
+        return len(tasks)
+
+    def stats(self) -> Dict[str, Any]:
+        """Running tasks by name and lifetime counters"""
+        running = Counter(task.get_name().rsplit(":", 1)[-1] for task in self._tasks if not task.done())
+        return {
+            "name": self.name,
+            "age_s": round(time.monotonic() - self.created_at, 1),
+            "running": sum(running.values()),
+            "tasks": dict(running),
+            "spawned": self.spawned,
+            "failed": self.failed,
+            "refused": self.refused,
+        }
+
+def supervisor_stats() -> Dict[str, Any]:
+    """Every open supervisor's tasks, and totals including closed supervisors"""
+    supervisors: List[TaskSupervisor] = sorted(_supervisors, key=lambda s: s.created_at)
+    rooms = [supervisor.stats() for supervisor in supervisors]
+    return {
+        "open": len(rooms),
+        "running": sum(room["running"] for room in rooms),
+        "closed": _closed["supervisors"],
+        "leaked": _closed["leaked"],
+        "all_tasks": len(asyncio.all_tasks()),
+        "rooms": rooms,
+    }
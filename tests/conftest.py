@@ -6,7 +6,7 @@ import pytest
 import asyncio
 from typing import Generator
 from fastapi.testclient import TestClient
-from src.config import AgentConfig
+from src.config import AgentConfig, get_config
 from src.main import app
 from src.services import (
     SpeechToTextService, 
@@ -21,6 +21,12 @@ def test_client() -> Generator:
     with TestClient(app) as client:
         yield client
 
+@pytest.fixture
+def admin_headers(monkeypatch) -> dict:
+    """Configure an admin token and return the headers that carry it"""
+    monkeypatch.setattr(get_config(), "admin_token", "test-admin-token")
+    return {"X-Admin-Token": "test-admin-token"}
+
 @pytest.fixture
 def test_config() -> AgentConfig:
     """Create a test configuration"""
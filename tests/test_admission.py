@@ -0,0 +1,99 @@
+"""
+Tests for admission control and rate limiting.
+"""
+import asyncio
+import pytest
+from src.main import app
+from src.api.endpoints import get_interview_manager
+from src.utils.admission import (
+    AdmissionController,
+    AdmissionRejected,
+    Priority,
+    TokenBucket
+)
+
+def test_token_bucket_reserve():
+    """Test token bucket grants burst then asks callers to wait"""
+    bucket = TokenBucket(rate=10.0, capacity=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+
+    wait = bucket.reserve()
+    assert 0.05 < wait <= 0.11
+
+    bucket.refund()
+    assert bucket.available >= 0
+
+@pytest.mark.asyncio
+async def test_controller_bounds_concurrency():
+    """Test that no more than max_concurrency calls run at once"""
+    controller = AdmissionController("test", max_concurrency=2, queue_budget=5.0,
+                                     initial_service_time=0.01)
+    running = 0
+    peak = 0
+
+    async def call():
+        nonlocal running, peak
+        async with controller.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    assert peak == 2
+    assert controller.active == 0
+    assert controller.admitted == 6
+
+@pytest.mark.asyncio
+async def test_controller_serves_realtime_first():
+    """Test that realtime waiters are admitted ahead of earlier REST waiters"""
+    controller = AdmissionController("test", max_concurrency=1, queue_budget=5.0,
+                                     initial_service_time=0.01)
+    order = []
+
+    async def call(name, priority):
+        async with controller.slot(priority):
+            order.append(name)
+
+    await controller.acquire()
+    rest = asyncio.create_task(call("rest", Priority.INTERACTIVE))
+    await asyncio.sleep(0)
+    live = asyncio.create_task(call("live", Priority.REALTIME))
+    await asyncio.sleep(0)
+
+    controller.release()
+    await asyncio.gather(rest, live)
+
+    assert order == ["live", "rest"]
+
+@pytest.mark.asyncio
+async def test_controller_rejects_over_budget():
+    """Test fast rejection when the queue exceeds the latency budget"""
+    controller = AdmissionController("test", max_concurrency=1, queue_budget=0.5,
+                                     initial_service_time=1.0)
+    await controller.acquire()
+
+    with pytest.raises(AdmissionRejected) as exc_info:
+        await controller.acquire(Priority.INTERACTIVE)
+
+    assert exc_info.value.retry_after >= 1.0
+    assert exc_info.value.retry_after_header == "1"
+    assert controller.rejected == 1
+    controller.release()
+
+def test_overload_returns_503(test_client):
+    """Test that admission rejection surfaces as 503 with Retry-After"""
+    class OverloadedManager:
+        async def generate_response(self, user_input=""):
+            raise AdmissionRejected("llm", 2.5)
+
+    app.dependency_overrides[get_interview_manager] = lambda: OverloadedManager()
+    try:
+        response = test_client.post("/api/v1/interview/generate", params={"user_input": "hi"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
@@ -0,0 +1,44 @@
+"""
+Tests for the warm agent pool.
+"""
+import pytest
+from src.agent import AgentPool, LiveKitRoomManager
+
+@pytest.fixture
+def warm_stub(monkeypatch):
+    """Make agent initialization instant and offline"""
+    async def fake_initialize(self):
+        self.is_initialized = True
+        self._prerendered[self.interview_manager.questions[0]] = "/tmp/welcome.wav"
+        return True
+    monkeypatch.setattr(LiveKitRoomManager, "initialize", fake_initialize)
+    monkeypatch.setattr(LiveKitRoomManager, "release_prerendered", lambda self: None)
+
+@pytest.mark.asyncio
+async def test_pool_warms_and_assigns(test_config, warm_stub):
+    """Test that the pool hands out initialized agents bound to the room"""
+    pool = AgentPool(test_config, size=2)
+    await pool.start()
+    await pool._refill_task
+
+    assert pool.idle_count == 2
+
+    agent = await pool.acquire("interview-123")
+    assert agent.is_initialized
+    assert agent.config.room_name == "interview-123"
+    assert test_config.room_name == "test-room"
+    assert pool.stats()["hits"] == 1
+
+    await pool._refill_task
+    assert pool.idle_count == 2
+    await pool.stop()
+
+@pytest.mark.asyncio
+async def test_pool_miss_builds_agent(test_config, warm_stub):
+    """Test that an empty pool still returns a (cold) agent"""
+    pool = AgentPool(test_config, size=0)
+    agent = await pool.acquire("interview-456")
+
+    assert not agent.is_initialized
+    assert agent.config.room_name == "interview-456"
+    assert pool.stats()["misses"] == 1
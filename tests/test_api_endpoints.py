@@ -1,10 +1,16 @@
 """
 Tests for the API endpoints.
 """
+import asyncio
 import json
 import pytest
 import base64
 from fastapi.testclient import TestClient
+from src.agent import RoomScheduler
+from src.agent.room_scheduler import RoomUnavailable
+from src.api import endpoints
+from src.config import get_config
+from src.main import app
 from src.utils.audio import create_silent_wav, convert_wav_to_base64
 
 def test_health_endpoint(test_client):
@@ -88,4 +94,107 @@ def test_transcribe_endpoint(test_client):
     if response.status_code == 200:
         data = response.json()
         assert "text" in data
-        assert "confidence" in data 
\ No newline at end of file
+        assert "confidence" in data
+
+def test_room_allocation(test_client, test_config):
+    """Test rooms are unique per candidate, reused on retry and capped"""
+    started = []
+    async def start_agent(room_name):
+        started.append(room_name)
+        await asyncio.Event().wait()
+    
+    scheduler = RoomScheduler(test_config, capacity=2)
+    app.dependency_overrides[get_config] = lambda: test_config
+    app.dependency_overrides[endpoints.get_agent_starter] = lambda: start_agent
+    app.dependency_overrides[endpoints.get_room_scheduler] = lambda: scheduler
+    try:
+        first = test_client.post("/api/v1/room/create", headers={"Idempotency-Key": "candidate-1"}).json()
+        retry = test_client.post("/api/v1/room/create", headers={"Idempotency-Key": "candidate-1"}).json()
+        second = test_client.post("/api/v1/room/create").json()
+        
+        assert first["room_name"].startswith("test-room-")
+        assert retry["room_name"] == first["room_name"] and retry["reused"]
+        assert second["room_name"] != first["room_name"]
+        # One agent per room, none started for the retry
+        assert len(scheduler) == 2
+        test_client.portal.call(asyncio.sleep, 0.01)
+        assert sorted(started) == sorted([first["room_name"], second["room_name"]])
+        
+        full = test_client.post("/api/v1/room/create")
+        assert full.status_code == 503
+        assert full.headers["Retry-After"] == "5"
+        # Sub-second waits round up rather than down to an immediate retry
+        assert RoomUnavailable("busy", retry_after=0.2).retry_after_header == "1"
+        
+        assert test_client.delete(f"/api/v1/room/{first['room_name']}").status_code == 200
+        assert test_client.delete(f"/api/v1/room/{first['room_name']}").status_code == 404
+        assert test_client.post("/api/v1/room/create").status_code == 200
+        assert scheduler.stats()["rejected"] == 1
+    finally:
+        test_client.portal.call(scheduler.stop)
+        app.dependency_overrides.clear()
+
+@pytest.mark.asyncio
+async def test_agent_disconnected_however_it_ends(monkeypatch):
+    """Test the agent is disconnected after a failed connect and when cancelled mid-connect"""
+    class Agent:
+        def __init__(self, connect):
+            self.connect = connect
+            self.disconnects = 0
+        
+        async def disconnect(self):
+            self.disconnects += 1
+    
+    class Pool:
+        async def acquire(self, room_name):
+            return agent
+    
+    async def refused():
+        return False
+    
+    monkeypatch.setattr(endpoints, "get_agent_pool", lambda: Pool())
+    agent = Agent(refused)
+    await endpoints.start_agent_in_room("room-a")
+    assert agent.disconnects == 1
+    
+    agent = Agent(asyncio.Event().wait)
+    task = asyncio.create_task(endpoints.start_agent_in_room("room-b"))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert agent.disconnects == 1
+
+def test_readiness_and_drain(test_client, admin_headers):
+    """Test draining fails readiness and room creation but not liveness"""
+    # Earlier tests may have stalled the loop (lazy imports), so only check the drain reason
+    assert "draining" not in test_client.get("/ready").json()["reasons"]
+    report = test_client.get("/load").json()
+    assert 0.0 <= report["load"] <= 1.0
+    assert set(report["components"]) == {"rooms", "queues", "loop"}
+    
+    assert test_client.post("/admin/drain", headers=admin_headers).json()["draining"]
+    try:
+        ready = test_client.get("/ready")
+        assert ready.status_code == 503
+        assert "draining" in ready.json()["reasons"]
+        assert test_client.get("/health").json()["status"] == "draining"
+        assert test_client.post("/api/v1/room/create").status_code == 503
+    finally:
+        test_client.post("/admin/resume", headers=admin_headers)
+    assert "draining" not in test_client.get("/ready").json()["reasons"]
+
+def test_admin_closed_without_token(test_client, monkeypatch):
+    """Test admin endpoints refuse requests unless a token is configured or they are opened"""
+    config = get_config()
+    monkeypatch.setattr(config, "admin_token", "")
+    monkeypatch.setattr(config, "admin_open", False)
+    assert test_client.post("/admin/drain").status_code == 403
+    assert test_client.get("/admin/rooms").status_code == 403
+    
+    monkeypatch.setattr(config, "admin_open", True)
+    assert test_client.get("/admin/rooms").status_code == 200
+    
+    monkeypatch.setattr(config, "admin_token", "secret")
+    assert test_client.get("/admin/rooms").status_code == 403
+    assert test_client.get("/admin/rooms", headers={"X-Admin-Token": "secret"}).status_code == 200
@@ -0,0 +1,87 @@
+"""
+Tests for session capture and replay.
+"""
+import asyncio
+import json
+import time
+import numpy as np
+from src.run_replay import ReplayRoomManager
+from src.utils.audio import pcm16_to_wav_bytes
+from src.utils.capture import CaptureReader, SessionCapture
+
+def test_capture_round_trip(tmp_path):
+    """Test frames, calls with payloads and events are written and read back in order"""
+    capture = SessionCapture("room-1", str(tmp_path))
+    capture.start()
+    frame = np.arange(160, dtype=np.int16)
+    assert capture.record_frame(frame.tobytes())
+    assert capture.record_frame(memoryview(frame * 2))
+    capture.record_call("tts", {"voice": "v", "text": "Hi"}, b"RIFFaudio", latency=0.25)
+    capture.record_call("llm", "prompt", latency=4.0, error="timeout")
+    capture.record_event("answer", turn=1, text="Hello")
+    capture.close()
+
+    reader = CaptureReader(str(tmp_path / "room-1"))
+    assert reader.room_name == "room-1"
+    kinds = [event["kind"] for event in reader.events]
+    assert kinds == ["session_start", "frame", "frame", "call", "call", "answer", "session_end"]
+    assert [event["seq"] for event in reader.events] == list(range(1, 8))
+    frames = list(reader.frames())
+    assert np.array_equal(frames[0][1], frame) and np.array_equal(frames[1][1], frame * 2)
+    tts_call, = reader.calls("tts")
+    assert reader.payload(tts_call) == b"RIFFaudio"
+    assert reader.calls("llm")[0]["error"] == "timeout"
+
+def _write_capture(directory, answers, llm_latency):
+    """Hand-written capture: one LLM and one TTS call per turn, a second of audio"""
+    directory.mkdir()
+    (directory / "payloads").mkdir()
+    events = [{"kind": "session_start", "room": "captured", "sample_rate": 16000, "t": 0.0},
+              {"kind": "interview_start", "t": 0.5}]
+    audio = np.full(16000, 1000, dtype=np.int16)
+    for index in range(100):
+        events.append({"kind": "frame", "t": 0.5 + index * 0.01, "offset": index * 160, "samples": 160})
+    (directory / "inbound.pcm").write_bytes(audio.astype("<i2").tobytes())
+    speech = pcm16_to_wav_bytes(np.zeros(4800, dtype=np.int16), 24000)
+    t = 2.0
+    for turn, answer in enumerate(answers, 1):
+        reply = f"Reply {turn}."
+        events.append({"kind": "answer", "t": t, "turn": turn, "text": answer})
+        events.append({"kind": "call", "t": t, "service": "llm", "request": f"prompt {turn}",
+                       "response": reply, "latency": llm_latency, "error": None})
+        payload = f"{turn:06d}.bin"
+        (directory / "payloads" / payload).write_bytes(speech)
+        events.append({"kind": "call", "t": t + llm_latency, "service": "tts",
+                       "request": {"voice": "en-US-AriaNeural", "text": reply},
+                       "latency": 0.4, "error": None, "payload": payload})
+        t += 10.0
+    for seq, event in enumerate(events, 1):
+        event["seq"] = seq
+    (directory / "events.jsonl").write_text("\n".join(json.dumps(e) for e in events) + "\n")
+
+def test_replay_runs_turn_pipeline_at_speed(tmp_path, test_config):
+    """Test a replay answers every captured turn with recorded upstream timing, accelerated"""
+    answers = ["I build APIs in Python", "I use Postgres", "Caching with Redis"]
+    _write_capture(tmp_path / "captured", answers, llm_latency=2.0)
+    speed = 20.0
+
+    room_manager = ReplayRoomManager(test_config, CaptureReader(str(tmp_path / "captured")), speed)
+    room_manager.interview_manager.questions = ["Welcome!", "Q1", "Q2", "Q3", "Closing"]
+    start = time.monotonic()
+    capture = asyncio.run(room_manager.run(str(tmp_path / "replays")))
+    elapsed = time.monotonic() - start
+
+    # Three turns 10 s apart in the capture, ~1.5 s at 20x
+    assert elapsed < 5.0
+    replay = CaptureReader(capture.directory)
+    assert [e["text"] for e in replay.of_kind("answer")] == answers
+    responses = [e["text"] for e in replay.of_kind("response")]
+    assert responses[0] == "Welcome!"
+    # Generated acknowledgment, then the question
+    assert [r.split(" ", 2)[:2] for r in responses[1:]] == [["Reply", f"{turn}."] for turn in (1, 2, 3)]
+    # Every turn waited out the recorded LLM and TTS latency, scaled
+    latencies = replay.turn_latencies()
+    assert [t["turn"] for t in latencies] == [1, 2, 3]
+    assert all(t["latency"] >= (2.0 + 0.4) / speed for t in latencies)
+    # Captured audio went through preprocessing again
+    assert room_manager.inbound_audio.available == 16000
@@ -0,0 +1,43 @@
+"""
+Tests for upstream health tracking.
+"""
+import time
+from src.utils.health import UpstreamHealth
+
+def test_slow_upstream_degrades_and_recovers():
+    """Test high latency marks the upstream degraded until a fast probe succeeds"""
+    health = UpstreamHealth("llm", latency_threshold=1.0, recovery_interval=0.05)
+    health.record_success(0.4)
+    assert not health.is_degraded
+    
+    for _ in range(5):
+        health.record_success(4.0)
+    assert health.is_degraded
+    assert not health.should_try()
+    
+    time.sleep(0.06)
+    assert health.should_try()
+    assert not health.should_try()  # one probe per interval
+    
+    # A slow probe keeps it degraded, a fast one recovers
+    health.record_success(2.0)
+    assert health.is_degraded
+    time.sleep(0.06)
+    assert health.should_try()
+    health.record_success(0.3)
+    assert not health.is_degraded
+    assert health.should_try()
+
+def test_errors_degrade_after_min_samples():
+    """Test the failure rate only counts once enough calls were seen"""
+    health = UpstreamHealth("llm", latency_threshold=1.0, error_threshold=0.5, min_samples=4)
+    health.record_failure()
+    health.record_failure()
+    assert not health.is_degraded
+    
+    health.record_success(0.2)
+    health.record_success(0.2)
+    assert not health.is_degraded  # exactly 50%
+    health.record_failure()
+    assert health.is_degraded
+    assert health.stats()["degraded_count"] == 1
@@ -0,0 +1,204 @@
+"""
+Tests for the LiveKit room's turn playback and reconnects.
+"""
+import asyncio
+import dataclasses
+import numpy as np
+import pytest
+from src.agent import LiveKitRoomManager
+from src.agent import livekit_room
+from src.services import TextToSpeechService
+from src.utils.tasks import supervisor_stats
+
+class _FakeTTS(TextToSpeechService):
+    """Renders each text as 0.1 s of a constant, after a delay"""
+    def __init__(self, config, delay):
+        super().__init__(config)
+        self.delay = delay
+        self.rendered = []
+    
+    async def synthesize_pcm(self, text, voice=None, sample_rate=16000):
+        self.rendered.append(text)
+        await asyncio.sleep(self.delay)
+        return np.full(sample_rate // 10, len(self.rendered), dtype=np.int16)
+
+class _Source:
+    def __init__(self):
+        self.frames = []
+    
+    async def capture_frame(self, frame):
+        self.frames.append(np.frombuffer(frame.data, dtype=np.int16).copy())
+
+@pytest.mark.asyncio
+async def test_question_spliced_after_acknowledgment(test_config):
+    """Test the question rendered during the candidate's turn plays right after the acknowledgment"""
+    tts = _FakeTTS(test_config, delay=0.05)
+    room = LiveKitRoomManager(test_config, tts_service=tts)
+    room.audio_source = _Source()
+    room.playback_rate = 100.0
+    room.interview_manager.question_count = 1
+    candidates = room.interview_manager.next_question_candidates()
+    
+    # Candidate turn: every possible next question renders in the background
+    room.prerender_next_questions()
+    await asyncio.sleep(0.1)
+    assert tts.rendered == candidates
+    
+    start = asyncio.get_running_loop().time()
+    await room.speak_response(["Nice answer.", candidates[-1]])
+    # Only the acknowledgment was rendered on the critical path
+    assert asyncio.get_running_loop().time() - start < 0.1
+    assert tts.rendered[-1] == "Nice answer."
+    
+    frame, = room.audio_source.frames
+    assert len(frame) == 3200
+    assert frame[0] == len(candidates) + 1 and frame[-1] == len(candidates)
+    room.release_question_pcm()
+
+class _FakeRoom:
+    """rtc.Room stand-in whose first ``failures`` connects fail"""
+    failures = 0
+    
+    def __init__(self):
+        self.handlers = {}
+        self.remote_participants = {}
+    
+    def on(self, event):
+        def register(handler):
+            assert event not in self.handlers
+            self.handlers[event] = handler
+            return handler
+        return register
+    
+    async def connect(self, url, token):
+        if _FakeRoom.failures:
+            _FakeRoom.failures -= 1
+            raise ConnectionError("unreachable")
+    
+    async def disconnect(self):
+        pass
+
+@pytest.mark.asyncio
+async def test_reconnect_keeps_services_and_interview(test_config, monkeypatch):
+    """Test a dropped room is rejoined with backoff without re-initializing or restarting the interview"""
+    monkeypatch.setattr(livekit_room.rtc, "Room", _FakeRoom)
+    config = dataclasses.replace(test_config, reconnect_backoff=0.01, reconnect_timeout=2.0)
+    room = LiveKitRoomManager(config, tts_service=_FakeTTS(config, delay=0))
+    sources = []
+    
+    async def setup_audio():
+        room.audio_source = _Source()
+        sources.append(room.audio_source)
+    
+    room.setup_audio = setup_audio
+    room.is_initialized = True
+    assert await room.connect()
+    first = room.room
+    room.interview_manager.question_count = 3
+    
+    # Full drop: the rejoin starts at once and retries past two failures
+    _FakeRoom.failures = 2
+    first.handlers["disconnected"]("network")
+    assert not room.is_connected and not room.connected_event.is_set()
+    assert await room.reconnect()
+    
+    assert room.is_connected and room.connected_event.is_set()
+    assert room.room is not first and set(room.room.handlers) == set(first.handlers)
+    assert room.reconnects == 1 and room.last_reconnect_ms >= 10
+    assert room.interview_manager.question_count == 3
+    assert len(sources) == 2
+    # Events from the dropped room are ignored
+    first.handlers["disconnected"]("late")
+    assert room.is_connected
+    
+    # Speech cut off by an SDK-level resume is played again once resumed
+    async def drop_while_playing(samples, sample_rate, audio_source):
+        room.room.handlers["reconnecting"]()
+        asyncio.get_running_loop().call_later(0.05, room.room.handlers["reconnected"])
+        await audio_source.capture_frame(livekit_room.rtc.AudioFrame(
+            samples.tobytes(), sample_rate, 1, len(samples)))
+        return len(samples) / sample_rate
+    
+    room.tts_service.play_pcm = drop_while_playing
+    room.playback_rate = 100.0
+    await room.play_pcm(np.zeros(1600, dtype=np.int16), "Next question?")
+    assert len(sources[-1].frames) == 2
+    assert room.reconnects == 2
+    
+    await room.disconnect()
+    assert not await room.reconnect()
+
+@pytest.mark.asyncio
+async def test_audio_stream_closed_when_ingest_replaced(test_config, monkeypatch):
+    """Test the inbound audio stream is closed when its ingest task is cancelled"""
+    streams = []
+    
+    class _Stream:
+        def __init__(self, track, sample_rate, num_channels):
+            self.closed = False
+            streams.append(self)
+        
+        def __aiter__(self):
+            return self
+        
+        async def __anext__(self):
+            await asyncio.Event().wait()
+        
+        async def aclose(self):
+            self.closed = True
+    
+    monkeypatch.setattr(livekit_room.rtc, "Room", _FakeRoom)
+    monkeypatch.setattr(livekit_room.rtc, "AudioStream", _Stream)
+    room = LiveKitRoomManager(test_config, tts_service=_FakeTTS(test_config, delay=0))
+    task = asyncio.create_task(room.ingest_audio(None))
+    await asyncio.sleep(0)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    assert [stream.closed for stream in streams] == [True]
+    await room.disconnect()
+
+@pytest.mark.asyncio
+async def test_room_tasks_supervised(test_config, monkeypatch):
+    """Test resubscribed tracks don't pile up handlers and disconnect cancels every room task"""
+    monkeypatch.setattr(livekit_room.rtc, "Room", _FakeRoom)
+    room = LiveKitRoomManager(test_config, tts_service=_FakeTTS(test_config, delay=10))
+    started = []
+    
+    async def run_forever(name):
+        started.append(name)
+        await asyncio.Event().wait()
+    
+    room.ingest_audio = lambda track: run_forever("ingest")
+    room.handle_user_audio = lambda: run_forever("turns")
+    track = type("Track", (), {"kind": livekit_room.rtc.TrackKind.KIND_AUDIO})()
+    candidate = type("Participant", (), {"identity": "candidate"})()
+    
+    subscribed = room.room.handlers["track_subscribed"]
+    subscribed(track, None, candidate)
+    first_ingest = room.tasks.get("ingest")
+    subscribed(track, None, candidate)
+    room.interview_manager.question_count = 1
+    room.prerender_next_questions()
+    await asyncio.sleep(0)
+    
+    # The replaced ingest task was cancelled before it ran
+    assert sorted(started) == ["ingest", "turns"]
+    assert first_ingest.cancelled()
+    stats = room.tasks.stats()
+    assert room._question_pcm
+    # Question renders may be shared with other rooms and are not room tasks
+    assert stats["tasks"] == {"ingest": 1, "turns": 1}
+    renders = list(room._question_pcm.values())
+    assert stats["name"] in [r["name"] for r in supervisor_stats()["rooms"]]
+    
+    running = list(room.tasks._tasks)
+    await room.disconnect()
+    assert all(task.cancelled() for task in running)
+    assert not any(task.cancelled() for task in renders)
+    assert len(room.tasks) == 0
+    assert room.tasks.stats()["name"] not in [r["name"] for r in supervisor_stats()["rooms"]]
+    # Late events from the SDK start nothing
+    subscribed(track, None, candidate)
+    assert room.tasks.refused == 1 and started.count("ingest") == 1
+    for task in renders:
+        task.cancel()
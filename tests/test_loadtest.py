@@ -0,0 +1,55 @@
+"""
+Tests for the load generator and fake providers.
+"""
+import httpx
+import pytest
+from src.main import app
+from src.loadtest import FakeBackendConfig, install_fakes, parse_mix, run_load
+
+@pytest.fixture
+def fake_app():
+    """The API app wired to fast fake providers"""
+    install_fakes(app, FakeBackendConfig(stt_latency_ms=5, llm_latency_ms=5, tts_latency_ms=5,
+                                         agent_start_ms=1))
+    yield app
+    app.dependency_overrides.clear()
+
+@pytest.mark.asyncio
+async def test_load_run_against_fake_providers(fake_app):
+    """Test every scenario succeeds against the fakes and is reported"""
+    report = await run_load("http://loadtest", rps=40, duration=1.0,
+                            mix=parse_mix("transcribe,synthesize,generate,answer,room"),
+                            transport=httpx.ASGITransport(app=fake_app), seed=1)
+
+    assert set(report.scenarios) == {"transcribe", "synthesize", "generate", "answer", "room"}
+    assert report.total.sent > 20
+    assert report.error_rate == 0.0
+    assert report.total.percentile(99) > 0
+    assert "total" in report.format()
+
+@pytest.mark.asyncio
+async def test_injected_failures_are_counted(fake_app):
+    """Test provider failures surface as HTTP errors in the report"""
+    install_fakes(fake_app, FakeBackendConfig(tts_latency_ms=1, failure_rate=1.0))
+    report = await run_load("http://loadtest", rps=20, duration=0.5, mix=parse_mix("synthesize"),
+                            transport=httpx.ASGITransport(app=fake_app), seed=1)
+
+    assert report.error_rate == 1.0
+    assert report.scenarios["synthesize"].statuses[500] == report.total.sent
+
+@pytest.mark.asyncio
+async def test_answer_scenario_reaches_llm(fake_app):
+    """Test answers past the first question pay the fake LLM latency, unlike the opening question"""
+    install_fakes(fake_app, FakeBackendConfig(llm_latency_ms=100, jitter=0.0))
+    report = await run_load("http://loadtest", rps=20, duration=0.5, mix=parse_mix("generate,answer"),
+                            transport=httpx.ASGITransport(app=fake_app), seed=1)
+
+    assert report.error_rate == 0.0
+    assert report.scenarios["answer"].percentile(0) >= 100
+    assert report.scenarios["generate"].percentile(50) < 100
+
+def test_parse_mix_rejects_unknown_scenario():
+    """Test unknown scenario names are rejected"""
+    assert parse_mix("generate=3,room") == {"generate": 3.0, "room": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("upload=1")
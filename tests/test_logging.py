@@ -0,0 +1,58 @@
+"""
+Tests for the queue-based logging pipeline.
+"""
+import json
+import logging
+import queue
+from src.utils.logging import (
+    ContextFilter,
+    DroppingQueueHandler,
+    JsonFormatter,
+    LogSampler,
+    log_context
+)
+
+def _record(msg, *args):
+    return logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, None)
+
+def test_json_formatter_includes_correlation_ids():
+    """Test JSON output carries room and turn from the log context"""
+    record = _record("Turn %d done", 3)
+    with log_context(room="room-1", turn=3):
+        ContextFilter().filter(record)
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["msg"] == "Turn 3 done"
+    assert entry["room"] == "room-1"
+    assert entry["turn"] == 3
+
+def test_queue_handler_drops_when_full():
+    """Test a full log queue drops records instead of blocking"""
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+    for i in range(5):
+        handler.emit(_record("message %d", i))
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+    assert handler.queue.get_nowait().msg == "message 0"
+
+def test_queue_handler_leaves_record_intact():
+    """Test queueing a record does not resolve it for the other handlers"""
+    handler = DroppingQueueHandler(queue.Queue())
+    record = _record("Turn %d done", 3)
+    handler.emit(record)
+
+    assert (record.msg, record.args) == ("Turn %d done", (3,))
+    assert handler.queue.get_nowait().msg == "Turn 3 done"
+
+def test_log_sampler_suppresses_bursts(caplog):
+    """Test sampled logging emits once per interval and counts the rest"""
+    logger = logging.getLogger("test.sampler")
+    sampler = LogSampler(logger, interval=60.0)
+
+    with caplog.at_level(logging.INFO, logger="test.sampler"):
+        for _ in range(100):
+            sampler.info("frame")
+
+    assert len(caplog.records) == 1
+    assert sampler.suppressed == 99
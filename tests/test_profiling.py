@@ -0,0 +1,78 @@
+"""
+Tests for the loop lag monitor and sampling profiler.
+"""
+import asyncio
+import threading
+import time
+from src.utils.profiling import LoopLagMonitor, MemoryTracker, format_collapsed, sample_stacks
+
+def _blocking_call():
+    time.sleep(0.3)
+
+def test_loop_lag_monitor_captures_blocking_stack(event_loop):
+    """Test a blocking call is recorded with the stack that caused it"""
+    monitor = LoopLagMonitor(threshold=0.1, interval=0.02)
+
+    async def scenario():
+        monitor.start()
+        await asyncio.sleep(0.1)
+        _blocking_call()
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+
+    event_loop.run_until_complete(scenario())
+
+    stats = monitor.stats()
+    assert stats["stalls"] == 1
+    assert stats["max_lag_ms"] >= 200
+    assert any("_blocking_call" in frame for frame in stats["recent"][0]["stack"])
+
+def _spin(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+def test_sample_stacks_collapsed_output():
+    """Test the sampler attributes samples to a busy thread"""
+    stop = threading.Event()
+    worker = threading.Thread(target=_spin, args=(stop,), name="busy-worker")
+    worker.start()
+    try:
+        counts = sample_stacks(0.2, interval=0.005)
+    finally:
+        stop.set()
+        worker.join()
+
+    output = format_collapsed(counts)
+    busy = [line for line in output.splitlines() if line.startswith("busy-worker;")]
+    assert busy
+    assert all("_spin (test_profiling.py" in line for line in busy)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in output.splitlines())
+
+def test_memory_tracker_reports_growth():
+    """Test allocations made after the baseline show up as growth at their site"""
+    tracker = MemoryTracker(frames=5)
+    assert tracker.report() == {"tracing": False}
+    tracker.start()
+    try:
+        retained = [bytes(1024) for _ in range(2000)]
+        report = tracker.report(limit=5)
+    finally:
+        tracker.stop()
+    assert report["tracing"] and report["growth_bytes"] >= 2000 * 1024
+    site = report["growth"][0]
+    assert site["site"].startswith(__file__) and site["blocks"] >= 2000
+    assert len(retained) == 2000
+
+def test_admin_endpoints(test_client, admin_headers):
+    """Test the loop lag and profile admin endpoints"""
+    response = test_client.get("/admin/loop-lag", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["running"] is True
+
+    response = test_client.get("/admin/tasks", headers=admin_headers)
+    assert response.status_code == 200
+    assert {"open", "running", "leaked", "rooms"} <= set(response.json()["tasks"])
+
+    response = test_client.get("/admin/profile", params={"seconds": 0.1}, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
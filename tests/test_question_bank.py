@@ -0,0 +1,86 @@
+"""
+Tests for the question bank and pre-rendered question audio.
+"""
+import dataclasses
+import json
+import pytest
+from src.agent import InterviewManager
+from src.agent.question_bank import DEFAULT_BANK_PATH, Question, QuestionBank
+from src.services import TextToSpeechService
+
+def _bank():
+    return QuestionBank.from_questions([
+        Question("a1", "API basics?", "apis", 1),
+        Question("a2", "API design?", "apis", 2, follow_ups=["a2f"]),
+        Question("a2f", "Why that design?", "apis", 2),
+        Question("a4", "API at scale?", "apis", 4),
+        Question("d2", "Databases?", "databases", 2),
+        Question("d3", "Isolation levels?", "databases", 3),
+    ])
+
+def test_bank_loads_lazily(tmp_path):
+    """Test the file is not read until the bank is used"""
+    path = tmp_path / "bank.jsonl"
+    path.write_text(json.dumps({"id": "q", "text": "Why?", "topic": "t"}) + "\n")
+    bank = QuestionBank(str(path))
+    assert bank._questions is None
+    
+    assert len(bank) == 1
+    assert bank.get("q").difficulty == 2
+    assert len(QuestionBank(DEFAULT_BANK_PATH)) > 20
+
+def test_select_nearest_difficulty():
+    """Test selection prefers the exact level, then the easier neighbour"""
+    bank = _bank()
+    assert bank.select("apis", 2).id == "a2"
+    assert bank.select("apis", 3, exclude={"a2", "a2f"}).id == "a4"
+    assert bank.select("apis", 2, exclude={"a2", "a2f"}).id == "a1"
+    assert bank.select("missing", 2) is None
+    assert [q.id for q in bank.plan(3)] == ["a2", "d2", "a2f"]
+
+def test_adaptive_next_question():
+    """Test short answers get follow-ups and long answers raise difficulty"""
+    bank = _bank()
+    current = bank.get("a2")
+    
+    question, difficulty = bank.next_question(current, "Not sure.", {"a2"}, 2, "databases")
+    assert question.id == "a2f"
+    
+    long_answer = " ".join(["word"] * 50)
+    question, difficulty = bank.next_question(current, long_answer, {"a2"}, 2, "databases")
+    assert (question.id, difficulty) == ("d3", 3)
+
+def test_next_question_candidates(lm_service):
+    """Test every question the next answer can lead to is known before it arrives"""
+    bank = _bank()
+    candidates = bank.next_question_candidates(bank.get("a2"), {"a2"}, 2, "databases")
+    assert [q.id for q in candidates] == ["a2f", "d2", "d3"]
+    
+    manager = InterviewManager(lm_service, question_bank=bank)
+    assert manager.next_question_candidates() == []
+    manager.question_count = 1
+    assert manager.next_question_candidates() == ["Why that design?", "Databases?", "Isolation levels?"]
+
+@pytest.mark.asyncio
+async def test_interview_follows_bank(lm_service):
+    """Test the interview asks the adapted question from the bank"""
+    manager = InterviewManager(lm_service, question_bank=_bank())
+    assert manager.questions[0].endswith("API design?")
+    
+    await manager.generate_response()
+    await manager.generate_response("Not sure.")
+    assert manager.last_response_parts[-1] == "Why that design?"
+
+@pytest.mark.asyncio
+async def test_tts_reads_prerendered_store(test_config, tmp_path):
+    """Test stored question audio is served without calling Edge TTS"""
+    config = dataclasses.replace(test_config, tts_audio_store_dir=str(tmp_path))
+    service = TextToSpeechService(config)
+    service.store.put(config.tts_voice, "Stored question?", b"ID3 stored audio")
+    
+    async def fail_render(text, voice):
+        raise AssertionError("Edge TTS should not be called")
+    service._render = fail_render
+    
+    audio, cached = await service.synthesize_bytes("Stored question?")
+    assert audio == b"ID3 stored audio"
@@ -0,0 +1,57 @@
+"""
+Tests for session recording.
+"""
+import json
+import os
+import time
+import numpy as np
+from src.utils.audio import create_silent_wav, read_wav_samples
+from src.utils.recording import SessionRecorder
+
+def test_recorder_writes_segments_and_transcript(tmp_path):
+    """Test audio segments, outbound files and transcript are written"""
+    recorder = SessionRecorder("room-1", str(tmp_path), segment_seconds=1)
+    recorder.start()
+
+    frame = np.full(160, 1000, dtype=np.int16)
+    for _ in range(150):  # 1.5 seconds of 10 ms frames
+        assert recorder.record_audio(frame)
+    recorder.record_turn("agent", "Welcome!")
+    recorder.record_turn("candidate", "Hello", latency_ms=120)
+    outbound = create_silent_wav(200)
+    assert recorder.record_file(outbound)
+    assert recorder.record_speech(np.full(800, 500, dtype=np.int16), 16000)
+    recorder.close()
+
+    room_dir = tmp_path / "room-1"
+    assert sorted(os.listdir(room_dir)) == [
+        "inbound-0000.wav", "inbound-0001.wav", "outbound-0000.wav", "outbound-0001.wav", "transcript.jsonl"
+    ]
+    assert not os.path.exists(outbound)
+    # mu-law segments: one byte per sample plus the header
+    assert os.path.getsize(room_dir / "inbound-0000.wav") < 16000 + 100
+    # Outbound speech is mu-law too, from a PCM16 file or from samples
+    samples, sample_rate = read_wav_samples(str(room_dir / "outbound-0000.wav"))
+    assert (len(samples), sample_rate) == (3200, 16000)
+    assert os.path.getsize(room_dir / "outbound-0000.wav") < 3200 + 100
+    samples, _ = read_wav_samples(str(room_dir / "outbound-0001.wav"))
+    assert len(samples) == 800 and abs(int(samples[0]) - 500) < 20
+
+    lines = (room_dir / "transcript.jsonl").read_text().splitlines()
+    events = [json.loads(line) for line in lines]
+    assert [e["role"] for e in events] == ["agent", "candidate"]
+    assert events[1]["latency_ms"] == 120
+    assert events[1]["turn"] == 2
+
+def test_recorder_drops_instead_of_blocking(tmp_path):
+    """Test a full queue drops items without blocking the caller"""
+    recorder = SessionRecorder("room-2", str(tmp_path), max_queue=5)
+    frame = np.zeros(160, dtype=np.int16)
+
+    start = time.perf_counter()
+    results = [recorder.record_audio(frame) for _ in range(100)]
+    elapsed = time.perf_counter() - start
+
+    assert results.count(True) == 5
+    assert recorder.dropped == 95
+    assert elapsed < 0.05
@@ -0,0 +1,49 @@
+"""
+Tests for the LLM response cache.
+"""
+from src.agent.response_cache import ResponseCache, normalize_answer
+
+QUESTION = "How would you design a rate limiter?"
+
+def test_exact_and_near_matches():
+    """Test normalized answers hit exactly, near matches fuzzily, and other questions miss"""
+    cache = ResponseCache()
+    cache.put(QUESTION, "I've used PostgreSQL a lot in production.", "Great, PostgreSQL is solid. Next...")
+
+    assert normalize_answer("  I've used PostgreSQL!! ") == "ive used postgresql"
+    assert cache.get(QUESTION, "ive used postgresql a lot in production") is not None
+    assert cache.get(QUESTION, "I've used PostgreSQL alot in production") is not None
+    assert cache.get("Tell me about caching.", "I've used PostgreSQL a lot in production") is None
+    assert cache.get(QUESTION, "I've mostly worked with MongoDB") is None
+    # Similar characters, opposite meaning
+    assert cache.get(QUESTION, "I've never used PostgreSQL a lot in production") is None
+
+    stats = cache.stats()
+    assert (stats["exact_hits"], stats["fuzzy_hits"], stats["misses"]) == (1, 1, 3)
+    assert stats["hit_rate"] == 0.4
+
+def test_long_answers_are_not_cached():
+    """Test specific, long answers always go to the model"""
+    cache = ResponseCache()
+    answer = "I would shard the counters by user id and keep a token bucket per shard in Redis with a TTL"
+    cache.put(QUESTION, answer, "Response")
+    assert cache.get(QUESTION, answer) is None
+    assert cache.stats()["entries"] == 0 and cache.stats()["skipped"] == 1
+
+def test_ttl_and_eviction(monkeypatch):
+    """Test entries expire after the TTL and the least recently used are evicted"""
+    import src.agent.response_cache as response_cache
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    cache = ResponseCache(max_entries=2, ttl=60.0)
+    cache.put(QUESTION, "yes", "A")
+    cache.put(QUESTION, "no", "B")
+    assert cache.get(QUESTION, "yes") == "A"
+    cache.put(QUESTION, "not sure", "C")
+    assert cache.get(QUESTION, "no") is None
+    assert cache.stats()["evictions"] == 1
+
+    now[0] += 61.0
+    assert cache.get(QUESTION, "yes") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["entries"] == 1
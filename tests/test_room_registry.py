@@ -0,0 +1,168 @@
+"""
+Tests for the cluster-wide room registry.
+"""
+import asyncio
+import time
+import pytest
+from src.agent import RoomScheduler
+from src.agent.room_registry import InProcessRoomRegistry, RedisRoomRegistry, RoomRegistry
+
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio commands the registry uses (decoded responses)"""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+        self._changed = asyncio.Condition()
+
+    def _get(self, name, default=None):
+        deadline = self.expiry.get(name)
+        if deadline is not None and time.monotonic() >= deadline:
+            self.data.pop(name, None)
+            self.expiry.pop(name, None)
+        return self.data.get(name, default)
+
+    async def hset(self, name, key=None, value=None, mapping=None):
+        fields = self.data.setdefault(name, {})
+        fields.update(mapping or {key: value})
+
+    async def hgetall(self, name):
+        return dict(self._get(name, {}))
+
+    async def set(self, name, value, px=None, nx=False):
+        if nx and self._get(name) is not None:
+            return None
+        self.data[name] = value
+        self.expiry.pop(name, None)
+        if px is not None:
+            self.expiry[name] = time.monotonic() + px / 1000
+        return True
+
+    async def get(self, name):
+        return self._get(name)
+
+    async def delete(self, *names):
+        for name in names:
+            self.data.pop(name, None)
+            self.expiry.pop(name, None)
+
+    async def expire(self, name, seconds):
+        self.expiry[name] = time.monotonic() + seconds
+
+    async def sadd(self, name, member):
+        self.data.setdefault(name, set()).add(member)
+
+    async def srem(self, name, member):
+        self.data.get(name, set()).discard(member)
+
+    async def smembers(self, name):
+        return set(self._get(name, set()))
+
+    async def rpush(self, name, value):
+        self.data.setdefault(name, []).append(value)
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def blpop(self, names, timeout=0):
+        async def pop():
+            async with self._changed:
+                while True:
+                    for name in names:
+                        if self._get(name):
+                            return name, self.data[name].pop(0)
+                    await self._changed.wait()
+        try:
+            return await asyncio.wait_for(pop(), timeout or None)
+        except asyncio.TimeoutError:
+            return None
+
+async def _never_ending_agent(room_name):
+    await asyncio.Event().wait()
+
+def test_incomplete_backend_fails_on_creation():
+    """Test a backend missing registry operations cannot be instantiated"""
+    class Partial(RoomRegistry):
+        async def register(self, record):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial("worker-a")
+
+@pytest.mark.asyncio
+async def test_room_operations_route_to_owning_worker(test_config):
+    """Test a delete or create retry on one worker reaches the room run by another"""
+    redis = FakeRedis()
+    owner = RoomScheduler(test_config, capacity=2, registry=RedisRoomRegistry(redis, "worker-a"))
+    other = RoomScheduler(test_config, capacity=2, registry=RedisRoomRegistry(redis, "worker-b"))
+    await owner.start_registry()
+    await other.start_registry()
+
+    allocation, _ = owner.allocate(_never_ending_agent, idempotency_key="candidate-1")
+    await asyncio.sleep(0)
+    record = await other.registry.lookup(allocation.room_name)
+    assert record.owner == "worker-a" and record.heartbeat is not None
+
+    # A create retry on the other worker gets the same room and candidate identity
+    remote = await other.find_remote("candidate-1")
+    assert (remote.room_name, remote.user_identity) == (allocation.room_name, allocation.user_identity)
+    assert len(other) == 0
+
+    # Deleting on the other worker is forwarded to the owner
+    assert await other.release_anywhere(allocation.room_name)
+    assert allocation.room_name not in owner
+    assert await other.registry.lookup(allocation.room_name) is None
+    assert not await other.release_anywhere(allocation.room_name)
+    assert (other.registry.forwarded, owner.registry.served) == (1, 1)
+
+    await owner.stop_registry()
+    await other.stop_registry()
+
+@pytest.mark.asyncio
+async def test_concurrent_creates_agree_on_one_room(test_config):
+    """Test creates with the same idempotency key racing on two workers allocate a single room"""
+    redis = FakeRedis()
+    workers = [RoomScheduler(test_config, capacity=2, registry=RedisRoomRegistry(redis, f"worker-{i}"))
+               for i in range(2)]
+    for scheduler in workers:
+        await scheduler.registry.heartbeat()
+
+    results = await asyncio.gather(*[scheduler.allocate_anywhere(_never_ending_agent, "candidate-1")
+                                     for scheduler in workers])
+    assert sorted(created for _, created in results) == [False, True]
+    assert len({(room.room_name, room.user_identity) for room, _ in results}) == 1
+    assert sum(len(scheduler) for scheduler in workers) == 1
+    assert len(await workers[0].registry.rooms()) == 1
+
+    for scheduler in workers:
+        await scheduler.stop()
+
+@pytest.mark.asyncio
+async def test_rooms_of_dead_workers_expire(test_config):
+    """Test rooms are expired once their owner stops heartbeating, on both backends"""
+    redis = FakeRedis()
+    dead = RedisRoomRegistry(redis, "worker-a", ttl=0.05)
+    alive = RedisRoomRegistry(redis, "worker-b", ttl=0.05)
+    scheduler = RoomScheduler(test_config, capacity=2, registry=dead)
+    await dead.heartbeat()
+    allocation, _ = scheduler.allocate(_never_ending_agent, idempotency_key="candidate-1")
+    await asyncio.sleep(0)
+    assert await alive.lookup_key("candidate-1") is not None
+
+    # worker-a stops heartbeating without unregistering (crash)
+    await asyncio.sleep(0.1)
+    assert await alive.sweep() == 1
+    assert await alive.rooms() == [] and await alive.lookup_key("candidate-1") is None
+    allocation.task.cancel()
+
+    local = InProcessRoomRegistry("worker-a", ttl=0.05)
+    scheduler = RoomScheduler(test_config, capacity=2, registry=local)
+    await scheduler.start_registry()
+    allocation, _ = scheduler.allocate(_never_ending_agent)
+    await asyncio.sleep(0)
+    assert (await local.lookup(allocation.room_name)).state == "starting"
+    # A worker never expires its own rooms
+    await scheduler.stop_registry()
+    await asyncio.sleep(0.1)
+    assert await local.sweep() == 0
+    assert await scheduler.release(allocation.room_name)
+    assert await local.rooms() == []
@@ -0,0 +1,96 @@
+"""
+Tests for the batch processing CLI.
+"""
+import json
+import numpy as np
+import pytest
+from src.agent.interview_manager import CLOSING
+from src.run_batch import BatchProcessor, decode_recording, discover_items, load_recorded_transcript
+from src.utils.audio import create_silent_wav, read_wav_samples, write_mulaw_wav
+
+@pytest.fixture
+def recordings(tmp_path):
+    """A recordings directory with one recorder room and one plain WAV"""
+    room = tmp_path / "room-a"
+    room.mkdir()
+    write_mulaw_wav(str(room / "inbound-0000.wav"), np.zeros(1600, dtype=np.int16))
+    write_mulaw_wav(str(room / "inbound-0001.wav"), np.zeros(800, dtype=np.int16))
+    (room / "transcript.jsonl").write_text("\n".join(json.dumps(event) for event in [
+        {"role": "agent", "text": "Welcome! How do you index a table?", "question": "Welcome! How do you index a table?"},
+        {"role": "candidate", "text": "I like Postgres"},
+        {"role": "agent", "text": "Nice. How would you shard it?", "question": "How would you shard it?"},
+        {"role": "candidate", "text": "By tenant"},
+        {"role": "agent", "text": CLOSING},
+    ]) + "\n")
+    wav = create_silent_wav(500, sample_rate=22050)
+    (tmp_path / "single.wav").write_bytes(open(wav, "rb").read())
+    return tmp_path
+
+def test_discover_and_decode(recordings):
+    """Test recordings are discovered and decoded to 16 kHz mono"""
+    items = discover_items(str(recordings))
+    assert [item.id for item in items] == ["room-a", "single"]
+    assert len(items[0].audio) == 2
+    assert items[0].transcript.endswith("transcript.jsonl")
+    transcript, asked = load_recorded_transcript(items[0].transcript)
+    assert transcript == "I like Postgres By tenant"
+    assert asked == ["Welcome! How do you index a table?", "How would you shard it?"]
+
+    wav_bytes = decode_recording(items[0].audio)
+    path = recordings / "decoded.wav"
+    path.write_bytes(wav_bytes)
+    samples, sample_rate = read_wav_samples(str(path))
+    assert sample_rate == 16000
+    assert len(samples) == 2400
+
+@pytest.mark.asyncio
+async def test_batch_resumes_from_results(recordings, tmp_path, monkeypatch):
+    """Test results are written per item and completed items are skipped"""
+    results_path = str(tmp_path / "results.jsonl")
+    processor = BatchProcessor(results_path, concurrency=2, decode_workers=1)
+
+    async def fake_transcribe(audio_data, strict=False):
+        return "transcribed"
+
+    prompts = []
+
+    async def fake_generate(prompt, strict=False):
+        prompts.append(prompt)
+        return "Score: 7"
+
+    monkeypatch.setattr(processor.stt_service, "transcribe", fake_transcribe)
+    monkeypatch.setattr(processor.lm_service, "generate_response", fake_generate)
+
+    items = discover_items(str(recordings))
+    await processor.run(items[:1])
+    processor = BatchProcessor(results_path, concurrency=2, decode_workers=1)
+    monkeypatch.setattr(processor.stt_service, "transcribe", fake_transcribe)
+    monkeypatch.setattr(processor.lm_service, "generate_response", fake_generate)
+    await processor.run(items)
+
+    results = [json.loads(line) for line in open(results_path)]
+    assert [r["id"] for r in results] == ["room-a", "single"]
+    assert all(r["status"] == "ok" for r in results)
+    assert results[0]["evaluation"] == "Score: 7"
+    assert results[0]["audio_seconds"] == 0.15
+    # Scored against the questions that were asked, not the default plan
+    assert "- How would you shard it?" in prompts[0]
+    assert CLOSING not in prompts[0]
+
+@pytest.mark.asyncio
+async def test_batch_service_errors_are_retried(recordings, tmp_path, monkeypatch):
+    """Test STT and LLM errors fail the item instead of recording an empty or canned result"""
+    results_path = str(tmp_path / "results.jsonl")
+    processor = BatchProcessor(results_path, concurrency=2, decode_workers=1)
+    processor.stt_service.stt = object()  # recognize() is missing, so transcription fails
+    processor.lm_service.model = object()  # generate_content_async() is missing too
+    items = discover_items(str(recordings))
+    await processor.run(items[:1])
+
+    processor = BatchProcessor(results_path, concurrency=2, decode_workers=1, mode="score")
+    processor.lm_service.model = object()
+    await processor.run(items[:1])
+
+    results = [json.loads(line) for line in open(results_path)]
+    assert [r["status"] for r in results] == ["error", "error"]
+    assert "recognize" in results[0]["error"] and "generate_content_async" in results[1]["error"]
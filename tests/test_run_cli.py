@@ -0,0 +1,59 @@
+"""
+Tests for the multi-room CLI runner.
+"""
+import json
+import pytest
+from src.run_cli import MultiRoomRunner, format_stats, load_manifest, merge_stats, shard
+
+@pytest.fixture
+def manifest(tmp_path):
+    """Three rooms, two on a custom question bank"""
+    bank = tmp_path / "banks" / "frontend.jsonl"
+    bank.parent.mkdir()
+    bank.write_text(json.dumps({"id": "fe-1", "topic": "frontend", "text": "What is the virtual DOM?"}) + "\n")
+    rooms = [
+        {"room": "soak-1"},
+        {"room": "soak-2", "voice": "en-GB-RyanNeural", "questions": "banks/frontend.jsonl"},
+        {"room": "soak-3", "questions": "banks/frontend.jsonl"},
+    ]
+    path = tmp_path / "rooms.jsonl"
+    path.write_text("\n".join(json.dumps(room) for room in rooms) + "\n\n")
+    return str(path)
+
+def test_manifest_and_sharding(manifest, tmp_path):
+    """Test manifests resolve bank paths and shard rooms evenly"""
+    specs = load_manifest(manifest)
+    assert [spec.room for spec in specs] == ["soak-1", "soak-2", "soak-3"]
+    assert specs[1].questions == str(tmp_path / "banks" / "frontend.jsonl")
+    assert [s.room for s in shard(specs, 0, 2)] == ["soak-1", "soak-3"]
+    assert [s.room for s in shard(specs, 1, 2)] == ["soak-2"]
+
+    duplicate = tmp_path / "duplicate.jsonl"
+    duplicate.write_text('{"room": "a"}\n{"room": "a"}\n')
+    with pytest.raises(ValueError):
+        load_manifest(str(duplicate))
+
+def test_rooms_share_services(manifest, test_config):
+    """Test every room runs on the runner's services with its own voice and questions"""
+    runner = MultiRoomRunner(test_config, load_manifest(manifest))
+    rooms = [runner.build_room(spec) for spec in runner.specs]
+
+    assert all(room.tts_service is runner.tts_service for room in rooms)
+    assert all(room.lm_service is runner.lm_service for room in rooms)
+    assert [room.config.room_name for room in rooms] == ["soak-1", "soak-2", "soak-3"]
+    assert rooms[0].config.tts_voice == test_config.tts_voice
+    assert rooms[1].config.tts_voice == "en-GB-RyanNeural"
+    assert rooms[1].interview_manager.question_bank is rooms[2].interview_manager.question_bank
+    assert "virtual DOM" in rooms[1].interview_manager.questions[0]
+
+def test_merge_stats():
+    """Test per-process stats add up and keep the worst loop lag"""
+    first = {"rooms": 2, "connected": 2, "interviewing": 1, "turns": 4, "fast_path_turns": 1,
+             "reconnects": 0, "failed": 0, "tts_cache_hits": 3, "tts_cache_misses": 1,
+             "llm_queued": 0, "loop_lag_ms": 2.0}
+    second = dict(first, connected=1, failed=1, loop_lag_ms=9.0)
+    merged = merge_stats([first, second])
+    assert merged["rooms"] == 4 and merged["connected"] == 3 and merged["failed"] == 1
+    assert merged["loop_lag_ms"] == 9.0
+    assert "3/4 connected" in format_stats(merged)
+    assert "75% hits" in format_stats(merged)
@@ -0,0 +1,56 @@
+"""
+Tests for import-time budget and lazy SDK loading.
+"""
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous enough for slow CI machines; eager provider SDKs blow well past it
+IMPORT_BUDGET_SECONDS = 1.5
+
+HEAVY_SDKS = [
+    "google.generativeai",
+    "livekit.rtc",
+    "livekit.api",
+    "livekit.plugins.deepgram",
+    "edge_tts",
+]
+
+def _cold_import(module: str) -> dict:
+    """Import a module in a fresh interpreter and report time and loaded SDKs"""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - start\n"
+        "from src.utils.logging import stop_logging\n"
+        "stop_logging()\n"
+        f"print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {HEAVY_SDKS!r} if m in sys.modules]}}))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=PROJECT_ROOT, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_api_import_defers_provider_sdks():
+    """Test importing the API app loads no provider SDK and stays within budget"""
+    report = _cold_import("src.main")
+    assert report["loaded"] == []
+    assert report["elapsed"] < IMPORT_BUDGET_SECONDS
+
+def test_cli_import_defers_provider_sdks():
+    """Test importing the CLI loads no provider SDK"""
+    report = _cold_import("src.run_cli")
+    assert report["loaded"] == []
+
+def test_lazy_module_loads_on_first_use():
+    """Test lazy proxies import the real module on attribute access"""
+    from src.utils.lazy import get_lazy_load_times, lazy_import
+
+    proxy = lazy_import("colorsys")
+    assert not proxy.is_loaded
+    assert proxy.rgb_to_hsv(1.0, 0.0, 0.0)[0] == 0.0
+    assert proxy.is_loaded
+    assert "colorsys" in get_lazy_load_times()
@@ -0,0 +1,106 @@
+"""
+Tests for the streaming STT session.
+"""
+import asyncio
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from src.services import SpeechToTextService
+
+class _FakeStream:
+    """Deepgram stream stand-in driven by the test"""
+    def __init__(self):
+        self.frames = []
+        self.events: asyncio.Queue = asyncio.Queue()
+
+    def push_frame(self, frame):
+        self.frames.append(frame)
+
+    def send(self, kind, text=""):
+        alternatives = [SimpleNamespace(text=text)] if text else []
+        self.events.put_nowait(SimpleNamespace(type=kind, alternatives=alternatives))
+
+    def drop(self):
+        self.events.put_nowait(ConnectionError("socket closed"))
+
+    async def aclose(self):
+        self.events.put_nowait(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        event = await self.events.get()
+        if event is None:
+            raise StopAsyncIteration
+        if isinstance(event, Exception):
+            raise event
+        return event
+
+class _FakeSTT:
+    def __init__(self):
+        self.streams = []
+
+    def stream(self):
+        self.streams.append(_FakeStream())
+        return self.streams[-1]
+
+@pytest.fixture
+def stt_service(test_config):
+    service = SpeechToTextService(test_config)
+    service.stt = _FakeSTT()
+    return service
+
+@pytest.mark.asyncio
+async def test_session_reused_across_turns(stt_service):
+    """Test one stream serves every turn, segmented at end of speech"""
+    session = stt_service.open_session("room-a")
+    await session.start()
+    stream = stt_service.stt.streams[0]
+
+    session.push_audio(np.ones(160, dtype=np.int16))
+    for kind, text in [("start_of_speech", ""), ("final_transcript", "I use Postgres"),
+                       ("final_transcript", "with read replicas"), ("end_of_speech", ""),
+                       ("start_of_speech", ""), ("final_transcript", "Redis for caching"),
+                       ("end_of_speech", "")]:
+        stream.send(kind, text)
+
+    assert await session.next_utterance(timeout=1) == "I use Postgres with read replicas"
+    assert await session.next_utterance(timeout=1) == "Redis for caching"
+    assert len(stream.frames) == 1
+
+    await session.close()
+    assert await session.next_utterance(timeout=1) is None
+    stats = session.stats()
+    assert stats["connects"] == 1
+    assert stats["utterances"] == 2
+    assert not stats["open"]
+
+@pytest.mark.asyncio
+async def test_session_reconnects_and_replays(stt_service):
+    """Test a dropped stream is replaced and untranscribed audio is replayed"""
+    session = stt_service.open_session("room-b")
+    await session.start()
+    first = stt_service.stt.streams[0]
+
+    session.push_audio(np.full(1600, 1, dtype=np.int16))
+    first.send("final_transcript", "First part")
+    await asyncio.sleep(0)
+    # Only audio after the last final transcript needs replaying
+    session.push_audio(np.full(800, 2, dtype=np.int16))
+    first.drop()
+
+    for _ in range(100):
+        if len(stt_service.stt.streams) == 2 and session.reconnects:
+            break
+        await asyncio.sleep(0.05)
+    second = stt_service.stt.streams[1]
+    replayed = np.frombuffer(second.frames[0].data, dtype=np.int16)
+    assert len(replayed) == 800 and (replayed == 2).all()
+
+    # The utterance in progress continues on the new stream
+    second.send("final_transcript", "second part")
+    second.send("end_of_speech")
+    assert await session.next_utterance(timeout=1) == "First part second part"
+    assert session.stats()["reconnects"] == 1
+    await session.close()
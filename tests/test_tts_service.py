@@ -2,9 +2,13 @@
 Tests for the text-to-speech service.
 """
 import os
+import json
+import base64
 import pytest
 import asyncio
 from src.services import TextToSpeechService
+from src.services.text_to_speech import SynthesisCache
+from src.utils.admission import Priority
 from src.utils.audio import get_wav_info
 
 @pytest.mark.asyncio
@@ -33,4 +37,121 @@ async def test_tts_synthesis(tts_service):
     assert duration > 0
     
     # Clean up
-    os.unlink(wav_file) 
\ No newline at end of file
+    os.unlink(wav_file)
+
+@pytest.mark.asyncio
+async def test_synthesis_cache_dedupes_and_evicts():
+    """Test concurrent identical renders are shared and LRU eviction by size"""
+    cache = SynthesisCache(max_bytes=10)
+    renders = 0
+
+    async def render():
+        nonlocal renders
+        renders += 1
+        await asyncio.sleep(0.01)
+        return b"abcd"
+
+    results = await asyncio.gather(*(cache.get_or_render(("v", "t"), render) for _ in range(3)))
+    assert renders == 1
+    assert [cached for _, cached in results] == [False, True, True]
+
+    cache.put(("v", "u"), b"efgh")
+    cache.put(("v", "w"), b"ijkl")  # over budget, evicts ("v", "t")
+    assert cache.get(("v", "t")) is None
+    assert cache.get(("v", "w")) == b"ijkl"
+    assert cache.stats()["bytes"] == 8
+
+@pytest.mark.asyncio
+async def test_synthesis_cache_waiters_survive_cancelled_caller():
+    """Test cancelling one caller leaves a shared render to the others, and none outranks it"""
+    cache = SynthesisCache(max_bytes=100)
+    renders = []
+
+    async def render():
+        renders.append(asyncio.current_task())
+        await asyncio.sleep(0.05)
+        return b"audio"
+
+    batch = asyncio.create_task(cache.get_or_render(("v", "t"), render, Priority.BATCH))
+    batch_waiter = asyncio.create_task(cache.get_or_render(("v", "t"), render, Priority.BATCH))
+    # A live room does not wait behind the batch render
+    live = asyncio.create_task(cache.get_or_render(("v", "t"), render, Priority.REALTIME))
+    await asyncio.sleep(0.01)
+    batch.cancel()
+    assert await batch_waiter == (b"audio", True)
+    assert await live == (b"audio", False)
+    assert len(renders) == 2 and batch.cancelled()
+
+    # The render stops once every caller has given up
+    only = asyncio.create_task(cache.get_or_render(("v", "u"), render))
+    await asyncio.sleep(0.01)
+    only.cancel()
+    await asyncio.sleep(0.01)
+    assert renders[-1].cancelled() and cache.get(("v", "u")) is None
+
+def test_batch_synthesis_endpoint(test_client, monkeypatch):
+    """Test batch synthesis dedupes items and streams NDJSON results"""
+    rendered = []
+
+    async def fake_render(self, text, voice):
+        rendered.append((voice, text))
+        return f"{voice}:{text}".encode()
+
+    monkeypatch.setattr(TextToSpeechService, "_render", fake_render)
+    payload = {
+        "items": [
+            {"text": "Batch hello", "id": "a"},
+            {"text": "Batch world", "voice": "en-US-GuyNeural"},
+            {"text": "Batch hello", "id": "c"},
+        ]
+    }
+
+    response = test_client.post("/api/v1/synthesize/batch", json=payload)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    results = sorted((json.loads(line) for line in response.text.splitlines()),
+                     key=lambda r: r["index"])
+    assert [r["id"] for r in results] == ["a", None, "c"]
+    assert len(rendered) == 2
+    assert base64.b64decode(results[1]["audio_data"]) == b"en-US-GuyNeural:Batch world"
+    assert results[0]["audio_data"] == results[2]["audio_data"]
+    assert all(r["error"] is None for r in results)
+
+def test_synthesize_output_formats(test_client, monkeypatch):
+    """Test /synthesize serves native MP3 as is and transcodes other formats"""
+    import numpy as np
+    from src.utils.audio import pcm16_to_wav_bytes
+    from src.utils.audio_formats import AudioFormat, transcode_bytes
+    
+    # Two seconds of "speech" in Edge TTS's native format
+    t = np.arange(48000) / 24000
+    tone = (np.sin(2 * np.pi * 220 * t) * np.sin(2 * np.pi * 3 * t) * 8000).astype(np.int16)
+    native = transcode_bytes(pcm16_to_wav_bytes(tone, 24000), AudioFormat("mp3", 24000, 40))
+    
+    async def fake_render(self, text, voice):
+        return native
+    
+    monkeypatch.setattr(TextToSpeechService, "_render", fake_render)
+    payload = {"text": "Format negotiation test"}
+    
+    default = test_client.post("/api/v1/synthesize", json=payload).json()
+    assert (default["format"], default["sample_rate"]) == ("mp3", 24000)
+    assert base64.b64decode(default["audio_data"]) == native
+    
+    opus = test_client.post("/api/v1/synthesize", json={**payload, "format": "opus", "bitrate": 16}).json()
+    opus_bytes = base64.b64decode(opus["audio_data"])
+    assert opus["media_type"] == "audio/ogg" and opus_bytes[:4] == b"OggS"
+    assert len(opus_bytes) < len(native) / 2
+    
+    wav = test_client.post("/api/v1/synthesize", json={**payload, "format": "wav", "sample_rate": 16000}).json()
+    wav_bytes = base64.b64decode(wav["audio_data"])
+    assert wav["sample_rate"] == 16000 and wav_bytes[:4] == b"RIFF"
+    
+    streamed = test_client.post("/api/v1/synthesize", json=payload, headers={"Accept": "audio/ogg"})
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"] == "audio/ogg"
+    assert streamed.content[:4] == b"OggS"
+    
+    assert test_client.post("/api/v1/synthesize", json=payload, headers={"Accept": "audio/flac"}).status_code == 406
+    assert test_client.post("/api/v1/synthesize", json={**payload, "format": "opus", "sample_rate": 44100}).status_code == 422
@@ -4,12 +4,20 @@ Tests for utility functions.
 import os
 import tempfile
 import base64
+import importlib.util
+import numpy as np
+import pytest
 from src.utils.audio import (
     convert_wav_to_base64,
     convert_base64_to_wav,
     get_wav_info,
-    create_silent_wav
+    create_silent_wav,
+    AudioRingBuffer,
+    JitterBuffer
 )
+from src.utils.audio_preprocessing import AudioPreprocessor, PreprocessorConfig
+from src.utils.audio_formats import AudioFormat, negotiate
+from src.utils.serving import uvicorn_options
 
 def test_create_silent_wav():
     """Test creating a silent WAV file"""
@@ -93,4 +101,143 @@ def test_get_wav_info():
     assert 0.99 < duration < 1.01  # Around 1 second
     
     # Clean up
-    os.unlink(wav_file) 
\ No newline at end of file
+    os.unlink(wav_file)
+
+def test_ring_buffer_wraparound_view():
+    """Test that windows spanning the wrap point are contiguous views"""
+    ring = AudioRingBuffer(capacity=8)
+    ring.write(np.arange(6, dtype=np.int16))
+    ring.read(4)
+    ring.write(np.arange(6, 12, dtype=np.int16))
+
+    window = ring.peek(8)
+    assert list(window) == [4, 5, 6, 7, 8, 9, 10, 11]
+    assert window.base is not None  # view, not a copy
+    assert ring.available == 8
+
+def test_ring_buffer_overrun_drops_oldest():
+    """Test that overflow overwrites the oldest samples"""
+    ring = AudioRingBuffer(capacity=4)
+    ring.write(np.arange(6, dtype=np.int16).tobytes())
+
+    assert ring.overruns == 1
+    assert list(ring.read(10)) == [2, 3, 4, 5]
+    assert ring.available == 0
+
+def test_ring_buffer_pre_roll():
+    """Test rewinding to include audio from before voice activity started"""
+    ring = AudioRingBuffer(capacity=16000)
+    ring.write(np.ones(1600, dtype=np.int16))
+    ring.clear()
+
+    assert ring.pre_roll(50, sample_rate=16000) == 800
+    assert list(ring.latest(2)) == [1, 1]
+
+def test_jitter_buffer_reorders_and_conceals():
+    """Test in-order playout, late-frame drop and loss concealment"""
+    jitter = JitterBuffer(frame_samples=4, depth=2, slots=8)
+    frame = lambda v: np.full(4, v, dtype=np.int16)
+
+    jitter.push(0, frame(100))
+    assert jitter.pop() is None  # still filling
+    jitter.push(2, frame(300))
+    jitter.push(1, frame(200))
+
+    assert list(jitter.pop()) == [100] * 4
+    assert list(jitter.pop()) == [200] * 4
+    jitter.push(4, frame(500))
+    assert list(jitter.pop()) == [300] * 4
+    assert list(jitter.pop()) == [150] * 4  # seq 3 lost, concealed
+    assert jitter.concealed == 1
+
+    assert jitter.push(3, frame(400)) is False
+    assert jitter.late == 1
+
+def _process_all(preprocessor, signal):
+    """Run a signal through a preprocessor frame by frame"""
+    n = preprocessor.frame_samples
+    return np.concatenate([preprocessor.process(signal[i:i + n]).copy()
+                           for i in range(0, len(signal), n)])
+
+def test_preprocessor_removes_dc_and_levels_speech():
+    """Test high-pass removes DC offset and AGC raises quiet speech"""
+    preprocessor = AudioPreprocessor(PreprocessorConfig())
+    t = np.arange(32000) / 16000
+    quiet_tone = (600 * np.sin(2 * np.pi * 300 * t) + 3000).astype(np.int16)
+
+    output = _process_all(preprocessor, quiet_tone)[-1600:].astype(np.float64)
+
+    assert abs(output.mean()) < 50
+    assert np.sqrt(np.mean(output ** 2)) > 2 * 600 / np.sqrt(2)
+    assert preprocessor.gate_open
+
+def test_preprocessor_gates_background_noise():
+    """Test that low-level noise is attenuated by the gate"""
+    preprocessor = AudioPreprocessor(PreprocessorConfig())
+    noise = np.random.default_rng(0).normal(0, 30, 16000).astype(np.int16)
+
+    output = _process_all(preprocessor, noise)[-1600:].astype(np.float64)
+
+    assert not preprocessor.gate_open
+    assert np.sqrt(np.mean(output ** 2)) < 5
+
+SERVING_ENV = ("HOST", "PORT", "WEB_CONCURRENCY", "KEEPALIVE_TIMEOUT", "BACKLOG", "ACCESS_LOG")
+
+@pytest.fixture
+def serving_env(monkeypatch):
+    """No serving variables set"""
+    for name in SERVING_ENV:
+        monkeypatch.delenv(name, raising=False)
+    return monkeypatch
+
+def test_dev_profile(serving_env):
+    """Test dev serves one reloading process"""
+    assert uvicorn_options("dev", port=9000) == {"host": "0.0.0.0", "port": 9000, "reload": True}
+
+def test_production_profile_defaults(serving_env):
+    """Test production defaults: one worker (limits are per process), tuned keep-alive and backlog"""
+    assert uvicorn_options("production") == {
+        "host": "0.0.0.0",
+        "port": 8000,
+        "loop": "uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        "http": "httptools" if importlib.util.find_spec("httptools") else "h11",
+        "workers": 1,
+        "timeout_keep_alive": 75,
+        "backlog": 2048,
+        "access_log": False,
+        "proxy_headers": True,
+    }
+
+@pytest.mark.parametrize("name, value, option, expected", [
+    ("WEB_CONCURRENCY", "3", "workers", 3),
+    ("PORT", "9001", "port", 9001),
+    ("KEEPALIVE_TIMEOUT", "30", "timeout_keep_alive", 30),
+    ("BACKLOG", "4096", "backlog", 4096),
+    ("ACCESS_LOG", "true", "access_log", True),
+])
+def test_production_profile_env(serving_env, name, value, option, expected):
+    """Test each serving variable overrides its production option"""
+    serving_env.setenv(name, value)
+    assert uvicorn_options("production")[option] == expected
+
+def test_audio_format_negotiation():
+    """Test Accept headers and requested formats map to validated output formats"""
+    assert negotiate(None) is None
+    assert negotiate("application/json, audio/ogg") is None
+    assert negotiate("audio/mpeg;q=0.5, audio/ogg").codec == "opus"
+    assert negotiate("audio/*").is_native
+    pcm = negotiate("audio/L16;rate=16000")
+    assert (pcm.codec, pcm.sample_rate) == ("pcm", 16000)
+    assert pcm.media_type == "audio/L16;rate=16000;channels=1"
+    
+    assert AudioFormat.parse("MP3").is_native
+    assert not AudioFormat.parse("mp3", bitrate=32).is_native
+    assert AudioFormat.parse("wav", bitrate=64).bitrate is None
+    with pytest.raises(ValueError):
+        negotiate("audio/flac")
+
+@pytest.mark.parametrize("codec, rate, bitrate", [("flac", None, None), ("opus", 22050, None), ("mp3", None, 1000)])
+def test_audio_format_rejects_unsupported(codec, rate, bitrate):
+    """Test unknown codecs, unsupported rates and out-of-range bitrates are rejected"""
+    with pytest.raises(ValueError):
+        AudioFormat.parse(codec, rate, bitrate)